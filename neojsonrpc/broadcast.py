@@ -0,0 +1,250 @@
+"""
+    NEO JSON-RPC transaction broadcaster
+    ====================================
+
+    This module defines the ``Broadcaster`` class, which allows to broadcast a stream of signed
+    transactions to many nodes in parallel in order to spread them through the NEO network quickly.
+
+"""
+
+import binascii
+import collections
+import hashlib
+import struct
+from concurrent.futures import ThreadPoolExecutor
+
+from .exceptions import JSONRPCError
+from .metrics import Metrics
+from .utils import LRUCache
+
+
+BroadcastResult = collections.namedtuple('BroadcastResult', ['tx_hash', 'accepted', 'errors'])
+BroadcastResult.__doc__ = """ Result of the broadcast of a transaction.
+
+``accepted`` associates the URL of each node with a boolean indicating whether the node accepted
+the transaction. ``errors`` associates the URL of the nodes for which the broadcast failed with the
+corresponding exception. Transactions that cannot be parsed are not sent to any node: their
+``tx_hash`` is None and ``errors`` contains the parsing error for each node.
+
+"""
+
+
+class Broadcaster:
+    """ Broadcasts signed transactions to many nodes in parallel.
+
+    Each transaction is sent to all the nodes. The number of transactions being sent to a single
+    node at any time is bounded by ``max_in_flight`` so that a node is never overloaded, while the
+    other nodes keep receiving transactions. A slow node only delays the reporting of the results:
+    the number of transactions waiting to be sent is bounded as well. For example:
+
+    .. code-block:: python
+
+        >>> broadcaster = Broadcaster([Client.for_mainnet(), Client(host='mynode', port=10332)])
+        >>> for result in broadcaster.broadcast(signed_transactions):
+        ...     print(result.tx_hash, result.accepted)
+
+    Transactions that were already accepted by at least one node are skipped, so that retrying a
+    batch of transactions does not send the same transactions to the nodes again. The hashes of the
+    last ``max_hashes`` accepted transactions are kept for this purpose. Per-node acceptance
+    counters are available through the ``metrics`` attribute.
+
+    """
+
+    def __init__(self, clients, max_in_flight=8, max_hashes=100000):
+        self.clients = list(clients)
+        self.max_in_flight = max_in_flight
+        self.metrics = Metrics()
+        self._broadcast_hashes = LRUCache(max_hashes)
+
+    def broadcast(self, transactions, **kwargs):
+        """ Broadcasts transactions and returns an iterator over the results of each broadcast.
+
+        Results are returned in the order of the transactions. Keyword arguments (eg.
+        ``deadline``) are passed to each ``send_raw_transaction`` call.
+
+        :param transactions:
+            iterable of serialized transactions (hexadecimal strings) or of (transaction hash,
+            serialized transaction) tuples
+        :type transactions: iterable
+        :return: iterator over ``BroadcastResult`` objects
+        :rtype: generator
+
+        """
+        executors = [ThreadPoolExecutor(max_workers=self.max_in_flight) for _ in self.clients]
+        pending = collections.deque()
+        pending_hashes = set()
+        try:
+            for tx_hash, hextx, error in self._get_unique_transactions(
+                    transactions, pending_hashes):
+                if len(pending) >= self.max_in_flight * 2:
+                    yield self._get_result(*pending.popleft(), pending_hashes=pending_hashes)
+                if error is not None:
+                    # Transactions that cannot be parsed are reported in order but are not sent.
+                    pending.append((tx_hash, [], error))
+                    continue
+                futures = [
+                    executor.submit(client.send_raw_transaction, hextx, **kwargs)
+                    for client, executor in zip(self.clients, executors)]
+                pending.append((tx_hash, futures, None))
+                pending_hashes.add(tx_hash)
+            while pending:
+                yield self._get_result(*pending.popleft(), pending_hashes=pending_hashes)
+        finally:
+            for _, futures, _ in pending:
+                for future in futures:
+                    future.cancel()
+            for executor in executors:
+                executor.shutdown(wait=False)
+
+    def _get_unique_transactions(self, transactions, pending_hashes):
+        """ Returns an iterator over the transactions that were not broadcast yet.
+
+        Each item is a (transaction hash, serialized transaction, parsing error) tuple: the parsing
+        error is None unless the transaction could not be parsed.
+
+        """
+        for tx in transactions:
+            try:
+                tx_hash, hextx = tx if isinstance(tx, tuple) else (get_transaction_hash(tx), tx)
+            except (TypeError, ValueError) as e:
+                self.metrics.increment('invalid')
+                yield None, tx, e
+                continue
+            if tx_hash in self._broadcast_hashes or tx_hash in pending_hashes:
+                self.metrics.increment('duplicates')
+                continue
+            yield tx_hash, hextx, None
+
+    def _get_result(self, tx_hash, futures, error, pending_hashes):
+        """ Waits for the futures associated with a transaction and returns the result. """
+        if error is not None:
+            return BroadcastResult(
+                tx_hash, {client.url: False for client in self.clients},
+                {client.url: error for client in self.clients})
+        accepted, errors = {}, {}
+        for client, future in zip(self.clients, futures):
+            try:
+                accepted[client.url] = bool(future.result())
+            except JSONRPCError as e:
+                accepted[client.url] = False
+                errors[client.url] = e
+                self.metrics.increment('{}.errors'.format(client.url))
+            self.metrics.increment(
+                '{}.{}'.format(client.url, 'accepted' if accepted[client.url] else 'rejected'))
+        # Only transactions accepted by a node are skipped afterwards: transactions that were
+        # rejected by all the nodes (or that could not be sent) can be broadcast again.
+        if any(accepted.values()):
+            self._broadcast_hashes.set(tx_hash, True)
+        pending_hashes.discard(tx_hash)
+        return BroadcastResult(tx_hash, accepted, errors)
+
+
+def get_transaction_hash(hextx):
+    """ Returns the hash (ID) of a serialized transaction.
+
+    Like NEO transaction IDs, the hash is computed as the double SHA256 of the unsigned part of the
+    transaction (that is, excluding its witnesses) and is returned in reversed byte order.
+
+    :param hextx: serialized transaction (hexadecimal string)
+    :type hextx: str
+    :return: hash of the transaction (eg. 0xfb5bd72b2d...a57d6)
+    :rtype: str
+    :raises ValueError: if the transaction cannot be parsed
+
+    """
+    data = binascii.unhexlify(hextx)
+    data = data[:_get_unsigned_length(data)]
+    return '0x' + binascii.hexlify(
+        hashlib.sha256(hashlib.sha256(data).digest()).digest()[::-1]).decode('ascii')
+
+
+def _get_unsigned_length(data):
+    """ Returns the length of the unsigned part of a serialized transaction. """
+    reader = _Reader(data)
+    tx_type = reader.read(1)[0]
+    version = reader.read(1)[0]
+
+    # Exclusive data of each type of transaction.
+    if tx_type == 0x00:  # MinerTransaction
+        reader.read(4)
+    elif tx_type == 0x02:  # ClaimTransaction
+        reader.read(34 * reader.read_varint())
+    elif tx_type == 0x20:  # EnrollmentTransaction
+        reader.read_ec_point()
+    elif tx_type == 0x40:  # RegisterTransaction
+        reader.read(1)
+        reader.read_varbytes()
+        reader.read(9)
+        reader.read_ec_point()
+        reader.read(20)
+    elif tx_type == 0x90:  # StateTransaction
+        for _ in range(reader.read_varint()):
+            reader.read(1)
+            reader.read_varbytes()
+            reader.read_varbytes()
+            reader.read_varbytes()
+    elif tx_type == 0xd0:  # PublishTransaction
+        reader.read_varbytes()
+        reader.read_varbytes()
+        reader.read(2 if version >= 1 else 1)
+        for _ in range(5):
+            reader.read_varbytes()
+    elif tx_type == 0xd1:  # InvocationTransaction
+        reader.read_varbytes()
+        if version >= 1:
+            reader.read(8)
+    elif tx_type not in (0x01, 0x80):  # IssueTransaction and ContractTransaction
+        raise ValueError('Unknown transaction type: {}'.format(tx_type))
+
+    for _ in range(reader.read_varint()):
+        usage = reader.read(1)[0]
+        if usage in (0x00, 0x02, 0x03, 0x30) or 0xa1 <= usage <= 0xaf:
+            reader.read(32)
+        elif usage == 0x20:
+            reader.read(20)
+        elif usage == 0x81:
+            reader.read(reader.read(1)[0])
+        elif usage == 0x90 or usage >= 0xf0:
+            reader.read_varbytes()
+        else:
+            raise ValueError('Unknown transaction attribute usage: {}'.format(usage))
+    reader.read(34 * reader.read_varint())  # Inputs
+    reader.read(60 * reader.read_varint())  # Outputs
+    return reader.offset
+
+
+class _Reader:
+    """ Reads the fields of a serialized NEO object. """
+
+    VARINT_FORMATS = {
+        0xfd: struct.Struct('<H'), 0xfe: struct.Struct('<I'), 0xff: struct.Struct('<Q')}
+
+    def __init__(self, data):
+        self.data = data
+        self.offset = 0
+
+    def read(self, length):
+        if self.offset + length > len(self.data):
+            raise ValueError('Truncated transaction')
+        value = self.data[self.offset:self.offset + length]
+        self.offset += length
+        return value
+
+    def read_varint(self):
+        value = self.read(1)[0]
+        value_format = self.VARINT_FORMATS.get(value)
+        if value_format is None:
+            return value
+        return value_format.unpack(self.read(value_format.size))[0]
+
+    def read_varbytes(self):
+        return self.read(self.read_varint())
+
+    def read_ec_point(self):
+        prefix = self.read(1)[0]
+        if prefix in (0x02, 0x03):
+            self.read(32)
+        elif prefix == 0x04:
+            self.read(64)
+        elif prefix != 0x00:
+            raise ValueError('Invalid EC point')
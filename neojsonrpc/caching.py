@@ -0,0 +1,110 @@
+"""
+    NEO JSON-RPC invocation cache
+    =============================
+
+    This module defines the ``InvocationCache`` class, which allows the NEO JSON-RPC client to
+    cache the results of read-only contract invocations (``invoke``, ``invoke_function`` and
+    ``invoke_script``). These results only depend on the state of the chain, which only changes
+    when a new block is added to the chain.
+
+"""
+
+import copy
+import json
+import threading
+import time
+
+from .metrics import Metrics
+from .utils import LRUCache
+
+
+class InvocationCache:
+    """ Height-aware LRU cache of the results of contract invocations.
+
+    Results are cached for the current height of the chain and are discarded as soon as a new
+    block is seen. The height of the chain is obtained using ``getblockcount`` at most once every
+    ``height_check_interval`` seconds, so that cached results can be served without any call in the
+    meantime. The ``ttls`` dictionary allows to associate the names of functions whose results do
+    not depend on the state of the chain (eg. ``symbol`` or ``decimals``) with a number of seconds
+    during which their results are cached regardless of new blocks. For example:
+
+    .. code-block:: python
+
+        >>> cache = InvocationCache(maxsize=10000, ttls={'symbol': 3600, 'decimals': 3600})
+        >>> client = Client(host='seed1.neo.org', port=10332, invocation_cache=cache)
+        >>> client.contract(script_hash).balanceOf(address_hash)  # Calls the node
+        >>> client.contract(script_hash).balanceOf(address_hash)  # Cached until the next block
+        >>> cache.hit_rate
+        0.5
+
+    """
+
+    def __init__(self, maxsize=1024, ttls=None, height_check_interval=1):
+        self.ttls = dict(ttls or {})
+        self.height_check_interval = height_check_interval
+        self.height = None
+        self.metrics = Metrics()
+        self._entries = LRUCache(maxsize)
+        self._height_checked_at = None
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def hit_rate(self):
+        """ Returns the ratio of invocations whose results were served from the cache. """
+        total = self.metrics['hits'] + self.metrics['misses']
+        return self.metrics['hits'] / total if total else 0.0
+
+    def clear(self):
+        """ Removes all the cached results. """
+        self._entries.clear()
+
+    def get_or_call(self, client, method, params, operation, call, **kwargs):
+        """ Returns the cached result of an invocation or performs it using ``call``.
+
+        :param client: client used to check the height of the chain
+        :param method: JSON-RPC method used to perform the invocation
+        :param params: parameters of the JSON-RPC method
+        :param operation: name of the invoked function (if applicable)
+        :param call: callable performing the invocation
+        :type client: neojsonrpc.Client
+        :type method: str
+        :type params: list
+        :type operation: str
+        :type call: callable
+        :return: result of the invocation
+        :rtype: dict
+
+        """
+        ttl = self.ttls.get(operation)
+        height = self._get_height(client, **kwargs) if ttl is None else None
+        key = (method, json.dumps(params, sort_keys=True), height)
+
+        entry = self._entries.get(key)
+        if entry is not None and (entry[0] is None or entry[0] > time.monotonic()):
+            self.metrics.increment('hits')
+            return copy.deepcopy(entry[1])
+
+        self.metrics.increment('misses')
+        result = call()
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        self._entries.set(key, (expires_at, result))
+        return copy.deepcopy(result)
+
+    def _get_height(self, client, **kwargs):
+        """ Returns the current height of the chain, discarding stale results if it changed. """
+        with self._lock:
+            now = time.monotonic()
+            checked_at = self._height_checked_at
+            if checked_at is not None and now - checked_at < self.height_check_interval:
+                return self.height
+            height = client.get_block_count(**kwargs) - 1
+            if height != self.height:
+                # Only the results cached for a specific height are discarded: the results of the
+                # functions with a TTL remain valid until they expire.
+                self._entries.prune(lambda key: key[2] is not None)
+                self.height = height
+            self._height_checked_at = now
+            return height
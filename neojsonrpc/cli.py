@@ -0,0 +1,236 @@
+"""
+    NEO JSON-RPC command-line tool
+    ==============================
+
+    This module defines the ``neojsonrpc`` command-line tool. It provides the following
+    subcommands:
+
+    * ``call``: calls any JSON-RPC method and prints its result
+    * ``fetch-blocks``: downloads a range of blocks concurrently to a JSON lines (or raw) file
+    * ``bench``: measures the throughput and latency percentiles of methods against nodes
+    * ``simulate``: serves a synthetic chain through a local JSON-RPC endpoint
+
+    Modules that are only required by specific subcommands are imported lazily in order to keep
+    the startup time of the tool as low as possible.
+
+"""
+
+import argparse
+import sys
+
+
+def main(argv=None):
+    """ Entry point of the ``neojsonrpc`` command-line tool. """
+    parser = get_parser()
+    args = parser.parse_args(argv)
+    if not getattr(args, 'func', None):
+        parser.print_help()
+        return 2
+    return args.func(args) or 0
+
+
+def get_parser():
+    """ Returns the argument parser of the command-line tool. """
+    parser = argparse.ArgumentParser(
+        prog='neojsonrpc', description='Interact with the JSON-RPC interface of NEO nodes.')
+    subparsers = parser.add_subparsers()
+
+    call_parser = subparsers.add_parser('call', help='call a JSON-RPC method')
+    _add_node_arguments(call_parser)
+    call_parser.add_argument('method', help='name of the JSON-RPC method (eg. getblockcount)')
+    call_parser.add_argument(
+        'params', nargs='*', help='parameters of the method (JSON values or strings)')
+    call_parser.set_defaults(func=call)
+
+    fetch_parser = subparsers.add_parser('fetch-blocks', help='download a range of blocks')
+    _add_node_arguments(fetch_parser)
+    fetch_parser.add_argument('start', type=int, help='index of the first block to download')
+    fetch_parser.add_argument('stop', type=int, help='index following the last block to download')
+    fetch_parser.add_argument(
+        '-o', '--output', default='-', help='path of the output file (defaults to stdout)')
+    fetch_parser.add_argument(
+        '-f', '--format', choices=('jsonl', 'raw'), default='jsonl',
+        help='one JSON block per line (jsonl) or one hexadecimal block per line (raw)')
+    fetch_parser.add_argument(
+        '-c', '--concurrency', type=int, default=8, help='number of concurrent requests')
+    fetch_parser.set_defaults(func=fetch_blocks)
+
+    bench_parser = subparsers.add_parser('bench', help='benchmark JSON-RPC methods')
+    _add_node_arguments(bench_parser)
+    bench_parser.add_argument(
+        '-n', '--node', action='append', dest='nodes', default=[],
+        help='node to benchmark ([https://]host:port), can be repeated (defaults to --host)')
+    bench_parser.add_argument(
+        '-m', '--method', action='append', dest='methods', default=[],
+        help='method to benchmark, optionally followed by JSON parameters (eg. getblock:[1000]), '
+             'can be repeated (defaults to getblockcount)')
+    bench_parser.add_argument(
+        '-r', '--requests', type=int, default=100, help='number of requests per method and node')
+    bench_parser.add_argument(
+        '-c', '--concurrency', type=int, default=8, help='number of concurrent requests')
+    bench_parser.set_defaults(func=bench)
+
+    simulate_parser = subparsers.add_parser(
+        'simulate', help='serve a synthetic chain through a local JSON-RPC endpoint')
+    simulate_parser.add_argument('--host', default='127.0.0.1', help='host to listen on')
+    simulate_parser.add_argument('--port', type=int, default=30333, help='port to listen on')
+    simulate_parser.add_argument('--seed', type=int, default=0, help='seed of the chain')
+    simulate_parser.add_argument(
+        '--blocks', type=int, default=1000000, help='initial number of blocks of the chain')
+    simulate_parser.add_argument(
+        '--block-interval', type=float, help='number of seconds between new blocks')
+    simulate_parser.add_argument(
+        '--latency', type=float, nargs='+', default=[0],
+        help='latency of each request in seconds (or minimum and maximum latencies)')
+    simulate_parser.add_argument(
+        '--error-rate', type=float, default=0, help='proportion of requests failing with a 503')
+    simulate_parser.set_defaults(func=simulate)
+
+    return parser
+
+
+def call(args):
+    """ Calls a JSON-RPC method and prints its result. """
+    import json
+    from .constants import JSONRPCMethods
+
+    try:
+        method = JSONRPCMethods(args.method).value
+    except ValueError:
+        sys.stderr.write('Unknown JSON-RPC method: {}\n'.format(args.method))
+        return 2
+
+    with _get_client(args) as client:
+        result = client._call(method, [_parse_param(p) for p in args.params])
+    sys.stdout.write(json.dumps(result, indent=2, sort_keys=True) + '\n')
+
+
+def fetch_blocks(args):
+    """ Downloads a range of blocks to a JSON lines (or raw) file. """
+    import json
+
+    output = sys.stdout if args.output == '-' else open(args.output, 'w')
+    verbose = args.format == 'jsonl'
+    try:
+        with _get_client(args) as client:
+            blocks = client.get_blocks(
+                args.start, args.stop, verbose=verbose, concurrency=args.concurrency)
+            for block in blocks:
+                output.write((json.dumps(block, sort_keys=True) if verbose else block) + '\n')
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+
+def bench(args):
+    """ Measures the throughput and latency percentiles of JSON-RPC methods against nodes. """
+    import json
+    import time
+    from .utils import map_concurrently
+
+    nodes = args.nodes or ['{}{}:{}'.format('https://' if args.tls else '', args.host, args.port)]
+    methods = args.methods or ['getblockcount']
+
+    sys.stdout.write('{:<32} {:<24} {:>10} {:>9} {:>9} {:>9} {:>7}\n'.format(
+        'node', 'method', 'calls/s', 'p50 (ms)', 'p90 (ms)', 'p99 (ms)', 'errors'))
+    for node in nodes:
+        with _get_client(args, node) as client:
+            for method_spec in methods:
+                method, _, params = method_spec.partition(':')
+                params = json.loads(params) if params else []
+
+                def timed_call(_):
+                    start = time.perf_counter()
+                    try:
+                        client._call(method, params)
+                    except Exception:
+                        return None
+                    return time.perf_counter() - start
+
+                start = time.perf_counter()
+                latencies = list(
+                    map_concurrently(timed_call, range(args.requests), args.concurrency))
+                elapsed = time.perf_counter() - start
+                successes = sorted(latency for latency in latencies if latency is not None)
+                row_format = '{:<32} {:<24} {:>10.1f} {:>9.1f} {:>9.1f} {:>9.1f} {:>7}\n'
+                sys.stdout.write(row_format.format(
+                    node, method, len(successes) / elapsed,
+                    _percentile(successes, 50) * 1000, _percentile(successes, 90) * 1000,
+                    _percentile(successes, 99) * 1000, len(latencies) - len(successes)))
+
+
+def simulate(args):
+    """ Serves a synthetic chain through a local JSON-RPC endpoint until interrupted. """
+    import time
+    from .testing import SimulatorServer, SyntheticChain
+
+    chain = SyntheticChain(
+        seed=args.seed, block_count=args.blocks, block_interval=args.block_interval)
+    latency = args.latency[0] if len(args.latency) == 1 else tuple(args.latency[:2])
+    server = SimulatorServer(
+        chain, host=args.host, port=args.port, latency=latency, error_rate=args.error_rate,
+        seed=args.seed)
+    with server:
+        sys.stdout.write('Serving a synthetic chain on {}\n'.format(server.url))
+        sys.stdout.flush()
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
+
+
+def _add_node_arguments(parser):
+    """ Adds the arguments allowing to configure the node to interact with. """
+    parser.add_argument('--host', default='localhost', help='host of the node')
+    parser.add_argument('--port', type=int, default=30333, help='port of the node')
+    parser.add_argument('--tls', action='store_true', help='use TLS')
+    parser.add_argument('--timeout', type=float, default=30, help='timeout of each request')
+    transport_group = parser.add_mutually_exclusive_group()
+    transport_group.add_argument(
+        '--http2', action='store_true', help='use HTTP/2 (requires neojsonrpc[http2])')
+    transport_group.add_argument(
+        '--replay', metavar='FILE',
+        help='serve the responses recorded in FILE instead of calling the node')
+
+
+def _get_client(args, node=None):
+    """ Returns a client configured using the considered arguments (and node if applicable). """
+    from .client import Client
+    from .transports import HTTP2Transport, HTTPTransport, ReplayTransport
+
+    host, port, tls = args.host, args.port, args.tls
+    if node is not None:
+        tls = node.startswith('https://')
+        host, _, port = node.split('://')[-1].rpartition(':')
+        port = int(port)
+    # The connection pool of the transport must be able to keep one connection per concurrent
+    # request.
+    pool_size = max(10, getattr(args, 'concurrency', 0))
+    if args.replay:
+        transport = ReplayTransport(args.replay)
+    elif args.http2:
+        transport = HTTP2Transport(max_connections=pool_size)
+    else:
+        transport = HTTPTransport(pool_maxsize=pool_size)
+    return Client(host=host, port=port, tls=tls, timeout=args.timeout, transport=transport)
+
+
+def _parse_param(value):
+    """ Parses a parameter passed on the command line as a JSON value or as a string. """
+    import json
+    try:
+        return json.loads(value)
+    except ValueError:
+        return value
+
+
+def _percentile(values, percent):
+    """ Returns the considered percentile of a sorted list of values (0 if the list is empty). """
+    if not values:
+        return 0
+    return values[min(len(values) - 1, int(len(values) * percent / 100))]
+
+
+if __name__ == '__main__':  # pragma: no cover
+    sys.exit(main())
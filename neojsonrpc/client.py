@@ -7,43 +7,154 @@
 """
 
 import binascii
+import collections
+import datetime
+import gzip
+import itertools
 import json
-
-import requests
-from requests.adapters import HTTPAdapter
-from requests.exceptions import HTTPError
+import logging
+import time
 
 from .constants import JSONRPCMethods
-from .exceptions import ProtocolError, TransportError
-from .utils import decode_invocation_result, encode_invocation_params
+from .exceptions import ProtocolError, TransportError, TransportTimeoutError
+from .limits import PRIORITY_LOW
+from .metrics import Metrics
+from .snapshot import Snapshot
+from .tracing import Span
+from .transports import HTTPTransport
+from .utils import (LRUCache, decode_invocation_result, encode_invocation_params, iter_chunks,
+                    map_concurrently)
+
+
+logger = logging.getLogger(__name__)
 
 
 class Client:
     """ The NEO JSON-RPC client class. """
 
-    def __init__(self, host=None, port=None, tls=False, http_max_retries=None):
+    def __init__(
+            self, host=None, port=None, tls=False, http_max_retries=None, timeout=30,
+            transport=None, compression=True, compress_requests_threshold=None,
+            concurrency_limiter=None, rate_limiter=None, scheduler=None,
+            outpoint_cache_size=10000, invocation_cache=None):
         # Initializes attributes related to the client settings (host, port, etc).
         self.host = host or 'localhost'
         self.port = port or 30333
         self.tls = tls
-        self.session = requests.Session()
-        self.session.mount(self.host, HTTPAdapter(max_retries=http_max_retries or 3))
+
+        # Initializes the transport that will be used to send requests to the JSON-RPC endpoint.
+        # The default transport relies on HTTP/1.1 but other transports can be used (for example
+        # the HTTP/2 transport provided by the neojsonrpc.transports module).
+        self.transport = transport or HTTPTransport(max_retries=http_max_retries)
+
+        # Stores the default timeout (in seconds) applied to each request made to the JSON-RPC
+        # endpoint. This value can be overridden on a per-call basis using the "timeout" or
+        # "deadline" keyword arguments. A None value means that requests never time out.
+        self.timeout = timeout
+
+        # Initializes the limiters that can be used to avoid overloading the node: the concurrency
+        # limiter bounds the number of in-flight requests (and can adapt this number to the
+        # capacity of the node, see neojsonrpc.limits.AIMDLimiter) while the rate limiter bounds
+        # the number of requests sent per second. These limiters apply to all the calls made by the
+        # client, including the calls made by bulk methods.
+        self.concurrency_limiter = concurrency_limiter
+        self.rate_limiter = rate_limiter
+
+        # Initializes the scheduler that can be used to separate the requests of different
+        # priorities (see neojsonrpc.limits.PriorityScheduler). The priority of a request is set
+        # using the "priority" keyword argument; bulk methods use the low priority by default.
+        self.scheduler = scheduler
+
+        # Initializes attributes related to the compression of the data exchanged with the JSON-RPC
+        # endpoint. Response compression is negotiated with the node (and is used only if the node
+        # supports it) while request bodies are compressed only if their size exceeds the
+        # considered threshold (in bytes). Request compression is disabled by default because not
+        # all nodes are able to decompress request bodies.
+        self.compression = compression
+        self.compress_requests_threshold = compress_requests_threshold
+
+        # Initializes the metrics registry of the client. It keeps track of the number of requests
+        # that were sent to the JSON-RPC endpoint and of the number of bytes exchanged with it.
+        self.metrics = Metrics()
+
+        # Initializes the list of tracing hooks. Each hook is called with a Span instance
+        # describing each call made to the JSON-RPC endpoint.
+        self.hooks = []
+
+        # Initializes the cache of the outputs of the transactions (outpoints) fetched by the
+        # resolve_inputs method. The outputs referenced by the inputs of many transactions are
+        # only fetched once while the cache is bounded in order to keep memory usage constant.
+        self.outpoint_cache = LRUCache(outpoint_cache_size)
+
+        # Initializes the cache of the results of contract invocations (if any). The results of
+        # invocations only depend on the height of the chain so they can be cached until a new
+        # block is seen (see neojsonrpc.caching.InvocationCache).
+        self.invocation_cache = invocation_cache
 
         # Initializes an "ID counter" that'll be used to forge each request to the JSON-RPC
         # endpoint. The "id" parameter is "required" in order to help clients sort responses out.
         # In the case of the current client, we'll just ensure that this value gets incremented
-        # after each request made to the JSON-RPC endpoint.
-        self._id_counter = 0
+        # after each request made to the JSON-RPC endpoint. It should be noted that an iterator is
+        # used in order to ensure that concurrent requests never get the same ID.
+        self._id_counter = itertools.count()
 
     @classmethod
-    def for_mainnet(cls):
+    def for_mainnet(cls, **kwargs):
         """ Creates a ``Client`` instance for use with the NEO Main Net. """
-        return cls(host='seed1.cityofzion.io', port=8080)
+        return cls(host='seed1.cityofzion.io', port=8080, **kwargs)
 
     @classmethod
-    def for_testnet(cls):
+    def for_testnet(cls, **kwargs):
         """ Creates a ``Client`` instance for use with the NEO Test Net. """
-        return cls(host='test1.cityofzion.io', port=8880)
+        return cls(host='test1.cityofzion.io', port=8880, **kwargs)
+
+    @property
+    def url(self):
+        """ Returns the URL of the JSON-RPC endpoint. """
+        scheme = 'https' if self.tls else 'http'
+        return '{}://{}:{}'.format(scheme, self.host, self.port)
+
+    @property
+    def session(self):
+        """ Returns the ``requests`` session used by the transport of the client.
+
+        This attribute is only available if the transport relies on a ``requests`` session (which
+        is the case of the default HTTP transport).
+
+        """
+        try:
+            return self.transport.session
+        except AttributeError:
+            raise AttributeError(
+                '{} does not use a requests session'.format(type(self.transport).__name__))
+
+    def add_hook(self, hook):
+        """ Registers a tracing hook.
+
+        Hooks are callables called with a :class:`Span <neojsonrpc.tracing.Span>` instance once a
+        call made to the JSON-RPC endpoint is completed. Spans contain the duration of each phase
+        of the call, the size of the request and response bodies, the URL of the endpoint and the
+        request ID.
+
+        :param hook: callable taking a span
+        :type hook: callable
+
+        """
+        self.hooks.append(hook)
+
+    def remove_hook(self, hook):
+        """ Unregisters a tracing hook. """
+        self.hooks.remove(hook)
+
+    def close(self):
+        """ Releases the connections held by the client. """
+        self.transport.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
 
     def contract(self, script_hash):
         """ Returns a ``ContractWrapper`` instance allowing to easily invoke contract functions.
@@ -67,6 +178,30 @@ class Client:
         """
         return ContractWrapper(self, script_hash)
 
+    def at_height(self, height=None, nodes=None):
+        """ Returns a ``Snapshot`` instance allowing to perform reads pinned to a block height.
+
+        Calls made through the snapshot are only sent to nodes (the current client or the other
+        clients passed in ``nodes``) whose height is the height of the snapshot, and their results
+        are cached for the lifetime of the snapshot. For example:
+
+        .. code-block:: python
+
+            >>> with client.at_height() as snapshot:
+            ...     snapshot.get_account_state('AJBENSwajTzQtwyJFkiJSv7MAaaMc7DsRz')
+            ...     snapshot.get_storage('34af1b6634fcd7cfcff0158965b18601d3837e32', 'key')
+            {...}
+
+        :param height: height of the snapshot (defaults to the current height of the node)
+        :param nodes: other clients that can be used to perform the calls
+        :type height: int
+        :type nodes: list
+        :return: :class:`Snapshot <Snapshot>` object
+        :rtype: neojsonrpc.snapshot.Snapshot
+
+        """
+        return Snapshot(self, height=height, nodes=nodes)
+
     ####################
     # JSON-RPC METHODS #
     ####################
@@ -82,6 +217,20 @@ class Client:
         """
         return self._call(JSONRPCMethods.GET_ACCOUNT_STATE.value, params=[address, ], **kwargs)
 
+    def get_application_log(self, tx_hash, **kwargs):
+        """ Returns the application log associated with a specific transaction hash.
+
+        It should be noted that this method is only available on nodes running the ApplicationLogs
+        plugin.
+
+        :param tx_hash: transaction hash
+        :type tx_hash: str
+        :return: dictionary containing the execution results and notifications of the transaction
+        :rtype: dict
+
+        """
+        return self._call(JSONRPCMethods.GET_APPLICATION_LOG.value, params=[tx_hash, ], **kwargs)
+
     def get_asset_state(self, asset_id, **kwargs):
         """ Returns the asset information associated with a specific asset ID.
 
@@ -270,9 +419,8 @@ class Client:
 
         """
         contract_params = encode_invocation_params(params)
-        raw_result = self._call(
+        return self._invoke(
             JSONRPCMethods.INVOKE.value, [script_hash, contract_params, ], **kwargs)
-        return decode_invocation_result(raw_result)
 
     def invoke_function(self, script_hash, operation, params, **kwargs):
         """ Invokes a contract's function with given parameters and returns the result.
@@ -288,10 +436,9 @@ class Client:
 
         """
         contract_params = encode_invocation_params(params)
-        raw_result = self._call(
+        return self._invoke(
             JSONRPCMethods.INVOKE_FUNCTION.value, [script_hash, operation, contract_params, ],
-            **kwargs)
-        return decode_invocation_result(raw_result)
+            operation=operation, **kwargs)
 
     def invoke_script(self, script, **kwargs):
         """ Invokes a script on the VM and returns the result.
@@ -302,8 +449,7 @@ class Client:
         :rtype: dictionary
 
         """
-        raw_result = self._call(JSONRPCMethods.INVOKE_SCRIPT.value, [script, ], **kwargs)
-        return decode_invocation_result(raw_result)
+        return self._invoke(JSONRPCMethods.INVOKE_SCRIPT.value, [script, ], **kwargs)
 
     def send_raw_transaction(self, hextx, **kwargs):
         """ Broadcasts a transaction over the NEO network and returns the result.
@@ -327,35 +473,298 @@ class Client:
         """
         return self._call(JSONRPCMethods.VALIDATE_ADDRESS.value, [addr, ], **kwargs)
 
+    ################
+    # BULK METHODS #
+    ################
+
+    def get_blocks(
+            self, start, stop, verbose=True, concurrency=4, executor=None, convert=None, **kwargs):
+        """ Returns an iterator over the blocks whose indexes are in the [start, stop) range.
+
+        Blocks are fetched concurrently but are returned in order. The number of blocks being
+        fetched at any time is bounded by the ``concurrency`` value so that memory usage remains
+        constant regardless of the size of the range. Keyword arguments (eg. ``deadline``) are
+        passed to each underlying ``get_block`` call, which use the low priority unless another
+        ``priority`` is specified.
+
+        Deserializing large verbose blocks is CPU-bound. If ``executor`` is set (eg. a
+        ``concurrent.futures.ProcessPoolExecutor``), the response bodies are deserialized by the
+        executor while the client keeps performing the I/O, so that the parsing of blocks scales
+        across all cores. The ``convert`` callable, if any, is applied to each block by the
+        executor (it must be picklable if the executor is a process pool, eg.
+        ``neojsonrpc.export.flatten_block``) and its results are returned instead of the blocks.
+
+        :param start: index of the first block to return
+        :param stop: index following the index of the last block to return
+        :param verbose:
+            a boolean indicating whether the detailed block information should be returned in JSON
+            format (otherwise the block information is returned as an hexadecimal string)
+        :param concurrency: maximum number of blocks being fetched at the same time
+        :param executor: executor used to deserialize (and convert) the blocks
+        :param convert: callable applied to each block
+        :type start: int
+        :type stop: int
+        :type verbose: bool
+        :type concurrency: int
+        :type executor: concurrent.futures.Executor
+        :type convert: callable
+        :return:
+            iterator over dictionaries containing the block information (or hexadecimal strings if
+            verbose is set to False)
+        :rtype: generator
+
+        """
+        kwargs.setdefault('priority', PRIORITY_LOW)
+        if executor is not None:
+            kwargs['executor'] = executor
+        if convert is not None:
+            kwargs['postprocess'] = convert
+        return map_concurrently(
+            lambda index: self.get_block(index, verbose=verbose, **kwargs), range(start, stop),
+            concurrency)
+
+    def get_application_logs(
+            self, tx_hashes, concurrency=4, batch_size=None, executor=None, convert=None,
+            **kwargs):
+        """ Returns an iterator over the application logs associated with many transactions.
+
+        Application logs are fetched concurrently but are returned in the order of the
+        transaction hashes. If ``batch_size`` is set, application logs are fetched using JSON-RPC
+        batch requests of ``batch_size`` calls (and ``concurrency`` batch requests can be sent at
+        the same time). Keyword arguments (eg. ``deadline``) are passed to each underlying call,
+        which use the low priority unless another ``priority`` is specified.
+        ``executor`` and ``convert`` have the same meaning as for ``get_blocks``.
+
+        :param tx_hashes: iterable of transaction hashes
+        :param concurrency: maximum number of requests being sent at the same time
+        :param batch_size: number of calls per batch request
+        :param executor: executor used to deserialize (and convert) the application logs
+        :param convert: callable applied to each application log
+        :type tx_hashes: iterable
+        :type concurrency: int
+        :type batch_size: int
+        :type executor: concurrent.futures.Executor
+        :type convert: callable
+        :return: iterator over dictionaries containing the application logs
+        :rtype: generator
+
+        """
+        kwargs.setdefault('priority', PRIORITY_LOW)
+        if executor is not None:
+            kwargs['executor'] = executor
+        if convert is not None:
+            kwargs['postprocess'] = convert
+        if not batch_size:
+            return map_concurrently(
+                lambda tx_hash: self.get_application_log(tx_hash, **kwargs), tx_hashes,
+                concurrency)
+        method = JSONRPCMethods.GET_APPLICATION_LOG.value
+        batches = map_concurrently(
+            lambda hashes: self._batch_call([(method, [h, ]) for h in hashes], **kwargs),
+            iter_chunks(tx_hashes, batch_size), concurrency)
+        return itertools.chain.from_iterable(batches)
+
+    def resolve_inputs(self, txs, concurrency=4, batch_size=None, **kwargs):
+        """ Attaches the address, asset and value of the spent outputs to transaction inputs.
+
+        The hashes of the previous transactions referenced by the inputs are deduplicated and the
+        previous transactions are fetched concurrently (using batch requests of ``batch_size``
+        calls if set), so that resolving the inputs of a whole block costs one call per distinct
+        previous transaction. The outputs of the previous transactions are stored in a bounded
+        cache (``outpoint_cache``) so that they are not fetched again by subsequent calls.
+        Keyword arguments (eg. ``deadline`` or ``executor``) are passed to each underlying call,
+        which use the low priority unless another ``priority`` is specified.
+
+        .. code-block:: python
+
+            >>> block = client.get_block(1000000)
+            >>> txs = client.resolve_inputs(block['tx'])
+            >>> txs[1]['vin'][0]['address']
+            'AdyQbbn6ENjqWDa5JNYMwN3ikNcA4JeZdk'
+
+        :param txs: iterable of dictionaries containing verbose transaction information
+        :param concurrency: maximum number of requests being sent at the same time
+        :param batch_size: number of calls per batch request
+        :type txs: iterable
+        :type concurrency: int
+        :type batch_size: int
+        :return: list of the transactions, whose inputs are updated in place
+        :rtype: list
+
+        """
+        kwargs.setdefault('priority', PRIORITY_LOW)
+        txs = list(txs)
+        inputs = [vin for tx in txs for vin in tx.get('vin', [])]
+
+        # The outputs that are already cached are kept aside so that they remain available even if
+        # they are evicted from the cache while the missing outputs are being fetched.
+        outputs = {}
+        missing_hashes = collections.OrderedDict()
+        for vin in inputs:
+            key = (vin['txid'], vin['vout'])
+            outpoint = outputs.get(key) or self.outpoint_cache.get(key)
+            if outpoint is None:
+                missing_hashes[vin['txid']] = None
+            else:
+                outputs[key] = outpoint
+        missing_hashes = list(missing_hashes)
+
+        if batch_size:
+            method = JSONRPCMethods.GET_RAW_TRANSACTION.value
+            batches = map_concurrently(
+                lambda hashes: self._batch_call([(method, [h, 1]) for h in hashes], **kwargs),
+                iter_chunks(missing_hashes, batch_size), concurrency)
+            previous_txs = itertools.chain.from_iterable(batches)
+        else:
+            previous_txs = map_concurrently(
+                lambda tx_hash: self.get_raw_transaction(tx_hash, **kwargs), missing_hashes,
+                concurrency)
+
+        # All the outputs of the previous transactions are cached because they can be spent by
+        # other transactions.
+        for tx_hash, previous_tx in zip(missing_hashes, previous_txs):
+            for vout in previous_tx['vout']:
+                outpoint = {'address': vout['address'], 'asset': vout['asset'],
+                            'value': vout['value']}
+                self.outpoint_cache.set((tx_hash, vout['n']), outpoint)
+                outputs[(tx_hash, vout['n'])] = outpoint
+
+        for vin in inputs:
+            key = (vin['txid'], vin['vout'])
+            outpoint = outputs.get(key)
+            if outpoint is None:
+                raise ProtocolError(
+                    'Output {} of transaction {} does not exist'.format(vin['vout'], vin['txid']),
+                    response=None)
+            vin.update(outpoint)
+        return txs
+
     ##################################
     # PRIVATE METHODS AND PROPERTIES #
     ##################################
 
-    def _call(self, method, params=None, request_id=None):
-        """ Calls the JSON-RPC endpoint. """
+    def _call(
+            self, method, params=None, request_id=None, timeout=None, deadline=None,
+            postprocess=None, executor=None, priority=None):
+        """ Calls the JSON-RPC endpoint.
+
+        The ``postprocess`` callable, if any, is applied to the result of the call (eg. in order to
+        decode invocation results). If ``executor`` is set (eg. a ``ProcessPoolExecutor``), the
+        response body is deserialized and post-processed by the executor. ``priority`` is the
+        priority lane used if the client has a scheduler.
+
+        """
         params = params or []
 
         # Determines which 'id' value to use and increment the counter associated with the current
         # client instance if applicable.
-        rid = request_id or self._id_counter
-        if request_id is None:
-            self._id_counter += 1
+        rid = next(self._id_counter) if request_id is None else request_id
 
-        # Prepares the payload and the headers that will be used to forge the request.
         payload = {'jsonrpc': '2.0', 'method': method, 'params': params, 'id': rid}
-        headers = {'Content-Type': 'application/json'}
-        scheme = 'https' if self.tls else 'http'
-        url = '{}://{}:{}'.format(scheme, self.host, self.port)
+        span = Span(method, rid, self.url) if self.hooks else None
+        try:
+            response, response_data = self._send(
+                payload, timeout, deadline, span, parse=executor is None, priority=priority)
+            if executor is not None:
+                response_data = self._parse_in_executor(executor, response, postprocess, span)
+                result = self._get_result(response, response_data)
+            else:
+                result = self._get_result(response, response_data)
+                if postprocess is not None:
+                    result = postprocess(result)
+                    if span is not None:
+                        span.mark('decode')
+        except Exception as e:
+            if span is not None:
+                self._emit_span(span, e)
+            raise
+        if span is not None:
+            self._emit_span(span)
+        return result
 
-        # Calls the JSON-RPC endpoint!
+    def _invoke(self, method, params, operation=None, **kwargs):
+        """ Performs a contract invocation, using the invocation cache if applicable. """
+        def call():
+            return self._call(method, params, postprocess=decode_invocation_result, **kwargs)
+
+        if self.invocation_cache is None:
+            return call()
+        # The height of the chain is checked using the same settings as the invocation.
+        height_kwargs = {
+            k: v for k, v in kwargs.items() if k in ('timeout', 'deadline', 'priority')}
+        return self.invocation_cache.get_or_call(
+            self, method, params, operation, call, **height_kwargs)
+
+    def _batch_call(
+            self, calls, timeout=None, deadline=None, postprocess=None, executor=None,
+            priority=None):
+        """ Calls the JSON-RPC endpoint using a batch request and returns the list of results.
+
+        ``calls`` must be a list of (method, params) tuples. A ``ProtocolError`` is raised if any of
+        the calls fails. ``postprocess``, ``executor`` and ``priority`` have the same meaning as
+        for ``_call``.
+
+        """
+        payload = [
+            {'jsonrpc': '2.0', 'method': method, 'params': params or [],
+             'id': next(self._id_counter)}
+            for method, params in calls]
+        span = Span('batch', [p['id'] for p in payload], self.url) if self.hooks else None
         try:
-            response = self.session.post(url, headers=headers, data=json.dumps(payload))
-            response.raise_for_status()
-        except HTTPError:
-            raise TransportError(
-                'Got unsuccessful response from server (status code: {})'.format(
-                    response.status_code),
-                response=response)
+            response, response_data = self._send(
+                payload, timeout, deadline, span, parse=executor is None, priority=priority)
+            if executor is not None:
+                response_data = self._parse_in_executor(executor, response, postprocess, span)
+        except Exception as e:
+            if span is not None:
+                self._emit_span(span, e)
+            raise
+        if span is not None:
+            self._emit_span(span)
+
+        # The JSON-RPC endpoint returns a single (error) response if the batch request as a whole
+        # is invalid. Otherwise the responses associated with each call can be returned in any
+        # order so they are sorted out using their IDs.
+        if not isinstance(response_data, list):
+            self._get_result(response, response_data)
+            raise ProtocolError(
+                'Batch response is not a list', response=response, data=response_data)
+        responses_data = {data.get('id'): data for data in response_data}
+        results = [self._get_result(response, responses_data.get(p['id'], {})) for p in payload]
+        if postprocess is not None and executor is None:
+            results = [postprocess(result) for result in results]
+        return results
+
+    def _send(self, payload, timeout, deadline, span=None, parse=True, priority=None):
+        """ Sends a payload to the JSON-RPC endpoint and returns the response and its data.
+
+        The duration of each phase of the call as well as the size of the request and response
+        bodies are recorded in the span (if any). If ``parse`` is False, the response body is not
+        deserialized and the returned data is None.
+
+        """
+        # Prepares the headers and the body that will be used to forge the request.
+        headers = {
+            'Content-Type': 'application/json',
+            'Accept-Encoding': 'gzip, deflate' if self.compression else 'identity',
+        }
+        data = self._encode_body(json.dumps(payload).encode('utf-8'), headers)
+        if span is not None:
+            span.mark('encode')
+            span.request_size = len(data)
+
+        # Calls the JSON-RPC endpoint!
+        response = self._post(data, headers, timeout, deadline, priority)
+        self._record_response_metrics(response)
+        if span is not None:
+            span.mark('transport')
+            span.response_size = len(response.content)
+            elapsed = getattr(response, 'elapsed', None)
+            if isinstance(elapsed, datetime.timedelta):
+                span.phases['round_trip'] = elapsed.total_seconds()
+
+        if not parse:
+            return response, None
 
         # Ensures the response body can be deserialized to JSON.
         try:
@@ -363,8 +772,65 @@ class Client:
         except ValueError as e:
             raise ProtocolError(
                 'Unable to deserialize response body: {}'.format(e), response=response)
-
-        # Properly handles potential errors.
+        if span is not None:
+            span.mark('parse')
+
+        return response, response_data
+
+    def _post(self, data, headers, timeout, deadline, priority=None):
+        """ Sends a request body to the JSON-RPC endpoint while enforcing the client's limits. """
+        # The priority lane is acquired first so that requests waiting for their lane do not hold
+        # the slots (or the tokens) of the other limiters. The shared limiters then serve the
+        # waiting requests in priority order.
+        if self.scheduler is None:
+            return self._post_with_limits(data, headers, timeout, deadline, priority)
+        priority = self.scheduler.default_priority if priority is None else priority
+        self.scheduler.acquire(priority, self._get_timeout(timeout, deadline))
+        try:
+            return self._post_with_limits(data, headers, timeout, deadline, priority)
+        finally:
+            self.scheduler.release(priority)
+
+    def _post_with_limits(self, data, headers, timeout, deadline, priority=None):
+        """ Sends a request body to the JSON-RPC endpoint while enforcing the node limits. """
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire(self._get_timeout(timeout, deadline), priority=priority)
+
+        limiter = self.concurrency_limiter
+        if limiter is None:
+            return self.transport.post(
+                self.url, data=data, headers=headers, timeout=self._get_timeout(timeout, deadline),
+                deadline=deadline)
+
+        # The latency and the outcome of the request are reported to the concurrency limiter so
+        # that it can adjust the number of in-flight requests.
+        limiter.acquire(self._get_timeout(timeout, deadline), priority=priority)
+        start = time.perf_counter()
+        try:
+            response = self.transport.post(
+                self.url, data=data, headers=headers, timeout=self._get_timeout(timeout, deadline),
+                deadline=deadline)
+        except TransportError:
+            limiter.release(time.perf_counter() - start, error=True)
+            raise
+        except BaseException:
+            limiter.release(adjust=False)
+            raise
+        limiter.release(time.perf_counter() - start)
+        return response
+
+    def _parse_in_executor(self, executor, response, postprocess, span=None):
+        """ Deserializes (and post-processes) the body of a response using an executor. """
+        response_data, error = executor.submit(
+            _parse_response_content, response.content, postprocess).result()
+        if error is not None:
+            raise ProtocolError(error, response=response)
+        if span is not None:
+            span.mark('parse')
+        return response_data
+
+    def _get_result(self, response, response_data):
+        """ Returns the result embedded in the data of a response or raises the related error. """
         if response_data.get('error'):
             code = response_data['error'].get('code', '')
             message = response_data['error'].get('message', '')
@@ -377,6 +843,68 @@ class Client:
 
         return response_data['result']
 
+    def _emit_span(self, span, error=None):
+        """ Finishes a span and calls the tracing hooks with it.
+
+        Exceptions raised by hooks are logged so that a faulty hook never affects the outcome of
+        a call.
+
+        """
+        span.finish(error)
+        for hook in list(self.hooks):
+            try:
+                hook(span)
+            except Exception:
+                logger.exception('Tracing hook %r failed', hook)
+
+    def _encode_body(self, body, headers):
+        """ Returns the body to send to the JSON-RPC endpoint, compressed if applicable. """
+        size = len(body)
+        threshold = self.compress_requests_threshold
+        if threshold is not None and size > threshold:
+            body = gzip.compress(body)
+            headers['Content-Encoding'] = 'gzip'
+        self.metrics.increment('requests')
+        self.metrics.increment('request_bytes', len(body))
+        self.metrics.increment('request_bytes_saved', size - len(body))
+        return body
+
+    def _record_response_metrics(self, response):
+        """ Records the number of bytes received (and saved through compression) for a response. """
+        size = len(response.content)
+        received_bytes = self.transport.received_bytes(response)
+        received_bytes = size if received_bytes is None else received_bytes
+        self.metrics.increment('response_bytes', received_bytes)
+        self.metrics.increment('response_bytes_saved', max(0, size - received_bytes))
+
+    def _get_timeout(self, timeout, deadline):
+        """ Returns the timeout to use for a single request given a timeout and/or a deadline. """
+        timeout = self.timeout if timeout is None else timeout
+        if deadline is None:
+            return timeout
+        if deadline.expired:
+            raise TransportTimeoutError('Deadline exceeded before the request could be sent')
+        remaining = deadline.remaining()
+        return remaining if timeout is None else min(timeout, remaining)
+
+
+def _parse_response_content(content, postprocess=None):
+    """ Deserializes a response body and post-processes the results it contains.
+
+    This function is meant to be run in worker processes: it returns a (response data, error
+    message) tuple because exceptions embedding responses cannot be sent back to the client.
+
+    """
+    try:
+        response_data = json.loads(content.decode('utf-8'))
+    except ValueError as e:
+        return None, 'Unable to deserialize response body: {}'.format(e)
+    if postprocess is not None:
+        for data in (response_data if isinstance(response_data, list) else [response_data, ]):
+            if isinstance(data, dict) and not data.get('error') and 'result' in data:
+                data['result'] = postprocess(data['result'])
+    return response_data, None
+
 
 class ContractWrapper:
     """ Strategy class allowing to provide a high-level interface for invoking smart contracts. """
@@ -402,5 +930,5 @@ class ContractFunctionWrapper:
         self.script_hash = script_hash
         self.funcname = funcname
 
-    def __call__(self, *args):
-        return self.client.invoke_function(self.script_hash, self.funcname, args)
+    def __call__(self, *args, **kwargs):
+        return self.client.invoke_function(self.script_hash, self.funcname, args, **kwargs)
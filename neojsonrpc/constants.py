@@ -17,6 +17,11 @@ class JSONRPCMethods(Enum):
     # address.
     GET_ACCOUNT_STATE = 'getaccountstate'
 
+    # The 'getapplicationlog' method allows to get the application log (execution results and
+    # notifications) associated with a specific transaction hash. This method is only available
+    # on nodes running the ApplicationLogs plugin.
+    GET_APPLICATION_LOG = 'getapplicationlog'
+
     # The 'getassetstate' method allows to query the asset information, based on a specified asset
     # number.
     GET_ASSET_STATE = 'getassetstate'
@@ -26,6 +26,13 @@ class TransportError(JSONRPCError):
         self.response = response
 
 
+class TransportTimeoutError(TransportError):
+    """ Raised when a request to the JSON-RPC server does not complete within its timeout. """
+
+    def __init__(self, msg, response=None):
+        super(TransportTimeoutError, self).__init__(msg, response)
+
+
 class ProtocolError(JSONRPCError):
     """ Raised when an error occurs related to the JSON-RPC protocol / the NEO JSON-RPC methods. """
 
@@ -33,3 +40,19 @@ class ProtocolError(JSONRPCError):
         super(ProtocolError, self).__init__(msg)
         self.response = response
         self.data = data
+
+
+class TransactionExpiredError(JSONRPCError):
+    """ Raised when a tracked transaction is not included in a block before it expires. """
+
+    def __init__(self, msg, tx_hash):
+        super(TransactionExpiredError, self).__init__(msg)
+        self.tx_hash = tx_hash
+
+
+class StaleSnapshotError(JSONRPCError):
+    """ Raised when no node is at the height of a snapshot anymore. """
+
+    def __init__(self, msg, height):
+        super(StaleSnapshotError, self).__init__(msg)
+        self.height = height
@@ -0,0 +1,283 @@
+"""
+    NEO JSON-RPC columnar export
+    ============================
+
+    This module allows to export ranges of blocks to columnar files for analytics purposes. Blocks
+    are fetched concurrently using a ``Client`` instance and are flattened into five tables (blocks,
+    transactions, inputs, outputs and invocations) whose columns are typed: heights, timestamps,
+    sizes and amounts are stored as 64-bit integers while hashes are stored as fixed-width binary
+    values. Amounts (values, fees and gas) are expressed in fixed8 units (ie. 10^-8).
+
+    Tables are written in chunks of consecutive blocks so that memory usage remains bounded
+    regardless of the size of the exported range. Chunks are written as Parquet files if pyarrow is
+    installed and as NumPy ``.npy`` column arrays otherwise. A manifest file keeps track of the
+    exported chunks so that an interrupted export can be resumed.
+
+"""
+
+import collections
+import json
+import os
+import shutil
+from decimal import Decimal
+
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:  # pragma: no cover
+    pyarrow = None
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
+
+INT32 = 'int32'
+INT64 = 'int64'
+HASH256 = 'hash256'
+STRING = 'string'
+BINARY = 'binary'
+
+TABLES = collections.OrderedDict([
+    ('blocks', (
+        ('index', INT64), ('hash', HASH256), ('time', INT64), ('size', INT64),
+        ('version', INT32), ('merkleroot', HASH256), ('previousblockhash', HASH256),
+        ('nextconsensus', STRING), ('tx_count', INT32), )),
+    ('transactions', (
+        ('block_index', INT64), ('tx_index', INT32), ('txid', HASH256), ('type', STRING),
+        ('version', INT32), ('size', INT64), ('sys_fee', INT64), ('net_fee', INT64), )),
+    ('inputs', (
+        ('block_index', INT64), ('txid', HASH256), ('n', INT32), ('prev_txid', HASH256),
+        ('prev_n', INT32), )),
+    ('outputs', (
+        ('block_index', INT64), ('txid', HASH256), ('n', INT32), ('asset', HASH256),
+        ('value', INT64), ('address', STRING), )),
+    ('invocations', (
+        ('block_index', INT64), ('txid', HASH256), ('gas', INT64), ('script', BINARY), )),
+])
+
+MANIFEST_FILENAME = 'manifest.json'
+
+NULL_HASH256 = bytes(32)
+
+
+def export_blocks(
+        client, start, stop, path, chunk_size=10000, concurrency=4, format=None, executor=None):
+    """ Exports the blocks whose indexes are in the [start, stop) range to columnar chunk files.
+
+    Each chunk covers ``chunk_size`` consecutive blocks (the last one may cover fewer blocks) and
+    is written for each table in ``<path>/<table>/<first index>-<last index>.<format>``. If the
+    considered directory already contains a manifest for the same export, the export is resumed
+    from the first chunk that was not completely written.
+
+    :param client: client used to fetch the blocks
+    :param start: index of the first block to export
+    :param stop: index following the index of the last block to export
+    :param path: path of the directory where the chunk files are written
+    :param chunk_size: number of blocks per chunk
+    :param concurrency: maximum number of blocks being fetched at the same time
+    :param format:
+        format of the chunk files ('parquet' or 'npy'), defaults to 'parquet' if pyarrow is
+        installed and to 'npy' otherwise
+    :param executor:
+        executor (eg. a ``ProcessPoolExecutor``) used to deserialize and flatten the blocks
+    :type client: neojsonrpc.Client
+    :type start: int
+    :type stop: int
+    :type path: str
+    :type chunk_size: int
+    :type concurrency: int
+    :type format: str
+    :type executor: concurrent.futures.Executor
+    :return: index following the index of the last exported block
+    :rtype: int
+
+    """
+    writer = _get_writer(format)
+    manifest = _load_manifest(path, start, stop, chunk_size, writer.format)
+
+    chunk = _Chunk()
+    chunk_start = manifest['next_index']
+    if executor is None:
+        blocks = client.get_blocks(chunk_start, stop, concurrency=concurrency)
+        blocks_tables = map(flatten_block, blocks)
+    else:
+        blocks_tables = client.get_blocks(
+            chunk_start, stop, concurrency=concurrency, executor=executor, convert=flatten_block)
+    for index, block_tables in enumerate(blocks_tables, chunk_start):
+        chunk.add_block_tables(block_tables)
+        if index + 1 == stop or (index + 1 - start) % chunk_size == 0:
+            for table, rows in chunk.tables.items():
+                writer.write(
+                    os.path.join(path, table, '{:010d}-{:010d}'.format(chunk_start, index)),
+                    TABLES[table], rows)
+            manifest['next_index'] = chunk_start = index + 1
+            _save_manifest(path, manifest)
+            chunk = _Chunk()
+
+    return manifest['next_index']
+
+
+def flatten_block(block):
+    """ Returns a dictionary of the rows of each table associated with a verbose block.
+
+    :param block: dictionary containing the block information (as returned by ``get_block``)
+    :type block: dict
+    :return: dictionary associating table names to lists of row tuples
+    :rtype: dict
+
+    """
+    tables = collections.OrderedDict((table, []) for table in TABLES)
+    index = block['index']
+    tables['blocks'].append((
+        index, _hash(block['hash']), block['time'], block['size'], block['version'],
+        _hash(block['merkleroot']), _hash(block.get('previousblockhash')),
+        block['nextconsensus'], len(block['tx']), ))
+
+    for tx_index, tx in enumerate(block['tx']):
+        txid = _hash(tx['txid'])
+        tables['transactions'].append((
+            index, tx_index, txid, tx['type'], tx['version'], tx['size'],
+            _fixed8(tx.get('sys_fee')), _fixed8(tx.get('net_fee')), ))
+        for n, vin in enumerate(tx.get('vin', [])):
+            tables['inputs'].append((index, txid, n, _hash(vin['txid']), vin['vout'], ))
+        for vout in tx.get('vout', []):
+            tables['outputs'].append((
+                index, txid, vout['n'], _hash(vout['asset']), _fixed8(vout['value']),
+                vout['address'], ))
+        if tx['type'] == 'InvocationTransaction':
+            tables['invocations'].append((
+                index, txid, _fixed8(tx.get('gas')), bytes.fromhex(tx['script']), ))
+
+    return tables
+
+
+class _Chunk:
+    """ Accumulates the rows of the tables associated with consecutive blocks. """
+
+    def __init__(self):
+        self.tables = collections.OrderedDict((table, []) for table in TABLES)
+
+    def add_block_tables(self, block_tables):
+        for table, rows in block_tables.items():
+            self.tables[table].extend(rows)
+
+
+class _ParquetWriter:
+    """ Writes table chunks as Parquet files. """
+
+    format = 'parquet'
+
+    def write(self, path, columns, rows):
+        arrays = []
+        values = list(zip(*rows)) or [[] for _ in columns]
+        for (name, kind), column in zip(columns, values):
+            arrays.append(pyarrow.array(column, type=self._get_type(kind)))
+        table = pyarrow.Table.from_arrays(arrays, names=[name for name, _ in columns])
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        pyarrow.parquet.write_table(table, path + '.tmp')
+        os.replace(path + '.tmp', path + '.parquet')
+
+    def _get_type(self, kind):
+        return {
+            INT32: pyarrow.int32(),
+            INT64: pyarrow.int64(),
+            HASH256: pyarrow.binary(32),
+            STRING: pyarrow.string(),
+            BINARY: pyarrow.binary(),
+        }[kind]
+
+
+class _NumpyWriter:
+    """ Writes table chunks as directories containing one ``.npy`` file per column.
+
+    Hashes are stored as (n, 32) arrays of bytes and strings as fixed-width unicode arrays.
+    Variable-length binary columns are stored as two arrays: a ``<column>.data.npy`` array of
+    concatenated bytes and a ``<column>.offsets.npy`` array of n + 1 offsets in the former.
+
+    """
+
+    format = 'npy'
+
+    def write(self, path, columns, rows):
+        tmp_path = path + '.tmp'
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        os.makedirs(tmp_path)
+        values = list(zip(*rows)) or [[] for _ in columns]
+        for (name, kind), column in zip(columns, values):
+            for suffix, array in self._get_arrays(kind, column):
+                numpy.save(os.path.join(tmp_path, name + suffix + '.npy'), array)
+        shutil.rmtree(path + '.npy', ignore_errors=True)
+        os.replace(tmp_path, path + '.npy')
+
+    def _get_arrays(self, kind, column):
+        if kind in (INT32, INT64):
+            return [('', numpy.array(column, dtype=kind))]
+        elif kind == HASH256:
+            data = numpy.frombuffer(b''.join(column), dtype=numpy.uint8)
+            return [('', data.reshape(-1, 32))]
+        elif kind == STRING:
+            return [('', numpy.array(column, dtype=str))]
+        offsets = numpy.zeros(len(column) + 1, dtype=numpy.int64)
+        numpy.cumsum([len(value) for value in column], out=offsets[1:])
+        data = numpy.frombuffer(b''.join(column), dtype=numpy.uint8)
+        return [('.offsets', offsets), ('.data', data)]
+
+
+def _get_writer(format):
+    """ Returns the writer to use for the considered format. """
+    if format is None:
+        format = 'parquet' if pyarrow is not None else 'npy'
+    if format == 'parquet':
+        if pyarrow is None:
+            raise ImportError('Exporting to Parquet files requires the pyarrow package')
+        return _ParquetWriter()
+    elif format == 'npy':
+        if numpy is None:
+            raise ImportError('Exporting to .npy files requires the numpy package')
+        return _NumpyWriter()
+    raise ValueError('Unsupported export format: {}'.format(format))
+
+
+def _load_manifest(path, start, stop, chunk_size, format):
+    """ Returns the manifest of the export, creating it if it does not exist. """
+    manifest = {
+        'start': start, 'stop': stop, 'chunk_size': chunk_size, 'format': format,
+        'next_index': start,
+    }
+    try:
+        with open(os.path.join(path, MANIFEST_FILENAME)) as f:
+            existing_manifest = json.load(f)
+    except FileNotFoundError:
+        os.makedirs(path, exist_ok=True)
+        return manifest
+
+    next_index = existing_manifest.pop('next_index')
+    if existing_manifest != {k: v for k, v in manifest.items() if k != 'next_index'}:
+        raise ValueError(
+            'The directory {} contains an export that was made with different settings'.format(
+                path))
+    manifest['next_index'] = next_index
+    return manifest
+
+
+def _save_manifest(path, manifest):
+    """ Atomically saves the manifest of the export. """
+    tmp_filename = os.path.join(path, MANIFEST_FILENAME + '.tmp')
+    with open(tmp_filename, 'w') as f:
+        json.dump(manifest, f)
+    os.replace(tmp_filename, os.path.join(path, MANIFEST_FILENAME))
+
+
+def _hash(value):
+    """ Converts an hexadecimal hash (eg. 0x2d...) to its binary representation. """
+    if not value:
+        return NULL_HASH256
+    return bytes.fromhex(value[2:] if value.startswith('0x') else value)
+
+
+def _fixed8(value):
+    """ Converts a decimal amount (eg. '0.001') to an integer expressed in fixed8 units. """
+    return int(Decimal(value or 0) * 100000000)
@@ -0,0 +1,181 @@
+"""
+    NEO JSON-RPC client limiters
+    ============================
+
+    This module defines limiters that can be used by the NEO JSON-RPC client in order to avoid
+    overloading nodes: an adaptive concurrency limiter, which adjusts the number of in-flight
+    requests sent to a node based on observed latencies and errors, and a token bucket rate limiter.
+    It also defines a scheduler separating the requests of different priorities (eg. interactive
+    and bulk requests) into lanes that have their own concurrency budgets.
+
+    The limiters are shared by all the priority lanes: requests of the high priority (or without
+    priority) that are waiting for a limiter are served before the requests of other priorities,
+    so that bulk requests never hold the capacity of a node at the expense of interactive requests.
+
+"""
+
+import threading
+import time
+
+from .exceptions import TransportTimeoutError
+
+
+PRIORITY_HIGH = 'high'
+PRIORITY_LOW = 'low'
+
+
+class AIMDLimiter:
+    """ Concurrency limiter relying on an additive increase / multiplicative decrease algorithm.
+
+    The limit of in-flight requests grows by ``increase`` for each window of successful requests
+    (ie. each time ``limit`` requests succeed). It is multiplied by ``backoff`` if a request fails
+    with a ``TransportError`` (eg. 5xx responses or timeouts) or if its latency exceeds
+    ``latency_target`` (if set). A failed (or slow) request only decreases the limit if it was sent
+    after the previous decrease, ie. if its latency is shorter than the time elapsed since then:
+    requests that were already in flight when the limit was decreased reflect the previous load,
+    so that a burst of errors does not collapse the limit. The limit of in-flight requests
+    therefore converges towards the capacity of the node.
+
+    """
+
+    def __init__(
+            self, initial_limit=4, min_limit=1, max_limit=64, latency_target=None, backoff=0.5,
+            increase=1):
+        self.limit = float(initial_limit)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.latency_target = latency_target
+        self.backoff = backoff
+        self.increase = increase
+        self.in_flight = 0
+        self._condition = threading.Condition()
+        self._last_decrease = 0
+        self._waiting_high = 0
+
+    def acquire(self, timeout=None, priority=None):
+        """ Waits until a request can be sent, raises ``TransportTimeoutError`` on timeout. """
+        high = priority in (None, PRIORITY_HIGH)
+        with self._condition:
+            self._waiting_high += high
+            try:
+                acquired = self._condition.wait_for(
+                    lambda: self.in_flight < int(self.limit) and (high or not self._waiting_high),
+                    timeout)
+            finally:
+                self._waiting_high -= high
+                if high:
+                    self._condition.notify_all()
+            if not acquired:
+                raise TransportTimeoutError(
+                    'Timed out while waiting for the concurrency limit ({})'.format(
+                        int(self.limit)))
+            self.in_flight += 1
+
+    def release(self, latency=None, error=False, adjust=True):
+        """ Releases the slot of a completed request and adjusts the limit accordingly.
+
+        If ``adjust`` is False, the slot is released without changing the limit (eg. for requests
+        that were interrupted before their outcome was known).
+
+        """
+        with self._condition:
+            self.in_flight -= 1
+            if not adjust:
+                self._condition.notify_all()
+                return
+            now = time.monotonic()
+            slow = None not in (self.latency_target, latency) and latency > self.latency_target
+            if error or slow:
+                if now - self._last_decrease > (latency or 0):
+                    self.limit = max(self.min_limit, self.limit * self.backoff)
+                    self._last_decrease = now
+            else:
+                self.limit = min(self.max_limit, self.limit + self.increase / self.limit)
+            self._condition.notify_all()
+
+
+class TokenBucket:
+    """ Rate limiter allowing ``rate`` requests per second on average and bursts of ``burst``. """
+
+    def __init__(self, rate, burst=None):
+        self.rate = rate
+        self.burst = burst or max(1, rate)
+        self.tokens = float(self.burst)
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+        self._waiting_high = 0
+
+    def acquire(self, timeout=None, priority=None):
+        """ Waits until a token is available, raises ``TransportTimeoutError`` on timeout. """
+        high = priority in (None, PRIORITY_HIGH)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._lock:
+            self._waiting_high += high
+        try:
+            while True:
+                with self._lock:
+                    now = time.monotonic()
+                    self.tokens = min(
+                        self.burst, self.tokens + (now - self._last_refill) * self.rate)
+                    self._last_refill = now
+                    # Requests of other priorities leave the available tokens to the high priority
+                    # requests that are waiting for them.
+                    if self.tokens >= 1 and (high or not self._waiting_high):
+                        self.tokens -= 1
+                        return
+                    wait = (1 - self.tokens if self.tokens < 1 else 1) / self.rate
+                if deadline is not None and now + wait > deadline:
+                    raise TransportTimeoutError('Timed out while waiting for the rate limit')
+                time.sleep(wait)
+        finally:
+            with self._lock:
+                self._waiting_high -= high
+
+
+class PriorityScheduler:
+    """ Scheduler bounding the number of in-flight requests of each priority lane.
+
+    ``lanes`` associates each priority with the maximum number of in-flight requests of this
+    priority. Requests are assigned to a lane using the ``priority`` keyword argument of the
+    client's methods (requests without priority use ``default_priority``). Since each lane has its
+    own concurrency budget, bulk requests (which use the low priority by default) never delay
+    interactive requests by more than the time it takes the node to process them. For example:
+
+    .. code-block:: python
+
+        >>> client = Client(scheduler=PriorityScheduler({PRIORITY_HIGH: 16, PRIORITY_LOW: 4}))
+        >>> blocks = client.get_blocks(0, 100000, concurrency=16)  # At most 4 requests in flight
+        >>> client.get_account_state(address)  # Not delayed by the bulk requests
+
+    """
+
+    def __init__(self, lanes=None, default_priority=PRIORITY_HIGH):
+        self.lanes = dict(lanes or {PRIORITY_HIGH: 16, PRIORITY_LOW: 4})
+        if default_priority not in self.lanes:
+            raise ValueError('Unknown default priority: {}'.format(default_priority))
+        self.default_priority = default_priority
+        self.in_flight = {priority: 0 for priority in self.lanes}
+        self._condition = threading.Condition()
+
+    def acquire(self, priority=None, timeout=None):
+        """ Waits until a request of the considered priority can be sent. """
+        priority = self._get_lane(priority)
+        with self._condition:
+            if not self._condition.wait_for(
+                    lambda: self.in_flight[priority] < self.lanes[priority], timeout):
+                raise TransportTimeoutError(
+                    'Timed out while waiting for the {} priority lane'.format(priority))
+            self.in_flight[priority] += 1
+
+    def release(self, priority=None):
+        """ Releases the slot of a completed request of the considered priority. """
+        priority = self._get_lane(priority)
+        with self._condition:
+            self.in_flight[priority] -= 1
+            self._condition.notify_all()
+
+    def _get_lane(self, priority):
+        priority = self.default_priority if priority is None else priority
+        if priority not in self.lanes:
+            raise ValueError('Unknown priority: {}'.format(priority))
+        return priority
@@ -0,0 +1,37 @@
+"""
+    NEO JSON-RPC client metrics
+    ===========================
+
+    This module defines a simple thread-safe metrics registry allowing the NEO JSON-RPC client (and
+    the tools built on top of it) to keep track of various counters, such as the number of requests
+    sent to the JSON-RPC endpoint or the number of bytes exchanged with it.
+
+"""
+
+import threading
+
+
+class Metrics:
+    """ Thread-safe registry of named counters. """
+
+    def __init__(self):
+        self._counters = {}
+        self._lock = threading.Lock()
+
+    def __getitem__(self, name):
+        return self._counters.get(name, 0)
+
+    def increment(self, name, value=1):
+        """ Increments the counter associated with the considered name. """
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def as_dict(self):
+        """ Returns a dictionary containing the current values of all the counters. """
+        with self._lock:
+            return dict(self._counters)
+
+    def reset(self):
+        """ Resets all the counters. """
+        with self._lock:
+            self._counters.clear()
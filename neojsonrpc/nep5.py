@@ -0,0 +1,147 @@
+"""
+    NEO JSON-RPC NEP-5 transfers extraction
+    =======================================
+
+    This module allows to extract the NEP-5 token transfers of a range of blocks. Invocation
+    transactions are picked out of the blocks and their application logs are fetched concurrently
+    (or in batches) in order to decode the ``transfer`` notifications they contain.
+
+    It should be noted that application logs are only available on nodes running the
+    ApplicationLogs plugin.
+
+"""
+
+import binascii
+import collections
+import itertools
+import os
+
+from .utils import _decode_invocation_result_stack
+
+
+Transfer = collections.namedtuple(
+    'Transfer', ['block_index', 'txid', 'contract', 'sender', 'recipient', 'amount'])
+Transfer.__doc__ = """ NEP-5 token transfer.
+
+``contract``, ``sender`` and ``recipient`` are script hashes (eg. 0xecc6b20d...). ``sender`` is None
+for tokens that are minted and ``recipient`` is None for tokens that are burnt. ``amount`` is
+expressed in the smallest unit of the token (ie. it is not divided by the decimals of the token).
+
+"""
+
+
+def iter_transfers(
+        client, start, stop, concurrency=8, batch_size=None, checkpoint=None,
+        checkpoint_interval=100):
+    """ Returns an iterator over the NEP-5 transfers of the blocks in the [start, stop) range.
+
+    Transfers are returned in the order of the blocks and transactions. If ``checkpoint`` is set,
+    the index of the block following the last block whose transfers were all consumed is saved to
+    this file every ``checkpoint_interval`` blocks (and once the range is processed) and the
+    extraction is resumed from this index if the file exists.
+
+    :param client: client used to fetch the blocks and the application logs
+    :param start: index of the first block to scan
+    :param stop: index following the index of the last block to scan
+    :param concurrency: maximum number of requests being sent at the same time
+    :param batch_size: number of application logs fetched per batch request (if applicable)
+    :param checkpoint: path of the checkpoint file
+    :param checkpoint_interval: number of blocks between two checkpoint saves
+    :type client: neojsonrpc.Client
+    :type start: int
+    :type stop: int
+    :type concurrency: int
+    :type batch_size: int
+    :type checkpoint: str
+    :type checkpoint_interval: int
+    :return: iterator over ``Transfer`` objects
+    :rtype: generator
+
+    """
+    if checkpoint is not None and os.path.exists(checkpoint):
+        with open(checkpoint) as f:
+            start = max(start, int(f.read().strip()))
+
+    # Invocation transactions and ends of blocks are flattened into a single stream of items. The
+    # stream is duplicated so that the application logs of the transactions can be fetched ahead
+    # of the items being processed (which is bounded by the concurrency of the bulk helpers).
+    blocks = client.get_blocks(start, stop, concurrency=concurrency)
+    items, tx_items = itertools.tee(_iter_invocations(blocks))
+    logs = client.get_application_logs(
+        (txid for _, txid in tx_items if txid is not None), concurrency=concurrency,
+        batch_size=batch_size)
+
+    for block_index, txid in items:
+        if txid is not None:
+            for transfer in decode_transfers(next(logs), block_index, txid):
+                yield transfer
+        elif checkpoint is not None and (
+                (block_index + 1 - start) % checkpoint_interval == 0 or block_index + 1 == stop):
+            _save_checkpoint(checkpoint, block_index + 1)
+
+
+def decode_transfers(application_log, block_index=None, txid=None):
+    """ Returns the list of NEP-5 transfers embedded in an application log.
+
+    Both the application logs of the most recent versions of the ApplicationLogs plugin (where
+    notifications are grouped by execution) and of the older versions are supported. The
+    notifications of executions that ended in a FAULT state are ignored.
+
+    :param application_log: dictionary containing an application log
+    :param block_index: index of the block including the transaction
+    :param txid: hash of the transaction
+    :type application_log: dict
+    :type block_index: int
+    :type txid: str
+    :return: list of ``Transfer`` objects
+    :rtype: list
+
+    """
+    transfers = []
+    txid = txid or application_log.get('txid')
+    for execution in application_log.get('executions', [application_log, ]):
+        if 'FAULT' in execution.get('vmstate', ''):
+            continue
+        for notification in execution.get('notifications', []):
+            state = _decode_invocation_result_stack([notification['state'], ])[0]
+            values = state['value'] if state['type'] == 'Array' else []
+            if len(values) != 4 or values[0]['value'] != b'transfer':
+                continue
+            transfers.append(Transfer(
+                block_index, txid, notification['contract'], _decode_script_hash(values[1]),
+                _decode_script_hash(values[2]), _decode_integer(values[3])))
+    return transfers
+
+
+def _iter_invocations(blocks):
+    """ Returns an iterator over (block index, txid) tuples for invocation transactions.
+
+    A (block index, None) tuple is returned once all the invocations of a block were returned.
+
+    """
+    for block in blocks:
+        for tx in block['tx']:
+            if tx['type'] == 'InvocationTransaction':
+                yield block['index'], tx['txid']
+        yield block['index'], None
+
+
+def _decode_script_hash(item):
+    """ Returns the script hash (eg. 0xecc6b20d...) embedded in a decoded stack item. """
+    if item['type'] != 'ByteArray' or not item['value']:
+        return None
+    return '0x' + binascii.hexlify(bytes(reversed(item['value']))).decode('ascii')
+
+
+def _decode_integer(item):
+    """ Returns the integer embedded in a decoded stack item. """
+    if item['type'] == 'ByteArray':
+        return int.from_bytes(bytes(item['value']), 'little', signed=True)
+    return int(item['value'])
+
+
+def _save_checkpoint(path, index):
+    """ Atomically saves a checkpoint index to a file. """
+    with open(path + '.tmp', 'w') as f:
+        f.write(str(index))
+    os.replace(path + '.tmp', path)
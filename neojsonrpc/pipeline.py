@@ -0,0 +1,150 @@
+"""
+    NEO JSON-RPC streaming pipelines
+    ================================
+
+    This module defines the ``TransactionPipeline`` class, which allows to stream the transactions
+    of a range of blocks through parallel map/filter stages. Stages are connected by bounded queues
+    so that a slow consumer slows down the fetching of blocks instead of increasing memory usage.
+
+"""
+
+import queue
+import threading
+
+from .utils import map_concurrently
+
+
+class TransactionPipeline:
+    """ Streams the transactions of a range of blocks through map and filter stages.
+
+    Each stage runs in its own thread (and can rely on many workers) and is connected to the
+    previous stage through a queue of at most ``queue_size`` items. Transactions are returned in
+    the order of the blocks and a ``block_index`` key is added to each of them. For example:
+
+    .. code-block:: python
+
+        >>> pipeline = TransactionPipeline(client, 2000000, 2100000, concurrency=8) \\
+        ...     .filter(touches_contract('ecc6b20d3ccac1ee9ef109af5a7cdb85706b1df9')) \\
+        ...     .map(lambda tx: client.get_application_log(tx['txid']), workers=8)
+        >>> for application_log in pipeline:
+        ...     print(application_log)
+
+    An exception raised by a stage is raised again by the iterator. All the threads of the
+    pipeline are stopped if the iterator is closed before the end of the stream.
+
+    """
+
+    def __init__(self, client, start, stop, concurrency=4, queue_size=1000):
+        self.client = client
+        self.start = start
+        self.stop = stop
+        self.concurrency = concurrency
+        self.queue_size = queue_size
+        self.stages = []
+
+    def map(self, func, workers=1):
+        """ Adds a stage replacing each item by the result of ``func(item)``. """
+        self.stages.append((lambda item: (True, func(item)), workers))
+        return self
+
+    def filter(self, predicate, workers=1):
+        """ Adds a stage only keeping the items for which ``predicate(item)`` is true. """
+        self.stages.append((lambda item: (predicate(item), item), workers))
+        return self
+
+    def __iter__(self):
+        stop_event = threading.Event()
+        input_queue = queue.Queue(self.queue_size)
+        threads = [threading.Thread(
+            target=self._run_source, args=(input_queue, stop_event), daemon=True), ]
+        for func, workers in self.stages:
+            output_queue = queue.Queue(self.queue_size)
+            threads.append(threading.Thread(
+                target=self._run_stage, args=(func, workers, input_queue, output_queue, stop_event),
+                daemon=True))
+            input_queue = output_queue
+
+        for thread in threads:
+            thread.start()
+        try:
+            for item in _iter_queue(input_queue, stop_event):
+                yield item
+        finally:
+            stop_event.set()
+
+    def _run_source(self, output_queue, stop_event):
+        """ Fetches the blocks and puts their transactions in the output queue. """
+        try:
+            for block in self.client.get_blocks(
+                    self.start, self.stop, concurrency=self.concurrency):
+                for tx in block['tx']:
+                    tx['block_index'] = block['index']
+                    if not _put(output_queue, tx, stop_event):
+                        return
+        except Exception as e:
+            _put(output_queue, _StageError(e), stop_event)
+            return
+        _put(output_queue, _END, stop_event)
+
+    def _run_stage(self, func, workers, input_queue, output_queue, stop_event):
+        """ Applies a stage function to the items of the input queue. """
+        try:
+            for keep, item in map_concurrently(func, _iter_queue(input_queue, stop_event), workers):
+                if keep and not _put(output_queue, item, stop_event):
+                    return
+        except Exception as e:
+            _put(output_queue, _StageError(e), stop_event)
+            return
+        _put(output_queue, _END, stop_event)
+
+
+def touches_contract(script_hash):
+    """ Returns a predicate matching the invocation transactions calling a specific contract.
+
+    :param script_hash: contract script hash
+    :type script_hash: str
+    :return: predicate taking a transaction dictionary
+    :rtype: callable
+
+    """
+    # Contracts are called using their script hash in little-endian byte order. Scripts are
+    # compared as bytes so that the script hash cannot be matched across byte boundaries.
+    script_hash = script_hash[2:] if script_hash.startswith('0x') else script_hash
+    operand = bytes(reversed(bytes.fromhex(script_hash)))
+    return lambda tx: (
+        tx['type'] == 'InvocationTransaction' and operand in bytes.fromhex(tx.get('script', '')))
+
+
+class _StageError:
+    """ Wraps an exception raised by a stage of a pipeline. """
+
+    def __init__(self, exception):
+        self.exception = exception
+
+
+_END = object()
+
+
+def _put(q, item, stop_event):
+    """ Puts an item in a queue unless the pipeline is stopped, returns False if it is stopped. """
+    while not stop_event.is_set():
+        try:
+            q.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _iter_queue(q, stop_event):
+    """ Returns an iterator over the items of a queue until the end of the stream. """
+    while not stop_event.is_set():
+        try:
+            item = q.get(timeout=0.1)
+        except queue.Empty:
+            continue
+        if item is _END:
+            return
+        elif isinstance(item, _StageError):
+            raise item.exception
+        yield item
@@ -0,0 +1,119 @@
+"""
+    NEO JSON-RPC height-pinned snapshots
+    ====================================
+
+    This module defines the ``Snapshot`` class, which allows to perform consistent reads across
+    many calls (and many nodes) by pinning these calls to a specific block height.
+
+"""
+
+import copy
+import functools
+import json
+import threading
+
+from .constants import JSONRPCMethods
+from .exceptions import StaleSnapshotError, TransportError
+
+
+class Snapshot:
+    """ Provides a consistent view of the blockchain at a specific height.
+
+    Snapshots provide the same JSON-RPC methods as the ``Client`` class. Each call is sent to a
+    node whose height is the height of the snapshot: the call is sent in a batch request together
+    with two ``getblockcount`` calls (sent before and after it) so that the node's height can be
+    verified without additional round trips. Other nodes are tried if the node's height differs
+    from the snapshot height (or if the node cannot be reached) and a ``StaleSnapshotError`` is
+    raised if no node is at this height. The last ``TransportError`` is raised if no node can be
+    reached at all.
+    Results are cached for the lifetime of the snapshot so repeated reads do not trigger any call.
+
+    Snapshots are usually obtained using the ``Client.at_height`` method:
+
+    .. code-block:: python
+
+        >>> with client.at_height(nodes=[other_client]) as snapshot:
+        ...     account = snapshot.get_account_state('AJBENSwajTzQtwyJFkiJSv7MAaaMc7DsRz')
+        ...     result = snapshot.invoke_function(script_hash, 'balanceOf', [address_hash])
+
+    """
+
+    # The results of contract invocations are already cached by the snapshot.
+    invocation_cache = None
+
+    def __init__(self, client, height=None, nodes=None):
+        self.client = client
+        self.nodes = [client, ] + list(nodes or [])
+        self.height = client.get_block_count() - 1 if height is None else height
+        self._cache = {}
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __getattr__(self, attr):
+        # The JSON-RPC methods of the client are bound to the snapshot so that they rely on the
+        # snapshot's _call method. Other attributes (eg. caches) are those of the client.
+        if attr.startswith('__') or 'client' not in self.__dict__:
+            raise AttributeError(attr)
+        method = getattr(type(self.client), attr, None)
+        if not callable(method):
+            return getattr(self.client, attr)
+        return functools.partial(method, self)
+
+    def close(self):
+        """ Clears the results cached by the snapshot. """
+        with self._lock:
+            self._cache.clear()
+
+    def _call(
+            self, method, params=None, request_id=None, timeout=None, deadline=None,
+            postprocess=None, executor=None, priority=None):
+        """ Calls a node at the height of the snapshot or returns the cached result. """
+        if method == JSONRPCMethods.SEND_RAW_TRANSACTION.value:
+            raise ValueError('Snapshots can only be used to perform read-only calls')
+        params = params or []
+        key = (method, json.dumps(params, sort_keys=True))
+        with self._lock:
+            if key in self._cache:
+                return self._get_result(self._cache[key], postprocess)
+
+        # Response bodies are deserialized by the executor (if any) but the results are cached and
+        # post-processed by the snapshot.
+        kwargs = {'executor': executor} if executor is not None else {}
+        if priority is not None:
+            kwargs['priority'] = priority
+        count_method = JSONRPCMethods.GET_BLOCK_COUNT.value
+        nodes, errors = list(self.nodes), []
+        for node in nodes:
+            try:
+                block_count_before, result, block_count_after = node._batch_call(
+                    [(count_method, []), (method, params), (count_method, [])],
+                    timeout=timeout, deadline=deadline, **kwargs)
+            except TransportError as e:
+                errors.append(e)
+                continue
+            if block_count_before - 1 == block_count_after - 1 == self.height:
+                break
+        else:
+            if len(errors) == len(nodes):
+                raise errors[-1]
+            raise StaleSnapshotError(
+                'No node is at the height of the snapshot ({})'.format(self.height),
+                height=self.height)
+
+        with self._lock:
+            self._cache[key] = result
+            # Tries the node that was at the height of the snapshot first for subsequent calls.
+            if node is not self.nodes[0]:
+                self.nodes.remove(node)
+                self.nodes.insert(0, node)
+        return self._get_result(result, postprocess)
+
+    def _get_result(self, result, postprocess):
+        """ Returns a copy of a cached result, post-processed if applicable. """
+        result = copy.deepcopy(result)
+        return postprocess(result) if postprocess is not None else result
@@ -0,0 +1,147 @@
+"""
+    NEO JSON-RPC system fees index
+    ==============================
+
+    This module defines the ``SysFeeIndex`` class, which maintains a local, memory-mapped index of
+    the cumulative system fees of the blocks of the chain. Once the index is filled, the system fee
+    of any block and the sum of the system fees of any range of blocks are obtained in constant
+    time without calling the JSON-RPC endpoint.
+
+"""
+
+import mmap
+import os
+import struct
+import threading
+from decimal import Decimal
+
+from .limits import PRIORITY_LOW
+from .utils import map_concurrently
+
+
+class SysFeeIndex:
+    """ Memory-mapped prefix sums of the system fees of the blocks.
+
+    The index is stored in a file of little-endian signed 64-bit integers (so that index files can
+    be shared between platforms): the first integer is the number of
+    indexed blocks (n) and it is followed by n + 1 prefix sums, the i-th prefix sum being the sum of
+    the system fees of the blocks whose indexes are lower than i (expressed in fixed8 units). The
+    index is filled from the genesis block using ``update``, which can be called again later in
+    order to index new blocks. For example:
+
+    .. code-block:: python
+
+        >>> index = SysFeeIndex('sysfees.idx')
+        >>> index.update(client, concurrency=16)
+        >>> index.get_range_fee(1000000, 1100000)
+        Decimal('1520')
+
+    NEO nodes return cumulative system fees (ie. the sum of the system fees of all the blocks up to
+    the considered block) through ``getblocksysfee``. If the node returns the system fee of each
+    block instead, ``cumulative`` must be set to False.
+
+    """
+
+    INITIAL_CAPACITY = 1024
+    VALUE = struct.Struct('<q')
+
+    def __init__(self, path, cumulative=True):
+        self.path = path
+        self.cumulative = cumulative
+        self._lock = threading.Lock()
+        self._file = open(path, 'r+b' if os.path.exists(path) else 'w+b')
+        self._map(max(self._get_file_slots(), self.INITIAL_CAPACITY))
+
+    def __len__(self):
+        return self._get(0)
+
+    def close(self):
+        """ Flushes the index to disk and releases the associated resources. """
+        with self._lock:
+            self._mmap.flush()
+            self._mmap.close()
+            self._file.close()
+
+    def update(self, client, stop=None, concurrency=8, **kwargs):
+        """ Indexes the blocks that are not indexed yet and returns the number of new blocks.
+
+        :param client: client used to fetch the system fees
+        :param stop:
+            index following the index of the last block to index (defaults to the number of blocks
+            in the chain)
+        :param concurrency: maximum number of system fees being fetched at the same time
+        :type client: neojsonrpc.Client
+        :type stop: int
+        :type concurrency: int
+        :return: number of blocks that were indexed
+        :rtype: int
+
+        """
+        kwargs.setdefault('priority', PRIORITY_LOW)
+        stop = client.get_block_count(**kwargs) if stop is None else stop
+        start = len(self)
+        fees = map_concurrently(
+            lambda index: client.get_block_sys_fee(index, **kwargs), range(start, stop),
+            concurrency)
+        for index, fee in enumerate(fees, start):
+            self._append(index, int(Decimal(fee) * 100000000))
+        with self._lock:
+            self._mmap.flush()
+        return max(0, stop - start)
+
+    def get_fee(self, index):
+        """ Returns the system fee of a block.
+
+        :param index: block index
+        :type index: int
+        :return: system fee of the block, expressed in NeoGas units
+        :rtype: decimal.Decimal
+
+        """
+        return self.get_range_fee(index, index + 1)
+
+    def get_range_fee(self, start, stop):
+        """ Returns the sum of the system fees of the blocks in the [start, stop) range.
+
+        :param start: index of the first block
+        :param stop: index following the index of the last block
+        :type start: int
+        :type stop: int
+        :return: sum of the system fees of the blocks, expressed in NeoGas units
+        :rtype: decimal.Decimal
+
+        """
+        with self._lock:
+            if not 0 <= start <= stop <= self._get(0):
+                raise IndexError('Blocks {}-{} are not indexed'.format(start, stop))
+            amount = self._get(stop + 1) - self._get(start + 1)
+        return Decimal(amount) / 100000000
+
+    def _append(self, index, fee):
+        """ Appends the (fixed8) system fee of the block following the last indexed block. """
+        with self._lock:
+            slots = len(self._mmap) // self.VALUE.size
+            if index + 3 > slots:
+                self._resize(slots * 2)
+            previous_sum = self._get(index + 1)
+            self._set(index + 2, fee if self.cumulative else previous_sum + fee)
+            self._set(0, index + 1)
+
+    def _get(self, slot):
+        return self.VALUE.unpack_from(self._mmap, slot * self.VALUE.size)[0]
+
+    def _set(self, slot, value):
+        self.VALUE.pack_into(self._mmap, slot * self.VALUE.size, value)
+
+    def _get_file_slots(self):
+        self._file.seek(0, os.SEEK_END)
+        return self._file.tell() // self.VALUE.size
+
+    def _map(self, slots):
+        if self._get_file_slots() < slots:
+            self._file.truncate(slots * self.VALUE.size)
+        self._mmap = mmap.mmap(self._file.fileno(), slots * self.VALUE.size)
+
+    def _resize(self, slots):
+        self._mmap.close()
+        self._map(slots)
@@ -0,0 +1,814 @@
+"""
+    NEO JSON-RPC testing utilities
+    ==============================
+
+    This module defines a simulator of NEO nodes that can be used to test (and load-test) programs
+    relying on the NEO JSON-RPC client without any network access. The ``SyntheticChain`` class
+    deterministically generates a synthetic chain (blocks, transactions, unspent outputs, accounts,
+    contracts, storage and invocation results) from a seed, and the ``SimulatorServer`` class
+    serves this chain through a local JSON-RPC HTTP endpoint implementing all the methods of
+    ``JSONRPCMethods`` as well as batch requests.
+
+    The content of the chain is never stored: each block, transaction or account is generated on
+    demand from the seed, so that chains of millions of blocks can be served using a constant
+    amount of memory. Block hashes and transaction IDs embed the block index (and the position of
+    transactions in their block) so that any object can be generated from its hash alone.
+
+"""
+
+import binascii
+import gzip
+import hashlib
+import json
+import math
+import random
+import socketserver
+import threading
+import time
+from decimal import Decimal
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+from .broadcast import get_transaction_hash
+from .constants import JSONRPCMethods
+from .utils import LRUCache
+from .validation import (address_to_script_hash, is_valid_address, script_hash_to_address,
+                         validate_address)
+
+
+NEO_ASSET_ID = '0xc56f33fc6ecfcd0c225c4ab356fee59390af8560be0e930faebe74a6daff7c9b'
+GAS_ASSET_ID = '0x602c79718b16e442de58778e148d0b1084e3b2dffd5de6b7b16cee7969282de7'
+
+GENESIS_TIME = 1468595301
+BLOCK_TIME = 15
+
+# System fees are distributed over a binary tree covering 2 ** SYS_FEE_TREE_DEPTH blocks, with an
+# average of SYS_FEE_PER_BLOCK GAS per block.
+SYS_FEE_TREE_DEPTH = 32
+SYS_FEE_PER_BLOCK = 0.4
+
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+PARSE_ERROR = -32700
+UNKNOWN_ITEM = -100
+
+TRANSACTION_TYPES = {
+    0x00: 'MinerTransaction', 0x01: 'IssueTransaction', 0x02: 'ClaimTransaction',
+    0x20: 'EnrollmentTransaction', 0x40: 'RegisterTransaction', 0x80: 'ContractTransaction',
+    0x90: 'StateTransaction', 0xd0: 'PublishTransaction', 0xd1: 'InvocationTransaction',
+}
+
+
+class SyntheticChain:
+    """ Deterministic synthetic NEO chain generated from a seed.
+
+    Two chains created with the same arguments always contain the same blocks. Each block contains
+    a ``MinerTransaction`` followed by 1 to ``max_transactions`` contract or invocation
+    transactions, whose inputs spend outputs of the transactions of previous blocks and whose
+    outputs are sent to a pool of ``accounts`` addresses. Invocation transactions call the
+    ``transfer`` function of one of the ``contracts`` NEP-5 tokens of the chain and have
+    application logs containing the corresponding ``transfer`` notifications.
+
+    If ``block_interval`` is set, a new block is added to the chain every ``block_interval``
+    seconds (starting from ``block_count`` blocks). Outputs are never considered spent by
+    ``gettxout``.
+
+    Transactions sent using ``sendrawtransaction`` are kept in a mempool of at most
+    ``max_mempool`` transactions (transactions are rejected once it is full) and are included at the
+    end of the next block added to the chain. Only their type, version and size are reflected in
+    their verbose representation.
+
+    Non-verbose blocks and transactions generated by the chain are hexadecimal encodings of their
+    JSON representation rather than NEO wire format payloads: they can be decoded using
+    ``json.loads(binascii.unhexlify(data))``.
+
+    """
+
+    def __init__(
+            self, seed=0, block_count=1000000, block_interval=None, max_transactions=8,
+            accounts=1000, contracts=10, max_mempool=50000):
+        self.seed = seed
+        self.initial_block_count = block_count
+        self.block_interval = block_interval
+        self.max_transactions = max_transactions
+        self.accounts = accounts
+        self.contracts = [
+            '0x' + self._hash('contract', i)[:40] for i in range(contracts)]
+        self.max_mempool = max_mempool
+        self.mempool = []
+        self._accounts = {}
+        self._sys_fee_splits = {}
+        self._block_sys_fees = LRUCache(4096)
+        self._started_at = time.monotonic()
+        self._lock = threading.RLock()
+
+        # Transactions sent to the chain are associated with their serialized representation while
+        # they are in the mempool and with their block index and position once they are included
+        # in a block.
+        self._mempool_txs = {}
+        self._mempool_block_index = None
+        self._block_txs = {}
+        self._included_txs = {}
+        self._methods = {
+            JSONRPCMethods.GET_ACCOUNT_STATE.value: self.get_account_state,
+            JSONRPCMethods.GET_APPLICATION_LOG.value: self.get_application_log,
+            JSONRPCMethods.GET_ASSET_STATE.value: self.get_asset_state,
+            JSONRPCMethods.GET_BEST_BLOCK_HASH.value: self.get_best_block_hash,
+            JSONRPCMethods.GET_BLOCK.value: self.get_block,
+            JSONRPCMethods.GET_BLOCK_COUNT.value: self.get_block_count,
+            JSONRPCMethods.GET_BLOCK_HASH.value: self.get_block_hash,
+            JSONRPCMethods.GET_BLOCK_SYS_FEE.value: self.get_block_sys_fee,
+            JSONRPCMethods.GET_CONNECTION_COUNT.value: self.get_connection_count,
+            JSONRPCMethods.GET_CONTRACT_STATE.value: self.get_contract_state,
+            JSONRPCMethods.GET_RAW_MEM_POOL.value: self.get_raw_mem_pool,
+            JSONRPCMethods.GET_RAW_TRANSACTION.value: self.get_raw_transaction,
+            JSONRPCMethods.GET_STORAGE.value: self.get_storage,
+            JSONRPCMethods.GET_TX_OUT.value: self.get_tx_out,
+            JSONRPCMethods.GET_PEERS.value: self.get_peers,
+            JSONRPCMethods.GET_VERSION.value: self.get_version,
+            JSONRPCMethods.INVOKE.value: self.invoke,
+            JSONRPCMethods.INVOKE_FUNCTION.value: self.invoke_function,
+            JSONRPCMethods.INVOKE_SCRIPT.value: self.invoke_script,
+            JSONRPCMethods.SEND_RAW_TRANSACTION.value: self.send_raw_transaction,
+            JSONRPCMethods.VALIDATE_ADDRESS.value: self.validate_address,
+        }
+
+    def call(self, method, params):
+        """ Performs a JSON-RPC call and returns its result, raises ``SimulatorError`` on error. """
+        if method not in self._methods:
+            raise SimulatorError(METHOD_NOT_FOUND, 'Method not found')
+        try:
+            return self._methods[method](*params)
+        except (IndexError, KeyError, TypeError, ValueError):
+            raise SimulatorError(INVALID_PARAMS, 'Invalid params')
+
+    ####################
+    # JSON-RPC METHODS #
+    ####################
+
+    def get_account_state(self, address):
+        if not is_valid_address(address):
+            raise SimulatorError(
+                -2146233033, 'One of the identified items was in an invalid format.')
+        rng = self._random('account', address)
+        return {
+            'version': 0,
+            'script_hash': address_to_script_hash(address),
+            'frozen': False,
+            'votes': [],
+            'balances': [
+                {'asset': NEO_ASSET_ID, 'value': str(rng.randint(0, 1000))},
+                {'asset': GAS_ASSET_ID, 'value': _format_fixed8(rng.randint(0, 10 ** 11))},
+            ],
+        }
+
+    def get_application_log(self, tx_hash):
+        if _normalize_hash(tx_hash) in self._included_txs:
+            return {'txid': _normalize_hash(tx_hash), 'executions': []}
+        block_index, position = self._parse_tx_hash(tx_hash)
+        tx = self._get_transaction(block_index, position)
+        if tx['type'] != 'InvocationTransaction':
+            raise SimulatorError(UNKNOWN_ITEM, 'Unknown transaction')
+        rng = self._random('transfer', block_index, position)
+        contract = rng.choice(self.contracts)
+        sender, recipient = (self._get_account(rng.randrange(self.accounts)) for _ in range(2))
+        amount = rng.randint(1, 10 ** 12)
+        return {
+            'txid': tx['txid'],
+            'executions': [{
+                'trigger': 'Application',
+                'contract': '0x' + self._hash('script', block_index, position)[:40],
+                'vmstate': 'HALT, BREAK',
+                'gas_consumed': tx['gas'],
+                'stack': [{'type': 'Integer', 'value': '1'}],
+                'notifications': [{
+                    'contract': contract,
+                    'state': {'type': 'Array', 'value': [
+                        {'type': 'ByteArray', 'value': _hexlify(b'transfer')},
+                        {'type': 'ByteArray', 'value': _reverse_hex(sender)},
+                        {'type': 'ByteArray', 'value': _reverse_hex(recipient)},
+                        {'type': 'ByteArray', 'value': _encode_integer(amount)},
+                    ]},
+                }],
+            }],
+        }
+
+    def get_asset_state(self, asset_id):
+        asset_id = _normalize_hash(asset_id)
+        if asset_id not in (NEO_ASSET_ID, GAS_ASSET_ID):
+            raise SimulatorError(UNKNOWN_ITEM, 'Unknown asset')
+        is_neo = asset_id == NEO_ASSET_ID
+        return {
+            'version': 0,
+            'id': asset_id,
+            'type': 'GoverningToken' if is_neo else 'UtilityToken',
+            'name': [{'lang': 'en', 'name': 'NEO' if is_neo else 'NeoGas'}],
+            'amount': '100000000',
+            'available': '100000000' if is_neo else '0',
+            'precision': 0 if is_neo else 8,
+            'owner': '00',
+            'admin': 'Abf2qMs1pzQb8kYk9RuxtUb9jtRKJVuBJt',
+            'issuer': 'Abf2qMs1pzQb8kYk9RuxtUb9jtRKJVuBJt',
+            'expiration': 4000000,
+            'frozen': False,
+        }
+
+    def get_best_block_hash(self):
+        return self._get_block_hash(self.get_block_count() - 1)
+
+    def get_block(self, block_hash, verbose=0):
+        index = block_hash if isinstance(block_hash, int) else self._parse_block_hash(block_hash)
+        block = self._get_block(index)
+        return block if verbose else _serialize(block)
+
+    def get_block_count(self):
+        if self.block_interval is None:
+            return self.initial_block_count
+        elapsed = time.monotonic() - self._started_at
+        block_count = self.initial_block_count + int(elapsed / self.block_interval)
+        if self.mempool:
+            with self._lock:
+                self._include_mempool(block_count)
+        return block_count
+
+    def get_block_hash(self, index):
+        self._check_block_index(index)
+        return self._get_block_hash(index)
+
+    def get_block_sys_fee(self, index):
+        # Like NEO nodes, the simulator returns the sum of the system fees of all the blocks up to
+        # the considered block.
+        self._check_block_index(index)
+        return str(self._get_sys_fee_sum(index + 1))
+
+    def get_connection_count(self):
+        return 10
+
+    def get_contract_state(self, script_hash):
+        script_hash = _normalize_hash(script_hash)
+        if script_hash not in self.contracts:
+            raise SimulatorError(UNKNOWN_ITEM, 'Unknown contract')
+        index = self.contracts.index(script_hash)
+        return {
+            'version': 0,
+            'hash': script_hash,
+            'script': self._hash('contract-script', index),
+            'parameters': ['String', 'Array'],
+            'returntype': 'ByteArray',
+            'name': 'Token {}'.format(index),
+            'code_version': '1.0',
+            'author': 'neojsonrpc',
+            'email': 'neojsonrpc@example.com',
+            'description': 'Synthetic NEP-5 token',
+            'properties': {'storage': True, 'dynamic_invoke': False},
+        }
+
+    def get_raw_mem_pool(self):
+        with self._lock:
+            self.get_block_count()
+            return list(self.mempool)
+
+    def get_raw_transaction(self, tx_hash, verbose=0):
+        included_tx = self._included_txs.get(_normalize_hash(tx_hash))
+        if included_tx is not None:
+            block_index, position, hextx = included_tx
+            if not verbose:
+                return hextx
+            tx = self._get_transactions(block_index)[position]
+        else:
+            block_index, position = self._parse_tx_hash(tx_hash)
+            tx = self._get_transaction(block_index, position)
+        if not verbose:
+            return _serialize(tx)
+        tx = dict(tx)
+        tx['blockhash'] = self._get_block_hash(block_index)
+        tx['confirmations'] = self.get_block_count() - block_index
+        tx['blocktime'] = GENESIS_TIME + block_index * BLOCK_TIME
+        return tx
+
+    def get_storage(self, script_hash, key):
+        script_hash = _normalize_hash(script_hash)
+        key = binascii.unhexlify(key)
+        if script_hash not in self.contracts or not (len(key) == 20 or key == b'totalSupply'):
+            return None
+        amount = self._random('storage', script_hash, _hexlify(key)).randint(1, 10 ** 16)
+        return _encode_integer(amount)
+
+    def get_tx_out(self, tx_hash, index):
+        block_index, position = self._parse_tx_hash(tx_hash)
+        vout = self._get_transaction(block_index, position)['vout']
+        return vout[index] if 0 <= index < len(vout) else None
+
+    def get_peers(self):
+        return {
+            'unconnected': [],
+            'bad': [],
+            'connected': [
+                {'address': '127.0.0.{}'.format(i), 'port': 10333} for i in range(1, 11)],
+        }
+
+    def get_version(self):
+        return {
+            'port': 10333,
+            'nonce': self._random('nonce').getrandbits(32),
+            'useragent': '/neojsonrpc-simulator/',
+        }
+
+    def invoke(self, script_hash, params):
+        # Contracts invoked through their main entry point usually take the operation as their
+        # first parameter.
+        operation = params[0]['value'] if params and params[0]['type'] == 'String' else None
+        return self._invoke(script_hash, operation, params[1:])
+
+    def invoke_function(self, script_hash, operation, params=None):
+        return self._invoke(script_hash, operation, params or [])
+
+    def invoke_script(self, script):
+        binascii.unhexlify(script)
+        return self._get_invocation_result(script, [
+            {'type': 'ByteArray', 'value': self._hash('invocation', script)[:16]}])
+
+    def send_raw_transaction(self, hextx):
+        try:
+            tx_hash = get_transaction_hash(hextx)
+        except (binascii.Error, TypeError, ValueError):
+            return False
+        with self._lock:
+            block_count = self.get_block_count()
+            if len(self.mempool) >= self.max_mempool or tx_hash in self._mempool_txs \
+                    or tx_hash in self._included_txs:
+                return False
+            if not self.mempool:
+                self._mempool_block_index = block_count
+            self.mempool.append(tx_hash)
+            self._mempool_txs[tx_hash] = hextx.lower()
+        return True
+
+    def validate_address(self, address):
+        return validate_address(address)
+
+    ##################################
+    # PRIVATE METHODS AND PROPERTIES #
+    ##################################
+
+    def _get_block(self, index):
+        """ Returns the verbose representation of a block. """
+        self._check_block_index(index)
+        rng = self._random('block', index)
+        txs = self._get_transactions(index)
+        block_count = self.get_block_count()
+        block = {
+            'hash': self._get_block_hash(index),
+            'size': 686 + sum(tx['size'] for tx in txs),
+            'version': 0,
+            'merkleroot': '0x' + self._hash('merkleroot', index),
+            'time': GENESIS_TIME + index * BLOCK_TIME,
+            'index': index,
+            'nonce': '{:016x}'.format(rng.getrandbits(64)),
+            'nextconsensus': 'APyEx5f4Zm4oCHwFWiSTaph1fPBxZacYVR',
+            'script': {
+                'invocation': self._hash('invocation', index),
+                'verification': self._hash('verification', index),
+            },
+            'tx': txs,
+            'confirmations': block_count - index,
+        }
+        if index > 0:
+            block['previousblockhash'] = self._get_block_hash(index - 1)
+        if index + 1 < block_count:
+            block['nextblockhash'] = self._get_block_hash(index + 1)
+        return block
+
+    def _get_block_hash(self, index):
+        # Block hashes embed the block index so that blocks can be generated from their hashes.
+        return '0x{:08x}{}'.format(index, self._hash('block', index)[8:])
+
+    def _get_transactions(self, block_index):
+        """ Returns the verbose representations of the transactions of a block. """
+        txs = [
+            self._get_transaction(block_index, position)
+            for position in range(self._get_transaction_count(block_index))]
+        return txs + [
+            _get_sent_transaction(tx_hash, hextx)
+            for tx_hash, hextx in self._block_txs.get(block_index, [])]
+
+    def _include_mempool(self, block_count):
+        """ Includes the transactions of the mempool in the first block added since they were sent.
+
+        This method must be called with the lock held.
+
+        """
+        block_index = self._mempool_block_index
+        if not self.mempool or block_count <= block_index:
+            return
+        block_txs = self._block_txs.setdefault(block_index, [])
+        position = self._get_transaction_count(block_index)
+        for tx_hash in self.mempool:
+            hextx = self._mempool_txs.pop(tx_hash)
+            self._included_txs[tx_hash] = (block_index, position + len(block_txs), hextx)
+            block_txs.append((tx_hash, hextx))
+        del self.mempool[:]
+
+    def _get_transaction_count(self, block_index):
+        return 1 + self._random('tx-count', block_index).randint(1, max(1, self.max_transactions))
+
+    def _get_transaction(self, block_index, position):
+        """ Returns the verbose representation of a transaction. """
+        if not 0 <= position < self._get_transaction_count(block_index):
+            raise SimulatorError(UNKNOWN_ITEM, 'Unknown transaction')
+        rng = self._random('tx', block_index, position)
+        tx = {
+            'txid': self._get_tx_hash(block_index, position),
+            'size': rng.randint(100, 500),
+            'type': self._get_transaction_type(block_index, position),
+            'version': 0,
+            'attributes': [],
+            'vin': [],
+            'vout': [],
+            'sys_fee': '0',
+            'net_fee': '0',
+            'scripts': [],
+        }
+        if tx['type'] == 'MinerTransaction':
+            tx['nonce'] = rng.getrandbits(32)
+            return tx
+
+        # Inputs spend outputs of transactions included in previous blocks (except in the genesis
+        # block, whose transactions issue the assets).
+        if block_index > 0:
+            for _ in range(rng.randint(1, 2)):
+                previous_index = rng.randrange(block_index)
+                previous_count = self._get_transaction_count(previous_index)
+                if previous_count < 2:
+                    continue
+                previous_position = rng.randrange(1, previous_count)
+                previous_type = self._get_transaction_type(previous_index, previous_position)
+                tx['vin'].append({
+                    'txid': self._get_tx_hash(previous_index, previous_position),
+                    'vout': rng.randrange(_get_output_count(previous_type)),
+                })
+        for n in range(_get_output_count(tx['type'])):
+            asset = rng.choice((NEO_ASSET_ID, GAS_ASSET_ID))
+            value = rng.randint(1, 1000) if asset == NEO_ASSET_ID else rng.randint(1, 10 ** 10)
+            tx['vout'].append({
+                'n': n,
+                'asset': asset,
+                'value': str(value) if asset == NEO_ASSET_ID else _format_fixed8(value),
+                'address': self._get_account(rng.randrange(self.accounts)),
+            })
+
+        if tx['type'] == 'InvocationTransaction':
+            tx['version'] = 1
+            tx['script'] = self._hash('script', block_index, position)
+            tx['gas'] = '0'
+            # The system fee of a block is paid by its last transaction.
+            if position == self._get_transaction_count(block_index) - 1:
+                tx['sys_fee'] = str(self._get_block_sys_fee(block_index))
+        return tx
+
+    def _get_block_sys_fee(self, block_index):
+        fee = self._block_sys_fees.get(block_index)
+        if fee is None:
+            fee = self._compute_block_sys_fee(block_index)
+            self._block_sys_fees.set(block_index, fee)
+        return fee
+
+    def _compute_block_sys_fee(self, block_index):
+        start, size = 0, 2 ** SYS_FEE_TREE_DEPTH
+        total = int(SYS_FEE_PER_BLOCK * size)
+        while total and size > 1:
+            size //= 2
+            left = self._split_sys_fee(start, size, total)
+            if block_index < start + size:
+                total = left
+            else:
+                start, total = start + size, total - left
+        return total
+
+    def _get_sys_fee_sum(self, stop):
+        """ Returns the sum of the system fees of the blocks whose indexes are lower than ``stop``.
+
+        The total amount of system fees of the tree is split between the two halves of each node
+        of a binary tree, so that the sum of any prefix of blocks is obtained by descending the tree
+        (ie. in constant time and memory) rather than by summing the fees of the previous blocks.
+
+        """
+        start, size = 0, 2 ** SYS_FEE_TREE_DEPTH
+        total = int(SYS_FEE_PER_BLOCK * size)
+        result = 0
+        while total and stop > start:
+            if stop >= start + size:
+                return result + total
+            size //= 2
+            left = self._split_sys_fee(start, size, total)
+            if stop <= start + size:
+                total = left
+            else:
+                result += left
+                start, total = start + size, total - left
+        return result
+
+    def _split_sys_fee(self, start, size, total):
+        """ Returns the part of the system fees of a node of the tree owned by its left child. """
+        # The splits of the upper nodes of the tree, which are shared by most blocks, are cached
+        # (there are at most 2 ** (SYS_FEE_TREE_DEPTH - 20) such nodes).
+        cacheable = size >= 2 ** 20
+        if cacheable and (start, size) in self._sys_fee_splits:
+            return self._sys_fee_splits[start, size]
+        left = self._compute_sys_fee_split(start, size, total)
+        if cacheable:
+            self._sys_fee_splits[start, size] = left
+        return left
+
+    def _compute_sys_fee_split(self, start, size, total):
+        value = int(self._hash('sys-fee', start, size), 16)
+        if total <= 128:
+            # Each fee unit is assigned to the left or to the right child using one bit of the hash.
+            return bin(value & ((1 << total) - 1)).count('1')
+        # The binomial distribution of large totals is approximated by a normal distribution.
+        u1 = ((value >> 128) + 1) / 2 ** 128
+        u2 = (value & (2 ** 128 - 1)) / 2 ** 128
+        z = math.sqrt(-2 * math.log(u1)) * math.cos(2 * math.pi * u2)
+        return min(total, max(0, int(round(total / 2 + z * math.sqrt(total) / 2))))
+
+    def _get_transaction_type(self, block_index, position):
+        if position == 0:
+            return 'MinerTransaction'
+        rng = self._random('tx-type', block_index, position)
+        if rng.random() < 0.4:
+            return 'InvocationTransaction'
+        # The last transaction of a block carries its system fees, if any.
+        if position == self._get_transaction_count(block_index) - 1 \
+                and self._get_block_sys_fee(block_index):
+            return 'InvocationTransaction'
+        return 'ContractTransaction'
+
+    def _get_tx_hash(self, block_index, position):
+        # Transaction IDs embed the index of their block and their position in this block so that
+        # transactions can be generated from their IDs.
+        return '0x{:08x}{:04x}{}'.format(
+            block_index, position, self._hash('tx', block_index, position)[12:])
+
+    def _get_account(self, index):
+        if index not in self._accounts:
+            self._accounts[index] = script_hash_to_address(self._hash('account', index)[:40])
+        return self._accounts[index]
+
+    def _invoke(self, script_hash, operation, params):
+        """ Returns the result of the invocation of a function of a contract. """
+        script_hash = _normalize_hash(script_hash)
+        key = json.dumps([script_hash, operation, params], sort_keys=True)
+        if script_hash not in self.contracts:
+            return self._get_invocation_result(key, [], state='FAULT, BREAK')
+        index = self.contracts.index(script_hash)
+        if operation == 'name':
+            stack = [{'type': 'ByteArray', 'value': _hexlify('Token {}'.format(index).encode())}]
+        elif operation == 'symbol':
+            stack = [{'type': 'ByteArray', 'value': _hexlify('TK{}'.format(index).encode())}]
+        elif operation == 'decimals':
+            stack = [{'type': 'Integer', 'value': '8'}]
+        else:
+            # The results of other functions (eg. balanceOf) depend on the height of the chain.
+            rng = self._random('invoke', key, self.get_block_count())
+            stack = [{'type': 'ByteArray', 'value': _encode_integer(rng.randint(0, 10 ** 16))}]
+        return self._get_invocation_result(key, stack)
+
+    def _get_invocation_result(self, key, stack, state='HALT, BREAK'):
+        return {
+            'script': self._hash('invocation-script', key),
+            'state': state,
+            'gas_consumed': _format_fixed8(self._random('gas', key).randint(10 ** 6, 10 ** 9)),
+            'stack': stack,
+        }
+
+    def _check_block_index(self, index):
+        if not isinstance(index, int) or not 0 <= index < self.get_block_count():
+            raise SimulatorError(UNKNOWN_ITEM, 'Unknown block')
+
+    def _parse_block_hash(self, block_hash):
+        block_hash = _normalize_hash(block_hash)
+        index = int(block_hash[2:10], 16)
+        self._check_block_index(index)
+        if block_hash != self._get_block_hash(index):
+            raise SimulatorError(UNKNOWN_ITEM, 'Unknown block')
+        return index
+
+    def _parse_tx_hash(self, tx_hash):
+        tx_hash = _normalize_hash(tx_hash)
+        block_index, position = int(tx_hash[2:10], 16), int(tx_hash[10:14], 16)
+        if not 0 <= block_index < self.get_block_count() \
+                or tx_hash != self._get_tx_hash(block_index, position):
+            raise SimulatorError(UNKNOWN_ITEM, 'Unknown transaction')
+        return block_index, position
+
+    def _hash(self, *parts):
+        """ Returns a hexadecimal SHA256 hash derived from the seed and the considered parts. """
+        data = ':'.join(str(part) for part in (self.seed, ) + parts).encode('utf-8')
+        return hashlib.sha256(data).hexdigest()
+
+    def _random(self, *parts):
+        """ Returns a random generator derived from the seed and the considered parts. """
+        return random.Random(self._hash(*parts))
+
+
+class SimulatorError(Exception):
+    """ Raised by the simulator in order to return a JSON-RPC error. """
+
+    def __init__(self, code, message):
+        super(SimulatorError, self).__init__(message)
+        self.code = code
+        self.message = message
+
+
+class SimulatorServer:
+    """ Local JSON-RPC HTTP server serving a synthetic chain.
+
+    The server listens on ``host`` and ``port`` (a free port is used if ``port`` is 0) and handles
+    requests in separate threads. Each request is delayed by ``latency`` seconds (or by a random
+    duration in the ``(min, max)`` range if ``latency`` is a tuple) and fails with a 503 response
+    with a probability of ``error_rate``. For example:
+
+    .. code-block:: python
+
+        >>> with SimulatorServer(SyntheticChain(seed=42), latency=(0.001, 0.01)) as server:
+        ...     client = server.client()
+        ...     blocks = list(client.get_blocks(0, 10000, concurrency=32))
+
+    """
+
+    def __init__(self, chain=None, host='127.0.0.1', port=0, latency=0, error_rate=0, seed=0):
+        self.chain = chain or SyntheticChain(seed=seed)
+        self.latency = latency
+        self.error_rate = error_rate
+        self.host = host
+        self.port = port
+        self._random = random.Random(seed)
+        self._random_lock = threading.Lock()
+        self._server = None
+        self._thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
+
+    @property
+    def url(self):
+        """ Returns the URL of the JSON-RPC endpoint. """
+        return 'http://{}:{}'.format(self.host, self.port)
+
+    def client(self, **kwargs):
+        """ Returns a ``Client`` instance configured to use the simulator. """
+        from .client import Client
+        return Client(host=self.host, port=self.port, **kwargs)
+
+    def start(self):
+        """ Starts serving the synthetic chain in a background thread. """
+        self._server = _ThreadingHTTPServer((self.host, self.port), _SimulatorRequestHandler)
+        self._server.simulator = self
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """ Stops the server. """
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._thread.join()
+            self._server = self._thread = None
+
+    def handle(self, payload):
+        """ Returns the response data associated with a (batch) request payload. """
+        if isinstance(payload, list):
+            if not payload:
+                return _get_error_data(None, INVALID_REQUEST, 'Invalid Request')
+            return [self._handle_call(call) for call in payload]
+        return self._handle_call(payload)
+
+    def _handle_call(self, call):
+        if not isinstance(call, dict) or not isinstance(call.get('method'), str):
+            return _get_error_data(None, INVALID_REQUEST, 'Invalid Request')
+        params = call.get('params', [])
+        try:
+            if not isinstance(params, list):
+                raise SimulatorError(INVALID_PARAMS, 'Invalid params')
+            result = self.chain.call(call['method'], params)
+        except SimulatorError as e:
+            return _get_error_data(call.get('id'), e.code, e.message)
+        return {'jsonrpc': '2.0', 'id': call.get('id'), 'result': result}
+
+    def _get_delay(self):
+        with self._random_lock:
+            if isinstance(self.latency, (tuple, list)):
+                delay = self._random.uniform(*self.latency)
+            else:
+                delay = self.latency
+            fails = self._random.random() < self.error_rate
+        return delay, fails
+
+
+class _ThreadingHTTPServer(socketserver.ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+class _SimulatorRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # Headers and bodies are written separately so Nagle's algorithm would delay the responses.
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        simulator = self.server.simulator
+        body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+
+        delay, fails = simulator._get_delay()
+        if delay:
+            time.sleep(delay)
+        if fails:
+            return self._send_response(503, b'')
+
+        try:
+            if self.headers.get('Content-Encoding') == 'gzip':
+                body = gzip.decompress(body)
+            payload = json.loads(body.decode('utf-8'))
+        except (OSError, ValueError):
+            response_data = _get_error_data(None, PARSE_ERROR, 'Parse error')
+        else:
+            response_data = simulator.handle(payload)
+        self._send_response(200, json.dumps(response_data).encode('utf-8'))
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_response(self, status, body):
+        gzipped = 'gzip' in self.headers.get('Accept-Encoding', '') and body
+        body = gzip.compress(body) if gzipped else body
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        if gzipped:
+            self.send_header('Content-Encoding', 'gzip')
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def _get_error_data(request_id, code, message):
+    return {'jsonrpc': '2.0', 'id': request_id, 'error': {'code': code, 'message': message}}
+
+
+def _get_output_count(tx_type):
+    return 2 if tx_type == 'ContractTransaction' else 1
+
+
+def _normalize_hash(value):
+    value = value.lower()
+    return value if value.startswith('0x') else '0x' + value
+
+
+def _get_sent_transaction(tx_hash, hextx):
+    """ Returns the verbose representation of a transaction sent using sendrawtransaction. """
+    data = binascii.unhexlify(hextx)
+    return {
+        'txid': tx_hash,
+        'size': len(data),
+        'type': TRANSACTION_TYPES[data[0]],
+        'version': data[1],
+        'attributes': [],
+        'vin': [],
+        'vout': [],
+        'sys_fee': '0',
+        'net_fee': '0',
+        'scripts': [],
+    }
+
+
+def _hexlify(data):
+    return binascii.hexlify(data).decode('ascii')
+
+
+def _reverse_hex(address):
+    """ Returns the little-endian hexadecimal script hash of an address (as in notifications). """
+    return _hexlify(bytes.fromhex(address_to_script_hash(address)[2:])[::-1])
+
+
+def _encode_integer(value):
+    """ Encodes an integer as a little-endian hexadecimal string (as in NEO VM byte arrays). """
+    return _hexlify(value.to_bytes((value.bit_length() + 8) // 8, 'little', signed=True))
+
+
+def _format_fixed8(value):
+    """ Formats an amount expressed in fixed8 units as a decimal string. """
+    return '{:f}'.format((Decimal(value) / 100000000).normalize())
+
+
+def _serialize(value):
+    """ Returns a deterministic hexadecimal serialization of a verbose block or transaction.
+
+    The serialization is the hexadecimal encoding of the JSON representation of the considered
+    object, not the NEO wire format: it is only meant to be decoded by programs aware of the
+    simulator.
+
+    """
+    return _hexlify(json.dumps(value, sort_keys=True).encode('utf-8'))
@@ -0,0 +1,120 @@
+"""
+    NEO JSON-RPC client tracing
+    ===========================
+
+    This module defines the ``Span`` class, which describes a call made by the NEO JSON-RPC client
+    to a JSON-RPC endpoint, and a hook allowing to forward these spans to OpenTelemetry tracers.
+
+    Hooks are callables registered using ``Client.add_hook``: each hook is called with a ``Span``
+    instance once a call is completed (successfully or not). Spans are only created if at least one
+    hook is registered, so that tracing has no overhead otherwise.
+
+"""
+
+import time
+
+
+class Span:
+    """ Describes a call made to a JSON-RPC endpoint.
+
+    The ``phases`` dictionary associates the name of each phase of the call with its duration (in
+    seconds). These phases are:
+
+    * ``encode``: serialization (and compression if applicable) of the request body
+    * ``transport``: connection acquisition, network round trip and reading of the response body
+    * ``parse``: deserialization of the response body
+    * ``decode``: post-processing of the result (eg. decoding of invocation results)
+
+    If the transport provides it, the ``round_trip`` phase contains the part of the ``transport``
+    phase elapsed between the sending of the request and the reception of the response headers. If
+    the call fails, the phase that was in progress is closed when the span is finished.
+
+    """
+
+    PHASES = ('encode', 'transport', 'parse', 'decode', )
+
+    __slots__ = (
+        'method', 'request_id', 'url', 'start_time', 'end_time', 'phases', 'request_size',
+        'response_size', 'error', '_start', '_last_mark', )
+
+    def __init__(self, method, request_id, url):
+        self.method = method
+        self.request_id = request_id
+        self.url = url
+        self.start_time = time.time()
+        self.end_time = None
+        self.phases = {}
+        self.request_size = None
+        self.response_size = None
+        self.error = None
+        self._start = self._last_mark = time.perf_counter()
+
+    @property
+    def duration(self):
+        """ Returns the duration of the call in seconds. """
+        if self.end_time is not None:
+            return self.end_time - self.start_time
+        return time.perf_counter() - self._start
+
+    def mark(self, phase):
+        """ Records the duration of a phase that ends now. """
+        now = time.perf_counter()
+        self.phases[phase] = now - self._last_mark
+        self._last_mark = now
+
+    def finish(self, error=None):
+        """ Marks the span as finished, closing the phase in progress if the call failed. """
+        self.error = error
+        if error is not None:
+            phase = next((p for p in self.PHASES if p not in self.phases), None)
+            if phase is not None:
+                self.mark(phase)
+        self.end_time = self.start_time + (time.perf_counter() - self._start)
+
+    def as_dict(self):
+        """ Returns a dictionary representation of the span. """
+        return {
+            'method': self.method,
+            'request_id': self.request_id,
+            'url': self.url,
+            'start_time': self.start_time,
+            'end_time': self.end_time,
+            'phases': dict(self.phases),
+            'request_size': self.request_size,
+            'response_size': self.response_size,
+            'error': repr(self.error) if self.error is not None else None,
+        }
+
+
+class OpenTelemetryHook:
+    """ Hook creating an OpenTelemetry span for each call made by the client.
+
+    .. code-block:: python
+
+        >>> from opentelemetry import trace
+        >>> client.add_hook(OpenTelemetryHook(trace.get_tracer('neojsonrpc')))
+
+    """
+
+    def __init__(self, tracer):
+        self.tracer = tracer
+
+    def __call__(self, span):
+        attributes = {
+            'rpc.system': 'jsonrpc',
+            'rpc.method': span.method,
+            'rpc.jsonrpc.request_id': str(span.request_id),
+            'http.url': span.url,
+        }
+        if span.request_size is not None:
+            attributes['http.request_content_length'] = span.request_size
+        if span.response_size is not None:
+            attributes['http.response_content_length'] = span.response_size
+        for phase, duration in span.phases.items():
+            attributes['neojsonrpc.phase.{}'.format(phase)] = duration
+        if span.error is not None:
+            attributes['error.type'] = type(span.error).__name__
+
+        otel_span = self.tracer.start_span(
+            span.method, start_time=int(span.start_time * 1e9), attributes=attributes)
+        otel_span.end(end_time=int(span.end_time * 1e9))
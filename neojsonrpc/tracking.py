@@ -0,0 +1,177 @@
+"""
+    NEO JSON-RPC confirmation tracker
+    =================================
+
+    This module defines the ``ConfirmationTracker`` class, which allows to track the confirmation
+    of many transactions by scanning each new block once instead of polling each transaction.
+
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import Future
+
+from .exceptions import TransactionExpiredError
+
+
+logger = logging.getLogger(__name__)
+
+
+class ConfirmationTracker:
+    """ Tracks the confirmation of transactions by scanning new blocks.
+
+    Each call to ``poll`` fetches the blocks that were added to the chain since the previous call
+    and matches their transactions against the set of pending transactions. The number of calls
+    made to the JSON-RPC endpoint therefore depends on the rate at which blocks are produced and
+    not on the number of pending transactions. For example:
+
+    .. code-block:: python
+
+        >>> tracker = ConfirmationTracker(client, confirmations=2, expiry=100)
+        >>> future = tracker.track(tx_hash)
+        >>> tracker.run(interval=5)  # usually in a separate thread
+        >>> future.result()
+        977981
+
+    The future returned by ``track`` gets the index of the block including the transaction as its
+    result once the transaction reaches the configured number of confirmations (the block that
+    includes the transaction counts as its first confirmation). If a transaction is not included in
+    a block within ``expiry`` blocks after being tracked, its future gets a
+    ``TransactionExpiredError`` exception.
+
+    """
+
+    def __init__(self, client, confirmations=1, expiry=None, start_index=None, concurrency=4):
+        self.client = client
+        self.confirmations = confirmations
+        self.expiry = expiry
+        self.concurrency = concurrency
+        self.next_index = start_index
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+
+        # Pending transactions are associated with their future and with the index of the block
+        # at which their tracking started. Included transactions are associated with their future
+        # and with the index of the block that includes them.
+        self._pending = {}
+        self._included = {}
+
+    @property
+    def pending_count(self):
+        """ Returns the number of transactions that are not confirmed yet. """
+        with self._lock:
+            return len(self._pending) + len(self._included)
+
+    def track(self, tx_hash, callback=None):
+        """ Starts tracking the confirmation of a transaction and returns the associated future.
+
+        If the transaction is already being tracked, its existing future is returned (and the
+        callback, if any, is attached to it).
+
+        :param tx_hash: transaction hash
+        :param callback: callable called with the future once the transaction is confirmed
+        :type tx_hash: str
+        :type callback: callable
+        :return: future whose result is the index of the block including the transaction
+        :rtype: concurrent.futures.Future
+
+        """
+        tx_hash = _normalize_hash(tx_hash)
+        with self._lock:
+            entry = self._pending.get(tx_hash) or self._included.get(tx_hash)
+            if entry is not None:
+                future = entry[0]
+            else:
+                future = Future()
+                self._pending[tx_hash] = (future, self.next_index)
+        # Callbacks are attached outside of the lock because they are called immediately if the
+        # future is already resolved.
+        if callback is not None:
+            future.add_done_callback(callback)
+        return future
+
+    def poll(self, **kwargs):
+        """ Scans the blocks added since the previous call and returns the number of new blocks.
+
+        Keyword arguments (eg. ``deadline``) are passed to the underlying ``get_block`` calls.
+
+        """
+        block_count = self.client.get_block_count(**kwargs)
+        if self.next_index is None:
+            self.next_index = block_count - 1
+            with self._lock:
+                for tx_hash, (future, _) in self._pending.items():
+                    self._pending[tx_hash] = (future, self.next_index)
+        start_index = self.next_index
+
+        blocks = self.client.get_blocks(
+            start_index, block_count, concurrency=self.concurrency, **kwargs)
+        for block in blocks:
+            with self._lock:
+                for tx in block['tx']:
+                    entry = self._pending.pop(_normalize_hash(tx['txid']), None)
+                    if entry is not None:
+                        self._included[_normalize_hash(tx['txid'])] = (entry[0], block['index'])
+            self.next_index = block['index'] + 1
+
+        self._resolve(block_count - 1)
+        return self.next_index - start_index
+
+    def run(self, interval=5, max_backoff=60, **kwargs):
+        """ Polls the chain for new blocks every ``interval`` seconds until ``stop`` is called.
+
+        Errors raised while polling (eg. if the node cannot be reached) are logged and do not stop
+        the loop: the delay before the next poll is doubled after each consecutive error, up to
+        ``max_backoff`` seconds.
+
+        """
+        self._stop_event.clear()
+        delay = interval
+        while not self._stop_event.is_set():
+            start = time.monotonic()
+            try:
+                self.poll(**kwargs)
+            except Exception:
+                delay = min(max(delay, interval) * 2, max(max_backoff, interval))
+                logger.exception('Unable to poll new blocks, retrying in %s seconds', delay)
+            else:
+                delay = interval
+            self._stop_event.wait(max(0, delay - (time.monotonic() - start)))
+
+    def stop(self):
+        """ Stops the polling loop started by ``run``. """
+        self._stop_event.set()
+
+    def _resolve(self, tip_index):
+        """ Resolves the futures of the confirmed or expired transactions. """
+        confirmed, expired = [], []
+        with self._lock:
+            for tx_hash, (future, index) in list(self._included.items()):
+                if tip_index - index + 1 >= self.confirmations:
+                    confirmed.append((future, index))
+                    del self._included[tx_hash]
+            if self.expiry is not None:
+                for tx_hash, (future, index) in list(self._pending.items()):
+                    if tip_index - index >= self.expiry:
+                        expired.append((future, tx_hash))
+                        del self._pending[tx_hash]
+
+        # Futures are resolved outside of the lock because their callbacks may track other
+        # transactions. Futures cancelled by their callers are skipped.
+        for future, index in confirmed:
+            if future.set_running_or_notify_cancel():
+                future.set_result(index)
+        for future, tx_hash in expired:
+            if not future.set_running_or_notify_cancel():
+                continue
+            future.set_exception(TransactionExpiredError(
+                'Transaction {} was not included in a block within {} blocks'.format(
+                    tx_hash, self.expiry),
+                tx_hash=tx_hash))
+
+
+def _normalize_hash(tx_hash):
+    """ Returns the normalized representation (lowercase, 0x-prefixed) of a transaction hash. """
+    tx_hash = tx_hash.lower()
+    return tx_hash if tx_hash.startswith('0x') else '0x' + tx_hash
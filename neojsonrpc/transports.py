@@ -0,0 +1,397 @@
+"""
+    NEO JSON-RPC client transports
+    ==============================
+
+    This module defines the transports that can be used by the ``Client`` class in order to send
+    requests to JSON-RPC endpoints. The default transport relies on requests (HTTP/1.1) but an
+    HTTP/2 transport is also provided: it allows to multiplex many concurrent calls over a few
+    connections, which is especially relevant when interacting with nodes over TLS.
+
+    This module also provides a recording transport, which captures the responses returned by
+    JSON-RPC endpoints to a file, and a replay transport, which serves these responses back without
+    any network access. These transports allow to run tests and benchmarks offline and
+    deterministically.
+
+"""
+
+import collections
+import gzip
+import itertools
+import json
+import struct
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.exceptions import ConnectionError as RequestsConnectionError
+from requests.exceptions import ConnectTimeout, HTTPError, Timeout
+from urllib3.exceptions import HTTPError as URLLib3HTTPError
+from urllib3.exceptions import NewConnectionError, ReadTimeoutError
+
+from .exceptions import TransportError, TransportTimeoutError
+
+
+# Records files start with a magic string, which is followed by records. Each record is made of a
+# header (key length, content length, latency in seconds), the key and the response content.
+RECORDS_FILE_MAGIC = b'NEOJSONRPC-RECORDS-1\n'
+RECORD_HEADER = struct.Struct('<IId')
+
+
+class BaseTransport:
+    """ Base class for all the transports that can be used by the NEO JSON-RPC client.
+
+    Transports are responsible for sending request bodies to JSON-RPC endpoints and for returning
+    the corresponding response objects. These objects must provide ``status_code``, ``headers``
+    and ``content`` attributes as well as ``json()`` and ``close()`` methods. Transports must raise
+    ``TransportError`` exceptions (or ``TransportTimeoutError`` exceptions) if a request fails.
+    Transports must also transparently decode compressed response bodies.
+
+    """
+
+    def post(self, url, data, headers, timeout=None, deadline=None):
+        """ Sends a POST request to the considered URL and returns the response.
+
+        ``timeout`` applies to each network operation while ``deadline`` (a
+        :class:`Deadline <neojsonrpc.utils.Deadline>` instance), if set, bounds the total time
+        spent on the request, including retries.
+
+        """
+        raise NotImplementedError
+
+    def received_bytes(self, response):
+        """ Returns the number of bytes of the response body that were received over the wire.
+
+        This number can differ from the length of the response content if the response body was
+        compressed by the server. None is returned if this number cannot be determined.
+
+        """
+
+    def close(self):
+        """ Releases the connections held by the transport. """
+
+
+class HTTPTransport(BaseTransport):
+    """ HTTP/1.1 transport relying on a pool of connections managed by requests. """
+
+    def __init__(self, max_retries=None, pool_maxsize=10, backoff_factor=0.05):
+        self.max_retries = 3 if max_retries is None else max_retries
+        self.backoff_factor = backoff_factor
+        self.session = requests.Session()
+        # Connection errors are retried by the transport itself rather than by the adapter so that
+        # the deadline of a request (if any) can be checked between attempts. Only the errors
+        # raised while establishing connections are retried: a request whose body was sent may
+        # already have been processed by the node (eg. a transaction broadcast).
+        adapter = HTTPAdapter(max_retries=0, pool_maxsize=pool_maxsize)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def post(self, url, data, headers, timeout=None, deadline=None):
+        # It should be noted that the connection used to perform the request is discarded by the
+        # underlying connection pool if the request fails or times out, so that a stalled
+        # connection is never reused.
+        for attempt in itertools.count():
+            try:
+                response = self._post_once(url, data, headers, timeout, deadline)
+                response.raise_for_status()
+            except HTTPError:
+                raise TransportError(
+                    'Got unsuccessful response from server (status code: {})'.format(
+                        response.status_code),
+                    response=response)
+            except RequestsConnectionError as e:
+                if attempt < self.max_retries and _is_connect_error(e) \
+                        and self._backoff(attempt, deadline):
+                    continue
+                if isinstance(e, Timeout):
+                    raise TransportTimeoutError('Request timed out: {}'.format(e))
+                raise TransportError('Unable to connect to server: {}'.format(e), response=None)
+            except Timeout as e:
+                raise TransportTimeoutError('Request timed out: {}'.format(e))
+            return response
+
+    def _backoff(self, attempt, deadline):
+        """ Waits before retrying a request and returns False if the deadline would be exceeded. """
+        delay = self.backoff_factor * 2 ** attempt
+        if deadline is not None and deadline.remaining() <= delay:
+            return False
+        time.sleep(delay)
+        return True
+
+    def _post_once(self, url, data, headers, timeout, deadline):
+        """ Performs a single attempt of a request, within the deadline of the request if any. """
+        if deadline is None:
+            return self.session.post(url, headers=headers, data=data, timeout=timeout)
+
+        # requests timeouts apply to each socket operation rather than to the whole request, so
+        # the response body is read incrementally and the deadline is checked after each read.
+        remaining = deadline.remaining()
+        if remaining <= 0:
+            raise TransportTimeoutError('Deadline exceeded')
+        timeout = remaining if timeout is None else min(timeout, remaining)
+        response = self.session.post(
+            url, headers=headers, data=data, timeout=timeout, stream=True)
+        chunks = []
+        try:
+            while True:
+                _set_read_timeout(response, min(timeout, deadline.remaining()))
+                chunk = _read_chunk(response)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+                if deadline.expired:
+                    raise TransportTimeoutError('Deadline exceeded while reading the response')
+        except ReadTimeoutError as e:
+            response.close()
+            raise TransportTimeoutError('Request timed out: {}'.format(e))
+        except (URLLib3HTTPError, OSError) as e:
+            response.close()
+            raise TransportError('Unable to read the response: {}'.format(e), response=None)
+        except BaseException:
+            response.close()
+            raise
+        response._content = b''.join(chunks)
+        response._content_consumed = True
+        response.close()
+        return response
+
+    def received_bytes(self, response):
+        # The raw (urllib3) response keeps track of the number of bytes read from the socket
+        # before these are decompressed.
+        try:
+            received_bytes = response.raw.tell()
+        except (AttributeError, OSError):
+            return None
+        return received_bytes if isinstance(received_bytes, int) else None
+
+    def close(self):
+        self.session.close()
+
+
+class HTTP2Transport(BaseTransport):
+    """ HTTP/2 transport multiplexing concurrent requests over a limited number of connections.
+
+    This transport requires the httpx package to be installed with its HTTP/2 support (``pip
+    install neojsonrpc[http2]``). The HTTP protocol version is negotiated with the node during the
+    TLS handshake: the transport automatically falls back to HTTP/1.1 if the node does not support
+    HTTP/2 or if TLS is not used.
+
+    """
+
+    def __init__(self, max_retries=None, max_connections=10):
+        # httpx is imported lazily so that importing the client does not pay its import cost.
+        try:
+            import httpx
+        except ImportError:
+            raise ImportError(
+                'The HTTP/2 transport requires the httpx package: pip install neojsonrpc[http2]')
+        self._httpx = httpx
+        self.client = httpx.Client(
+            http2=True,
+            transport=httpx.HTTPTransport(
+                http2=True, retries=max_retries or 3,
+                limits=httpx.Limits(max_connections=max_connections)))
+
+    def post(self, url, data, headers, timeout=None, deadline=None):
+        # httpx timeouts also apply to each network operation, so they are bounded by the time
+        # remaining before the deadline (if any).
+        if deadline is not None:
+            remaining = deadline.remaining()
+            timeout = remaining if timeout is None else min(timeout, remaining)
+        try:
+            response = self.client.post(url, headers=headers, content=data, timeout=timeout)
+            response.raise_for_status()
+        except self._httpx.HTTPStatusError:
+            raise TransportError(
+                'Got unsuccessful response from server (status code: {})'.format(
+                    response.status_code),
+                response=response)
+        except self._httpx.TimeoutException as e:
+            raise TransportTimeoutError('Request timed out: {}'.format(e))
+        except self._httpx.TransportError as e:
+            raise TransportError('Unable to connect to server: {}'.format(e), response=None)
+        return response
+
+    def received_bytes(self, response):
+        return response.num_bytes_downloaded
+
+    def close(self):
+        self.client.close()
+
+
+class RecordingTransport(BaseTransport):
+    """ Transport recording the responses returned by another transport to a file.
+
+    Each record of the file contains the JSON-RPC method and parameters of a request (which are
+    used to index records), the content of the corresponding response and the time it took to get
+    this response. Records are appended to the file so that many sessions can be recorded to the
+    same file.
+
+    """
+
+    def __init__(self, path, transport=None):
+        self.path = path
+        self.transport = transport or HTTPTransport()
+        self._lock = threading.Lock()
+        self._file = open(path, 'ab')
+        if self._file.tell() == 0:
+            self._file.write(RECORDS_FILE_MAGIC)
+
+    def post(self, url, data, headers, timeout=None, deadline=None):
+        start = time.perf_counter()
+        response = self.transport.post(
+            url, data=data, headers=headers, timeout=timeout, deadline=deadline)
+        latency = time.perf_counter() - start
+        key = get_record_key(data, headers)
+        content = response.content
+        with self._lock:
+            self._file.write(RECORD_HEADER.pack(len(key), len(content), latency))
+            self._file.write(key)
+            self._file.write(content)
+            self._file.flush()
+        return response
+
+    def received_bytes(self, response):
+        return self.transport.received_bytes(response)
+
+    def close(self):
+        self._file.close()
+        self.transport.close()
+
+
+class ReplayTransport(BaseTransport):
+    """ Transport serving the responses previously captured by a ``RecordingTransport``.
+
+    The records file is loaded in memory and indexed when the transport is initialized. If the
+    same request was recorded many times, the recorded responses are served in order (the last one
+    being served again once all of them have been served). The latency of each response can be
+    injected by setting ``latency`` to 'recorded' (in order to wait for the recorded latency) or to
+    a number of seconds (in order to wait for a synthetic latency).
+
+    """
+
+    def __init__(self, path, latency=None):
+        self.path = path
+        self.latency = latency
+        self._lock = threading.Lock()
+        self._records = collections.defaultdict(list)
+        self._positions = collections.Counter()
+        with open(path, 'rb') as f:
+            data = f.read()
+        if not data.startswith(RECORDS_FILE_MAGIC):
+            raise ValueError('{} is not a records file'.format(path))
+        offset = len(RECORDS_FILE_MAGIC)
+        while offset < len(data):
+            key_length, content_length, latency = RECORD_HEADER.unpack_from(data, offset)
+            offset += RECORD_HEADER.size
+            key = data[offset:offset + key_length]
+            offset += key_length
+            self._records[key].append((data[offset:offset + content_length], latency))
+            offset += content_length
+
+    def post(self, url, data, headers, timeout=None, deadline=None):
+        key = get_record_key(data, headers)
+        with self._lock:
+            records = self._records.get(key)
+            if not records:
+                raise TransportError(
+                    'No recorded response for request: {}'.format(key.decode('utf-8')),
+                    response=None)
+            position = self._positions[key]
+            self._positions[key] = min(position + 1, len(records) - 1)
+        content, latency = records[position]
+        latency = latency if self.latency == 'recorded' else self.latency
+        if latency:
+            time.sleep(latency if timeout is None else min(latency, timeout))
+            if timeout is not None and latency > timeout:
+                raise TransportTimeoutError('Request timed out (replayed latency)')
+        return ReplayResponse(_rewrite_response_ids(content, _load_payload(data, headers)))
+
+
+def _is_connect_error(error):
+    """ Returns True if a connection error was raised before the request was sent. """
+    if isinstance(error, ConnectTimeout):
+        return True
+    # requests wraps the urllib3 errors (which may themselves be wrapped in MaxRetryError errors).
+    reason = error.args[0] if error.args else None
+    reason = getattr(reason, 'reason', reason)
+    return isinstance(reason, NewConnectionError)
+
+
+def _read_chunk(response, size=65536):
+    """ Reads the data that is available on the connection of a streamed response. """
+    raw = response.raw
+    if hasattr(raw, 'read1'):
+        return raw.read1(size, decode_content=True)
+    return raw.read(4096, decode_content=True)  # pragma: no cover
+
+
+def _set_read_timeout(response, timeout):
+    """ Sets the timeout of the next socket reads of a streamed response (if possible). """
+    sock = getattr(getattr(response.raw, '_connection', None), 'sock', None)
+    if sock is not None:
+        sock.settimeout(max(timeout, 0.001))
+
+
+class ReplayResponse:
+    """ Response served by a ``ReplayTransport``. """
+
+    status_code = 200
+
+    def __init__(self, content):
+        self.content = content
+        self.headers = {'Content-Type': 'application/json'}
+
+    def json(self):
+        return json.loads(self.content.decode('utf-8'))
+
+    def close(self):
+        pass
+
+
+def get_record_key(data, headers):
+    """ Returns the key identifying the JSON-RPC request(s) embedded in a request body.
+
+    The key is a canonical JSON representation of the methods and parameters of the requests: the
+    identifiers of the requests are ignored because they depend on the state of the client.
+
+    """
+    payload = _load_payload(data, headers)
+    calls = payload if isinstance(payload, list) else [payload, ]
+    key = [[c['method'], c.get('params', [])] for c in calls]
+    return json.dumps(key, sort_keys=True, separators=(',', ':')).encode('utf-8')
+
+
+def _load_payload(data, headers):
+    """ Returns the JSON-RPC request(s) embedded in a request body. """
+    if headers.get('Content-Encoding') == 'gzip':
+        data = gzip.decompress(data)
+    if isinstance(data, bytes):
+        data = data.decode('utf-8')
+    return json.loads(data)
+
+
+def _rewrite_response_ids(content, payload):
+    """ Returns a recorded response body whose identifiers match those of the replayed request(s).
+
+    The identifiers of recorded responses depend on the state of the client at the time of the
+    recording. The responses of a batch are associated with the replayed requests in the order of
+    their recorded identifiers (clients number the requests of a batch in order), or by position if
+    these identifiers cannot be compared.
+
+    """
+    try:
+        response_data = json.loads(content.decode('utf-8'))
+    except ValueError:
+        return content
+    if isinstance(payload, dict) and isinstance(response_data, dict):
+        response_data['id'] = payload.get('id')
+    elif isinstance(payload, list) and isinstance(response_data, list):
+        responses = [r for r in response_data if isinstance(r, dict)]
+        if all(isinstance(r.get('id'), int) for r in responses):
+            responses.sort(key=lambda r: r['id'])
+        for response, request in zip(responses, payload):
+            response['id'] = request.get('id')
+    else:
+        return content
+    return json.dumps(response_data).encode('utf-8')
@@ -7,29 +7,151 @@
 """
 
 import binascii
+import collections
 import copy
+import itertools
 import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 from .constants import ContractParameterTypes
 
 
+HASH256_RE = re.compile('^[0-9A-F]{64}$', re.IGNORECASE)
+HASH160_RE = re.compile('[0-9A-Fa-f]{40}')
+
+
+class Deadline:
+    """ Represents a point in time after which requests to the JSON-RPC endpoint are abandoned.
+
+    Unlike a timeout, which applies to a single request, a deadline can be shared by many calls
+    (eg. the sub-requests of a bulk operation): each call only gets the time remaining before the
+    deadline expires. For example:
+
+    .. code-block:: python
+
+        >>> deadline = Deadline(5)
+        >>> client.get_block_count(deadline=deadline)
+        >>> client.get_best_block_hash(deadline=deadline)
+
+    """
+
+    def __init__(self, timeout):
+        self.expires_at = time.monotonic() + timeout
+
+    @property
+    def expired(self):
+        """ Returns True if the deadline has been reached. """
+        return self.remaining() <= 0
+
+    def remaining(self):
+        """ Returns the number of seconds left before the deadline is reached. """
+        return max(0.0, self.expires_at - time.monotonic())
+
+
+class LRUCache:
+    """ Thread-safe mapping of bounded size discarding the least recently used items first. """
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._data = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key, default=None):
+        """ Returns the value associated with a key and marks it as recently used. """
+        with self._lock:
+            try:
+                self._data.move_to_end(key)
+            except KeyError:
+                return default
+            return self._data[key]
+
+    def set(self, key, value):
+        """ Associates a value with a key, discarding the least recently used items if needed. """
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        """ Removes all the items of the cache. """
+        with self._lock:
+            self._data.clear()
+
+    def prune(self, predicate):
+        """ Removes the items whose keys satisfy the considered predicate. """
+        with self._lock:
+            for key in [key for key in self._data if predicate(key)]:
+                del self._data[key]
+
+
 def is_hash256(s):
     """ Returns True if the considered string is a valid SHA256 hash. """
     if not s or not isinstance(s, str):
         return False
-    return re.match('^[0-9A-F]{64}$', s.strip(), re.IGNORECASE)
+    return HASH256_RE.match(s.strip())
 
 
 def is_hash160(s):
     """ Returns True if the considered string is a valid RIPEMD160 hash. """
     if not s or not isinstance(s, str):
         return False
-    if not len(s) == 40:
-        return False
-    for c in s:
-        if (c < '0' or c > '9') and (c < 'A' or c > 'F') and (c < 'a' or c > 'f'):
-            return False
-    return True
+    return HASH160_RE.fullmatch(s) is not None
+
+
+def are_hash256(values):
+    """ Returns a list of booleans indicating which strings are SHA256 hashes. """
+    return [bool(is_hash256(s)) for s in values]
+
+
+def are_hash160(values):
+    """ Returns a list of booleans indicating which strings are RIPEMD160 hashes. """
+    return [is_hash160(s) for s in values]
+
+
+def map_concurrently(func, iterable, concurrency):
+    """ Applies a function to the items of an iterable using a pool of threads.
+
+    Results are yielded in the order of the iterable. At most ``concurrency`` calls are pending at
+    any time and the iterable is consumed lazily, so that memory usage stays bounded even for very
+    large iterables. Pending calls are cancelled if the returned generator is closed.
+
+    """
+    if concurrency <= 1:
+        for item in iterable:
+            yield func(item)
+        return
+
+    pending = collections.deque()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        try:
+            for item in iterable:
+                if len(pending) >= concurrency:
+                    yield pending.popleft().result()
+                pending.append(executor.submit(func, item))
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def iter_chunks(iterable, size):
+    """ Returns an iterator over lists of (at most) ``size`` consecutive items of an iterable. """
+    iterator = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
 
 
 def encode_invocation_params(params):
@@ -0,0 +1,131 @@
+"""
+    NEO JSON-RPC local validation
+    =============================
+
+    This module allows to validate NEO addresses and to convert addresses to script hashes (and
+    vice versa) locally, without calling the ``validateaddress`` method of JSON-RPC endpoints.
+
+    NEO addresses are Base58Check encodings of a version byte (0x17) followed by a 20-byte script
+    hash. Script hashes are represented as 0x-prefixed hexadecimal strings in big-endian byte order
+    (eg. 0xecc6b20d3ccac1ee9ef109af5a7cdb85706b1df9), like in the results of JSON-RPC methods.
+
+"""
+
+import binascii
+import hashlib
+
+
+ADDRESS_VERSION = 0x17
+
+BASE58_ALPHABET = '123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz'
+BASE58_INDEXES = {c: i for i, c in enumerate(BASE58_ALPHABET)}
+
+
+def is_valid_address(address):
+    """ Returns True if the considered string is a valid NEO address. """
+    return _decode_address(address) is not None
+
+
+def validate_address(address):
+    """ Validates an address and returns the same result as the ``validateaddress`` method.
+
+    :param address: string containing a potential NEO address
+    :type address: str
+    :return: dictionary containing the result of the verification
+    :rtype: dict
+
+    """
+    return {'address': address, 'isvalid': is_valid_address(address)}
+
+
+def validate_addresses(addresses):
+    """ Validates many addresses and returns the list of the results of each validation.
+
+    :param addresses: iterable of strings containing potential NEO addresses
+    :type addresses: iterable
+    :return: list of dictionaries containing the result of each verification
+    :rtype: list
+
+    """
+    return [{'address': a, 'isvalid': _decode_address(a) is not None} for a in addresses]
+
+
+def address_to_script_hash(address):
+    """ Returns the script hash associated with an address.
+
+    :param address: NEO address
+    :type address: str
+    :return: script hash (eg. 0xecc6b20d3ccac1ee9ef109af5a7cdb85706b1df9)
+    :rtype: str
+
+    """
+    data = _decode_address(address)
+    if data is None:
+        raise ValueError('Invalid NEO address: {}'.format(address))
+    return '0x' + binascii.hexlify(data[20:0:-1]).decode('ascii')
+
+
+def addresses_to_script_hashes(addresses):
+    """ Returns the list of the script hashes associated with many addresses. """
+    return [address_to_script_hash(address) for address in addresses]
+
+
+def script_hash_to_address(script_hash):
+    """ Returns the address associated with a script hash.
+
+    :param script_hash: script hash (eg. 0xecc6b20d3ccac1ee9ef109af5a7cdb85706b1df9)
+    :type script_hash: str
+    :return: NEO address
+    :rtype: str
+
+    """
+    script_hash = script_hash[2:] if script_hash.startswith('0x') else script_hash
+    data = bytes([ADDRESS_VERSION, ]) + bytes.fromhex(script_hash)[::-1]
+    if len(data) != 21:
+        raise ValueError('Invalid script hash: {}'.format(script_hash))
+    return _b58encode(data + _checksum(data))
+
+
+def script_hashes_to_addresses(script_hashes):
+    """ Returns the list of the addresses associated with many script hashes. """
+    return [script_hash_to_address(script_hash) for script_hash in script_hashes]
+
+
+def _decode_address(address):
+    """ Returns the version byte and the script hash of an address, or None if it is invalid. """
+    if not isinstance(address, str):
+        return None
+    data = _b58decode(address)
+    if data is None or len(data) != 25 or data[0] != ADDRESS_VERSION:
+        return None
+    if _checksum(data[:21]) != data[21:]:
+        return None
+    return data[:21]
+
+
+def _checksum(data):
+    """ Returns the Base58Check checksum of the considered bytes. """
+    return hashlib.sha256(hashlib.sha256(data).digest()).digest()[:4]
+
+
+def _b58decode(s):
+    """ Decodes a Base58 string, returns None if the string contains invalid characters. """
+    value = 0
+    for c in s:
+        index = BASE58_INDEXES.get(c)
+        if index is None:
+            return None
+        value = value * 58 + index
+    leading_zeros = len(s) - len(s.lstrip('1'))
+    return b'\0' * leading_zeros + value.to_bytes((value.bit_length() + 7) // 8, 'big')
+
+
+def _b58encode(data):
+    """ Encodes bytes to a Base58 string. """
+    value = int.from_bytes(data, 'big')
+    chars = []
+    while value:
+        value, index = divmod(value, 58)
+        chars.append(BASE58_ALPHABET[index])
+    leading_zeros = len(data) - len(data.lstrip(b'\0'))
+    return '1' * leading_zeros + ''.join(reversed(chars))
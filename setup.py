@@ -30,6 +30,14 @@ setup(
     install_requires=[
         'requests>2.0',
     ],
+    extras_require={
+        'http2': ['httpx[http2]'],
+    },
+    entry_points={
+        'console_scripts': [
+            'neojsonrpc = neojsonrpc.cli:main',
+        ],
+    },
     classifiers=[
         'Development Status :: 4 - Beta',
         'Intended Audience :: Developers',
@@ -0,0 +1,32 @@
+import os
+
+import pytest
+
+from neojsonrpc import Client
+from neojsonrpc.transports import RecordingTransport, ReplayTransport
+
+
+@pytest.fixture(scope='session')
+def records_transport():
+    # The responses of the testnet seeds can be recorded to a file by setting the
+    # NEOJSONRPC_RECORD environment variable to a path. These responses can then be replayed
+    # offline by setting the NEOJSONRPC_REPLAY environment variable to the path of this file.
+    if os.environ.get('NEOJSONRPC_RECORD'):
+        transport = RecordingTransport(os.environ['NEOJSONRPC_RECORD'])
+    elif os.environ.get('NEOJSONRPC_REPLAY'):
+        transport = ReplayTransport(os.environ['NEOJSONRPC_REPLAY'])
+    else:
+        transport = None
+    yield transport
+    if transport is not None:
+        transport.close()
+
+
+@pytest.fixture(autouse=True)
+def use_records_transport(monkeypatch, records_transport):
+    if records_transport is None:
+        return
+    for_testnet = Client.for_testnet.__func__
+    monkeypatch.setattr(
+        Client, 'for_testnet',
+        classmethod(lambda cls, **kwargs: for_testnet(cls, transport=records_transport, **kwargs)))
@@ -0,0 +1,77 @@
+import unittest.mock
+
+import pytest
+
+from neojsonrpc import Client
+from neojsonrpc.broadcast import Broadcaster, get_transaction_hash
+from neojsonrpc.exceptions import ProtocolError
+
+
+# Unsigned ContractTransaction and IssueTransaction with a single remark attribute (and no
+# witnesses).
+CONTRACT_TX = '800001f00131000000'
+ISSUE_TX = '010001f00132000000'
+
+
+class TestBroadcaster:
+    def test_can_broadcast_transactions_to_many_nodes(self):
+        client1, client2 = Client(host='node1'), Client(host='node2')
+        client1.send_raw_transaction = unittest.mock.Mock(return_value=True)
+        client2.send_raw_transaction = unittest.mock.Mock(
+            side_effect=[True, ProtocolError('Error[-501] Block or transaction validation failed',
+                                             response=None)])
+        broadcaster = Broadcaster([client1, client2], max_in_flight=1)
+        results = list(broadcaster.broadcast([CONTRACT_TX, ISSUE_TX]))
+        assert [result.tx_hash for result in results] == \
+            [get_transaction_hash(CONTRACT_TX), get_transaction_hash(ISSUE_TX)]
+        assert results[0].accepted == {client1.url: True, client2.url: True}
+        assert results[1].accepted == {client1.url: True, client2.url: False}
+        assert list(results[1].errors) == [client2.url]
+        assert broadcaster.metrics['{}.accepted'.format(client1.url)] == 2
+        assert broadcaster.metrics['{}.rejected'.format(client2.url)] == 1
+
+    def test_skips_transactions_that_were_already_broadcast(self):
+        client = Client(host='node1')
+        client.send_raw_transaction = unittest.mock.Mock(return_value=True)
+        broadcaster = Broadcaster([client])
+        assert len(list(broadcaster.broadcast([CONTRACT_TX, ISSUE_TX, CONTRACT_TX]))) == 2
+        assert len(list(broadcaster.broadcast([('0xab', '02'), ISSUE_TX]))) == 1
+        assert client.send_raw_transaction.call_count == 3
+        assert broadcaster.metrics['duplicates'] == 2
+
+    def test_reports_transactions_that_cannot_be_parsed(self):
+        client = Client(host='node1')
+        client.send_raw_transaction = unittest.mock.Mock(return_value=True)
+        broadcaster = Broadcaster([client])
+        results = list(broadcaster.broadcast([CONTRACT_TX, '00', 'zz', ISSUE_TX]))
+        assert [result.tx_hash for result in results] == \
+            [get_transaction_hash(CONTRACT_TX), None, None, get_transaction_hash(ISSUE_TX)]
+        assert results[1].accepted == {client.url: False}
+        assert isinstance(results[2].errors[client.url], ValueError)
+        assert client.send_raw_transaction.call_count == 2
+        assert broadcaster.metrics['invalid'] == 2
+
+    def test_can_broadcast_again_transactions_rejected_by_all_the_nodes(self):
+        client = Client(host='node1')
+        client.send_raw_transaction = unittest.mock.Mock(side_effect=[False, True])
+        broadcaster = Broadcaster([client], max_hashes=1)
+        assert list(broadcaster.broadcast([CONTRACT_TX]))[0].accepted == {client.url: False}
+        assert list(broadcaster.broadcast([CONTRACT_TX]))[0].accepted == {client.url: True}
+        assert not list(broadcaster.broadcast([CONTRACT_TX]))
+        assert len(broadcaster._broadcast_hashes) == 1
+
+
+def test_get_transaction_hash_helper_works():
+    # MinerTransaction of the genesis block.
+    assert get_transaction_hash('00001dac2b7c00000000') == \
+        '0xfb5bd72b2d6792d75dc2f1084ffa9e9f70ca85543c717a6b13d9959b452a57d6'
+
+
+def test_get_transaction_hash_helper_ignores_witnesses():
+    witness = '01' + '02' + 'abcd' + '01' + 'ac'
+    assert get_transaction_hash(CONTRACT_TX[:-2] + witness) == get_transaction_hash(CONTRACT_TX)
+
+
+def test_get_transaction_hash_helper_rejects_truncated_transactions():
+    with pytest.raises(ValueError):
+        get_transaction_hash('00')
@@ -0,0 +1,81 @@
+import unittest.mock
+
+from neojsonrpc import Client
+from neojsonrpc.caching import InvocationCache
+
+
+def get_client(cache):
+    client = Client(invocation_cache=cache)
+    client.height = 10
+
+    def call(method, params=None, postprocess=None, **kwargs):
+        if method == 'getblockcount':
+            return client.height
+        return postprocess({'state': 'HALT, BREAK', 'stack': [
+            {'type': 'Integer', 'value': str(client.height)}]})
+
+    client._call = unittest.mock.Mock(side_effect=call)
+    return client
+
+
+def get_invocation_calls(client):
+    return [c for c in client._call.call_args_list if c[0][0] != 'getblockcount']
+
+
+class TestInvocationCache:
+    def test_caches_the_results_of_invocations_at_the_current_height(self):
+        cache = InvocationCache(height_check_interval=0)
+        client = get_client(cache)
+        contract = client.contract('ecc6b20d3ccac1ee9ef109af5a7cdb85706b1df9')
+        assert contract.balanceOf('a')['stack'][0]['value'] == '10'
+        assert contract.balanceOf('a')['stack'][0]['value'] == '10'
+        assert contract.balanceOf('b')['stack'][0]['value'] == '10'
+        assert len(get_invocation_calls(client)) == 2
+        assert cache.height == 9
+        assert cache.hit_rate == 1 / 3
+
+    def test_discards_the_cached_results_when_a_new_block_is_seen(self):
+        cache = InvocationCache(height_check_interval=0)
+        client = get_client(cache)
+        client.invoke_script('00')
+        client.height = 11
+        assert client.invoke_script('00')['stack'][0]['value'] == '11'
+        assert len(get_invocation_calls(client)) == 2
+        assert len(cache) == 1
+
+    def test_checks_the_height_of_the_chain_at_most_once_per_interval(self):
+        cache = InvocationCache(height_check_interval=60)
+        client = get_client(cache)
+        for _ in range(5):
+            client.invoke_function('ecc6b20d3ccac1ee9ef109af5a7cdb85706b1df9', 'symbol', [])
+        assert client._call.call_count == 2
+
+    def test_can_cache_the_results_of_some_functions_for_a_given_duration(self):
+        cache = InvocationCache(ttls={'decimals': 60}, height_check_interval=0)
+        client = get_client(cache)
+        client.invoke_function('ecc6b20d3ccac1ee9ef109af5a7cdb85706b1df9', 'decimals', [])
+        client.height = 11
+        result = client.invoke_function('ecc6b20d3ccac1ee9ef109af5a7cdb85706b1df9', 'decimals', [])
+        assert result['stack'][0]['value'] == '10'
+        assert client._call.call_count == 1
+
+    def test_expires_the_results_of_functions_with_a_ttl(self):
+        cache = InvocationCache(ttls={'decimals': 0}, height_check_interval=0)
+        client = get_client(cache)
+        client.invoke_function('ecc6b20d3ccac1ee9ef109af5a7cdb85706b1df9', 'decimals', [])
+        client.invoke_function('ecc6b20d3ccac1ee9ef109af5a7cdb85706b1df9', 'decimals', [])
+        assert client._call.call_count == 2
+
+    def test_evicts_the_least_recently_used_results(self):
+        cache = InvocationCache(maxsize=2, height_check_interval=60)
+        client = get_client(cache)
+        for script in ('00', '01', '02', '00'):
+            client.invoke_script(script)
+        assert len(cache) == 2
+        assert len(get_invocation_calls(client)) == 4
+
+    def test_returns_copies_of_the_cached_results(self):
+        cache = InvocationCache(height_check_interval=60)
+        client = get_client(cache)
+        client.invoke_script('00')['stack'].clear()
+        assert client.invoke_script('00')['stack']
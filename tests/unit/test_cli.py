@@ -0,0 +1,53 @@
+import json
+import unittest.mock
+
+from neojsonrpc.cli import main
+from neojsonrpc.testing import SimulatorServer, SyntheticChain
+from neojsonrpc.transports import HTTPTransport, RecordingTransport
+
+
+class TestCall:
+    @unittest.mock.patch('neojsonrpc.client.Client._call')
+    def test_can_call_a_json_rpc_method(self, mocked_call, capsys):
+        mocked_call.return_value = {'index': 1000}
+        assert main(['call', '--host', 'node', 'getblock', '1000', '1']) == 0
+        mocked_call.assert_called_once_with('getblock', [1000, 1])
+        assert json.loads(capsys.readouterr().out) == {'index': 1000}
+
+    def test_rejects_unknown_methods(self, capsys):
+        assert main(['call', 'unknown']) == 2
+        assert 'Unknown JSON-RPC method' in capsys.readouterr().err
+
+
+class TestFetchBlocks:
+    @unittest.mock.patch('neojsonrpc.client.Client._call')
+    def test_can_download_a_range_of_blocks(self, mocked_call, tmpdir):
+        mocked_call.side_effect = lambda method, params, **kwargs: {'index': params[0]}
+        output = str(tmpdir.join('blocks.jsonl'))
+        assert main(['fetch-blocks', '10', '20', '-o', output, '-c', '4']) == 0
+        with open(output) as f:
+            assert [json.loads(line)['index'] for line in f] == list(range(10, 20))
+
+    def test_can_replay_recorded_responses(self, tmpdir):
+        records = str(tmpdir.join('records'))
+        with SimulatorServer(SyntheticChain(seed=42, block_count=30)) as server:
+            transport = RecordingTransport(records, transport=HTTPTransport())
+            with server.client(transport=transport) as client:
+                expected = list(client.get_blocks(10, 20))
+        output = str(tmpdir.join('blocks.jsonl'))
+        assert main(['fetch-blocks', '10', '20', '-o', output, '--replay', records]) == 0
+        with open(output) as f:
+            assert [json.loads(line) for line in f] == expected
+
+
+class TestBench:
+    @unittest.mock.patch('neojsonrpc.client.Client._call')
+    def test_can_benchmark_methods_against_many_nodes(self, mocked_call, capsys):
+        mocked_call.return_value = 1
+        assert main([
+            'bench', '-n', 'node1:10332', '-n', 'https://node2:10331', '-m', 'getblockcount',
+            '-m', 'getblock:[1000]', '-r', '10']) == 0
+        output = capsys.readouterr().out.splitlines()
+        assert len(output) == 5
+        assert output[4].startswith('https://node2:10331')
+        mocked_call.assert_any_call('getblock', [1000])
@@ -1,10 +1,15 @@
+import gzip
+import json
 import unittest.mock
+from concurrent.futures import ProcessPoolExecutor
 
 import pytest
-from requests.exceptions import HTTPError
+import requests
+from requests.exceptions import HTTPError, Timeout
 
 from neojsonrpc import Client
-from neojsonrpc.exceptions import ProtocolError, TransportError
+from neojsonrpc.exceptions import ProtocolError, TransportError, TransportTimeoutError
+from neojsonrpc.utils import Deadline
 
 
 class TestClient:
@@ -46,3 +51,154 @@ class TestClient:
         client = Client.for_testnet()
         with pytest.raises(ProtocolError):
             client.get_block_count()
+
+    def test_exposes_the_requests_session_of_its_transport(self):
+        client = Client()
+        assert isinstance(client.session, requests.Session)
+        assert client.session is client.transport.session
+        with pytest.raises(AttributeError):
+            Client(transport=unittest.mock.Mock(spec=['post', 'close'])).session
+
+    @unittest.mock.patch('requests.Session.post')
+    def test_uses_the_default_timeout_of_the_client(self, mocked_post):
+        mocked_response = unittest.mock.Mock(status_code=200, content='{}')
+        mocked_response.json.return_value = {'result': 42}
+        mocked_post.return_value = mocked_response
+        client = Client.for_testnet()
+        client.timeout = 12
+        client.get_block_count()
+        assert mocked_post.call_args[1]['timeout'] == 12
+        client.get_block_count(timeout=3)
+        assert mocked_post.call_args[1]['timeout'] == 3
+
+    @unittest.mock.patch('requests.Session.post')
+    def test_bounds_the_timeout_of_a_request_using_its_deadline(self, mocked_post):
+        mocked_response = unittest.mock.Mock(status_code=200, content='{}')
+        mocked_response.raw.read1.side_effect = [b'{"result": 42}', b'']
+        mocked_response.json.return_value = {'result': 42}
+        mocked_post.return_value = mocked_response
+        client = Client.for_testnet()
+        client.get_block_count(deadline=Deadline(5))
+        assert 0 < mocked_post.call_args[1]['timeout'] <= 5
+
+    @unittest.mock.patch('requests.Session.post')
+    def test_raises_a_timeout_error_if_the_deadline_of_a_request_has_expired(self, mocked_post):
+        client = Client.for_testnet()
+        with pytest.raises(TransportTimeoutError):
+            client.get_block_count(deadline=Deadline(0))
+        assert not mocked_post.called
+
+    @unittest.mock.patch('requests.Session.post')
+    def test_raises_a_timeout_error_if_a_request_times_out(self, mocked_post):
+        mocked_post.side_effect = Timeout()
+        client = Client.for_testnet()
+        with pytest.raises(TransportTimeoutError):
+            client.get_block_count()
+
+    @unittest.mock.patch('requests.Session.post')
+    def test_can_compress_request_bodies_exceeding_a_threshold(self, mocked_post):
+        mocked_response = unittest.mock.Mock(status_code=200, content='{}')
+        mocked_response.json.return_value = {'result': True}
+        mocked_post.return_value = mocked_response
+        client = Client.for_testnet(compress_requests_threshold=100)
+        client.send_raw_transaction('00' * 1000)
+        data = mocked_post.call_args[1]['data']
+        assert mocked_post.call_args[1]['headers']['Content-Encoding'] == 'gzip'
+        assert json.loads(gzip.decompress(data).decode('utf-8'))['params'] == ['00' * 1000]
+        assert client.metrics['request_bytes_saved'] > 0
+        client.get_block_count()
+        assert 'Content-Encoding' not in mocked_post.call_args[1]['headers']
+
+    @unittest.mock.patch('requests.Session.post')
+    def test_records_the_number_of_bytes_exchanged_with_the_server(self, mocked_post):
+        mocked_response = unittest.mock.Mock(status_code=200, content=b'{"result": 1}')
+        mocked_response.raw.tell.return_value = 5
+        mocked_response.json.return_value = {'result': 1}
+        mocked_post.return_value = mocked_response
+        client = Client.for_testnet()
+        client.get_block_count()
+        assert client.metrics['requests'] == 1
+        assert client.metrics['response_bytes'] == 5
+        assert client.metrics['response_bytes_saved'] == 8
+
+    @unittest.mock.patch('requests.Session.post')
+    def test_can_fetch_application_logs_using_batch_requests(self, mocked_post):
+        def post(url, headers, data, timeout):
+            payload = json.loads(data.decode('utf-8'))
+            mocked_response = unittest.mock.Mock(status_code=200, content='[]')
+            mocked_response.json.return_value = [
+                {'id': p['id'], 'result': {'txid': p['params'][0]}} for p in reversed(payload)]
+            return mocked_response
+
+        mocked_post.side_effect = post
+        client = Client.for_testnet()
+        logs = client.get_application_logs(
+            ['0x{:02x}'.format(i) for i in range(10)], concurrency=2, batch_size=3)
+        assert [log['txid'] for log in logs] == ['0x{:02x}'.format(i) for i in range(10)]
+        assert mocked_post.call_count == 4
+
+    @unittest.mock.patch('requests.Session.post')
+    def test_can_parse_and_convert_blocks_using_a_process_pool(self, mocked_post):
+        def post(url, headers, data, timeout):
+            payload = json.loads(data.decode('utf-8'))
+            body = {'id': payload['id'], 'result': {'index': payload['params'][0], 'tx': []}}
+            return unittest.mock.Mock(
+                status_code=200, content=json.dumps(body).encode('utf-8'),
+                **{'raw.tell.return_value': None})
+
+        mocked_post.side_effect = post
+        client = Client.for_testnet()
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            blocks = list(client.get_blocks(0, 5, executor=executor))
+            sizes = list(client.get_blocks(0, 5, executor=executor, convert=len))
+        assert [block['index'] for block in blocks] == list(range(5))
+        assert sizes == [2] * 5
+
+    @unittest.mock.patch('requests.Session.post')
+    def test_raises_a_protocol_error_if_a_body_parsed_by_an_executor_is_invalid(
+            self, mocked_post):
+        mocked_post.return_value = unittest.mock.Mock(
+            status_code=200, content=b'{', **{'raw.tell.return_value': None})
+        client = Client.for_testnet()
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            with pytest.raises(ProtocolError):
+                list(client.get_blocks(0, 1, executor=executor))
+
+    @unittest.mock.patch('requests.Session.post')
+    def test_can_resolve_the_inputs_of_transactions(self, mocked_post):
+        def post(url, headers, data, timeout):
+            payload = json.loads(data.decode('utf-8'))
+            mocked_response = unittest.mock.Mock(status_code=200, content='[]')
+            mocked_response.json.return_value = [
+                {'id': p['id'], 'result': {'txid': p['params'][0], 'vout': [
+                    {'n': n, 'asset': '0xc56f', 'value': str(n), 'address': p['params'][0] + 'A'}
+                    for n in range(2)]}}
+                for p in payload]
+            return mocked_response
+
+        mocked_post.side_effect = post
+        client = Client.for_testnet()
+        txs = [{'vin': [{'txid': '0x01', 'vout': 0}, {'txid': '0x02', 'vout': 1}]},
+               {'vin': [{'txid': '0x01', 'vout': 1}]}, {'vin': []}]
+        txs = client.resolve_inputs(txs, batch_size=10)
+        assert txs[0]['vin'] == [
+            {'txid': '0x01', 'vout': 0, 'asset': '0xc56f', 'value': '0', 'address': '0x01A'},
+            {'txid': '0x02', 'vout': 1, 'asset': '0xc56f', 'value': '1', 'address': '0x02A'}]
+        assert txs[1]['vin'][0]['value'] == '1'
+        assert mocked_post.call_count == 1
+        assert len(json.loads(mocked_post.call_args[1]['data'].decode('utf-8'))) == 2
+
+        # The outputs of the previous transactions are now cached.
+        tx = client.resolve_inputs([{'vin': [{'txid': '0x02', 'vout': 0}]}])[0]
+        assert tx['vin'][0]['address'] == '0x02A'
+        assert mocked_post.call_count == 1
+
+    @unittest.mock.patch('requests.Session.post')
+    def test_raises_a_protocol_error_if_a_call_of_a_batch_request_fails(self, mocked_post):
+        mocked_response = unittest.mock.Mock(status_code=200, content='[]')
+        mocked_response.json.return_value = [
+            {'id': 0, 'result': {}}, {'id': 1, 'error': {'code': -100, 'message': 'Unknown'}}]
+        mocked_post.return_value = mocked_response
+        client = Client.for_testnet()
+        with pytest.raises(ProtocolError):
+            list(client.get_application_logs(['0x01', '0x02'], batch_size=2))
@@ -0,0 +1,71 @@
+import json
+import os
+import unittest.mock
+
+import pytest
+
+from neojsonrpc.export import _get_writer, export_blocks, flatten_block
+
+
+BLOCK = {
+    'hash': '0x155d6f65eb79730fcb98c8da07d216a150eab432803692c9c9aa04fc895c830d',
+    'index': 977981,
+    'merkleroot': '0x0e6abef01f17d2ce984fd215266db005b67f0f324df6bcf2b42b1b692226941f',
+    'nextconsensus': 'AdyQbbn6ENjqWDa5JNYMwN3ikNcA4JeZdk',
+    'previousblockhash': '0x3f1438acc3c949fa9f97181cefb4b4f0e376d996c25398bc70159ae75e52be00',
+    'size': 987,
+    'time': 1515362895,
+    'version': 0,
+    'tx': [
+        {'net_fee': '0', 'size': 10, 'sys_fee': '0', 'type': 'MinerTransaction', 'version': 0,
+         'txid': '0xd0884f26dc433e40f45ac5a5c310979e8a9c14925ba8523582933e2905cf51ed',
+         'vin': [], 'vout': []},
+        {'net_fee': '0.001', 'size': 301, 'sys_fee': '0', 'gas': '1',
+         'type': 'InvocationTransaction', 'version': 1, 'script': '00c1',
+         'txid': '0x5c9cdc113a7adb58320786f2be8009b1fb723bd164b6d9e6025f019203beeeb8',
+         'vin': [{'txid': '0xd0884f26dc433e40f45ac5a5c310979e8a9c14925ba8523582933e2905cf51ed',
+                  'vout': 1}],
+         'vout': [{'n': 0, 'value': '12.5', 'address': 'AdyQbbn6ENjqWDa5JNYMwN3ikNcA4JeZdk',
+                   'asset': '0x602c79718b16e442de58778e148d0b1084e3b2dffd5de6b7b16cee7969282de7'}]},
+    ],
+}
+
+
+class TestFlattenBlock:
+    def test_can_flatten_a_block_into_typed_rows(self):
+        tables = flatten_block(BLOCK)
+        assert tables['blocks'][0][0] == 977981
+        assert tables['blocks'][0][1] == bytes.fromhex(BLOCK['hash'][2:])
+        assert tables['blocks'][0][-1] == 2
+        assert [row[3] for row in tables['transactions']] == \
+            ['MinerTransaction', 'InvocationTransaction']
+        assert tables['transactions'][1][-1] == 100000
+        assert tables['inputs'] == [(
+            977981, bytes.fromhex(BLOCK['tx'][1]['txid'][2:]), 0,
+            bytes.fromhex(BLOCK['tx'][0]['txid'][2:]), 1)]
+        assert tables['outputs'][0][4] == 1250000000
+        assert tables['invocations'][0][2:] == (100000000, b'\x00\xc1')
+
+
+class TestExportBlocks:
+    @unittest.mock.patch('neojsonrpc.export.numpy', None)
+    @unittest.mock.patch('neojsonrpc.export.pyarrow', None)
+    def test_cannot_be_used_if_no_columnar_format_is_available(self):
+        with pytest.raises(ImportError):
+            _get_writer(None)
+
+    def test_can_export_blocks_to_npy_column_arrays_and_resume(self, tmpdir):
+        numpy = pytest.importorskip('numpy')
+        client = unittest.mock.Mock()
+        client.get_blocks.side_effect = lambda start, stop, concurrency: (
+            dict(BLOCK, index=index) for index in range(start, min(stop, start + 3)))
+        path = str(tmpdir)
+        assert export_blocks(client, 10, 15, path, chunk_size=2, format='npy') == 12
+        assert export_blocks(client, 10, 15, path, chunk_size=2, format='npy') == 15
+        assert sorted(os.listdir(os.path.join(path, 'blocks'))) == \
+            ['0000000010-0000000011.npy', '0000000012-0000000013.npy',
+             '0000000014-0000000014.npy']
+        with open(os.path.join(path, 'manifest.json')) as f:
+            assert json.load(f)['next_index'] == 15
+        indexes = numpy.load(os.path.join(path, 'blocks', '0000000012-0000000013.npy', 'index.npy'))
+        assert indexes.tolist() == [12, 13]
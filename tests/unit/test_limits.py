@@ -0,0 +1,175 @@
+import json
+import threading
+import time
+import unittest.mock
+
+import pytest
+
+from neojsonrpc import Client
+from neojsonrpc.exceptions import TransportError, TransportTimeoutError
+from neojsonrpc.limits import (PRIORITY_HIGH, PRIORITY_LOW, AIMDLimiter, PriorityScheduler,
+                               TokenBucket)
+
+
+class TestAIMDLimiter:
+    def test_increases_its_limit_when_requests_succeed(self):
+        limiter = AIMDLimiter(initial_limit=2, max_limit=3)
+        for _ in range(10):
+            limiter.acquire()
+            limiter.release(0.01)
+        assert limiter.limit == 3
+
+    def test_decreases_its_limit_when_requests_fail(self):
+        limiter = AIMDLimiter(initial_limit=8)
+        limiter.acquire()
+        limiter.release(0.01, error=True)
+        assert limiter.limit == 4
+
+    def test_decreases_its_limit_when_requests_are_slow(self):
+        limiter = AIMDLimiter(initial_limit=8, latency_target=0.5)
+        limiter.acquire()
+        limiter.release(1)
+        assert limiter.limit == 4
+
+    def test_decreases_its_limit_once_for_a_burst_of_failures(self):
+        limiter = AIMDLimiter(initial_limit=8)
+        for _ in range(3):
+            limiter.acquire()
+        for _ in range(3):
+            limiter.release(0.5, error=True)
+        assert limiter.limit == 4
+
+    def test_can_release_a_slot_without_adjusting_its_limit(self):
+        limiter = AIMDLimiter(initial_limit=8)
+        limiter.acquire()
+        limiter.release(adjust=False)
+        assert limiter.limit == 8
+        assert limiter.in_flight == 0
+
+    def test_serves_high_priority_requests_first(self):
+        limiter = AIMDLimiter(initial_limit=1, max_limit=1)
+        limiter.acquire(priority=PRIORITY_LOW)
+        order = []
+
+        def acquire(priority):
+            limiter.acquire(timeout=5, priority=priority)
+            order.append(priority)
+            limiter.release(0.01)
+
+        low_thread = threading.Thread(target=acquire, args=(PRIORITY_LOW, ))
+        low_thread.start()
+        time.sleep(0.05)
+        high_thread = threading.Thread(target=acquire, args=(PRIORITY_HIGH, ))
+        high_thread.start()
+        time.sleep(0.05)
+        limiter.release(0.01)
+        low_thread.join()
+        high_thread.join()
+        assert order == [PRIORITY_HIGH, PRIORITY_LOW]
+
+    def test_bounds_the_number_of_in_flight_requests(self):
+        limiter = AIMDLimiter(initial_limit=1)
+        limiter.acquire()
+        with pytest.raises(TransportTimeoutError):
+            limiter.acquire(timeout=0.01)
+        threading.Timer(0.05, limiter.release).start()
+        limiter.acquire(timeout=1)
+        assert limiter.in_flight == 1
+
+
+class TestTokenBucket:
+    def test_limits_the_rate_of_requests(self):
+        bucket = TokenBucket(rate=20, burst=2)
+        start = time.monotonic()
+        for _ in range(4):
+            bucket.acquire()
+        assert time.monotonic() - start >= 0.09
+        with pytest.raises(TransportTimeoutError):
+            bucket.acquire(timeout=0)
+
+
+class TestPriorityScheduler:
+    def test_bounds_the_number_of_in_flight_requests_of_each_lane(self):
+        scheduler = PriorityScheduler({PRIORITY_HIGH: 2, PRIORITY_LOW: 1})
+        scheduler.acquire(PRIORITY_LOW)
+        with pytest.raises(TransportTimeoutError):
+            scheduler.acquire(PRIORITY_LOW, timeout=0.01)
+        # The high priority lane is not affected by the saturation of the low priority lane.
+        scheduler.acquire(timeout=0)
+        scheduler.acquire(PRIORITY_HIGH, timeout=0)
+        assert scheduler.in_flight == {PRIORITY_HIGH: 2, PRIORITY_LOW: 1}
+        threading.Timer(0.05, scheduler.release, args=(PRIORITY_LOW, )).start()
+        scheduler.acquire(PRIORITY_LOW, timeout=1)
+
+    def test_rejects_unknown_priorities(self):
+        with pytest.raises(ValueError):
+            PriorityScheduler().acquire('urgent')
+
+
+class TestClientLimits:
+    @unittest.mock.patch('requests.Session.post')
+    def test_reports_the_outcome_of_requests_to_the_concurrency_limiter(self, mocked_post):
+        mocked_response = unittest.mock.Mock(status_code=200, content='{}')
+        mocked_response.json.return_value = {'result': 42}
+        mocked_post.return_value = mocked_response
+        limiter = AIMDLimiter(initial_limit=4)
+        client = Client(concurrency_limiter=limiter, rate_limiter=TokenBucket(1000))
+        assert client.get_block_count() == 42
+        assert limiter.limit == 4.25
+        mocked_post.side_effect = TransportError('ERROR', response=None)
+        with pytest.raises(TransportError):
+            client.get_block_count()
+        assert limiter.limit == 2.125
+        assert limiter.in_flight == 0
+
+    @unittest.mock.patch('requests.Session.post')
+    def test_sends_the_requests_of_bulk_methods_in_the_low_priority_lane(self, mocked_post):
+        scheduler = PriorityScheduler({PRIORITY_HIGH: 1, PRIORITY_LOW: 1})
+        lanes = []
+
+        def post(url, headers, data, timeout):
+            lanes.append(sorted(p for p, count in scheduler.in_flight.items() if count))
+            mocked_response = unittest.mock.Mock(status_code=200, content='{}')
+            mocked_response.json.return_value = {'result': {}}
+            return mocked_response
+
+        mocked_post.side_effect = post
+        client = Client(scheduler=scheduler)
+        client.get_block(1)
+        list(client.get_blocks(0, 2, concurrency=1))
+        client.get_block(1, priority=PRIORITY_LOW)
+        assert lanes == [[PRIORITY_HIGH], [PRIORITY_LOW], [PRIORITY_LOW], [PRIORITY_LOW]]
+        assert scheduler.in_flight == {PRIORITY_HIGH: 0, PRIORITY_LOW: 0}
+
+    @unittest.mock.patch('requests.Session.post')
+    def test_serves_interactive_requests_first_when_the_concurrency_limit_is_reached(
+            self, mocked_post):
+        limiter = AIMDLimiter(initial_limit=1, max_limit=1)
+        scheduler = PriorityScheduler({PRIORITY_HIGH: 4, PRIORITY_LOW: 4})
+        unblocked = threading.Event()
+        methods = []
+
+        def post(url, headers, data, timeout):
+            methods.append(json.loads(data.decode('utf-8'))['method'])
+            if len(methods) == 1:
+                unblocked.wait(5)
+            mocked_response = unittest.mock.Mock(status_code=200, content='{}')
+            mocked_response.json.return_value = {'result': 1}
+            return mocked_response
+
+        mocked_post.side_effect = post
+        client = Client(concurrency_limiter=limiter, scheduler=scheduler)
+        threads = [
+            threading.Thread(target=client.get_block_count, kwargs={'priority': PRIORITY_LOW}),
+            threading.Thread(target=client.get_block_hash, args=(1, ),
+                             kwargs={'priority': PRIORITY_LOW}),
+            threading.Thread(target=client.get_best_block_hash),
+        ]
+        for thread in threads:
+            thread.start()
+            time.sleep(0.05)
+        unblocked.set()
+        for thread in threads:
+            thread.join()
+        assert methods == ['getblockcount', 'getbestblockhash', 'getblockhash']
+        assert limiter.in_flight == 0
@@ -0,0 +1,17 @@
+from neojsonrpc.metrics import Metrics
+
+
+class TestMetrics:
+    def test_can_increment_counters(self):
+        metrics = Metrics()
+        metrics.increment('requests')
+        metrics.increment('requests', 2)
+        assert metrics['requests'] == 3
+        assert metrics['unknown'] == 0
+        assert metrics.as_dict() == {'requests': 3}
+
+    def test_can_be_reset(self):
+        metrics = Metrics()
+        metrics.increment('requests')
+        metrics.reset()
+        assert metrics.as_dict() == {}
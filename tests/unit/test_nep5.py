@@ -0,0 +1,75 @@
+import unittest.mock
+
+from neojsonrpc.nep5 import Transfer, decode_transfers, iter_transfers
+
+
+SENDER = 'ecc6b20d3ccac1ee9ef109af5a7cdb85706b1df9'
+RECIPIENT = '9139efb3f7d3d2a2e2c3a8e8c9b1e0b7d3a3a1c1'
+
+
+def get_application_log(txid, amount, sender=SENDER):
+    return {
+        'txid': txid,
+        'executions': [{
+            'vmstate': 'HALT, BREAK',
+            'notifications': [{
+                'contract': '0xceab719b8baa2310f232ee0d277c061704541cfb',
+                'state': {'type': 'Array', 'value': [
+                    {'type': 'ByteArray', 'value': '7472616e73666572'},
+                    {'type': 'ByteArray', 'value': sender},
+                    {'type': 'ByteArray', 'value': RECIPIENT},
+                    {'type': 'ByteArray', 'value': amount},
+                ]},
+            }],
+        }],
+    }
+
+
+class TestDecodeTransfers:
+    def test_can_decode_transfer_notifications(self):
+        transfers = decode_transfers(get_application_log('0x01', '00e1f505'), 42)
+        assert transfers == [Transfer(
+            42, '0x01', '0xceab719b8baa2310f232ee0d277c061704541cfb',
+            '0xf91d6b7085db7c5aaf09f19eeec1ca3c0db2c6ec',
+            '0xc1a1a3d3b7e0b1c9e8a8c3e2a2d2d3f7b3ef3991', 100000000)]
+
+    def test_considers_empty_senders_as_mints(self):
+        transfers = decode_transfers(get_application_log('0x01', '0a', sender=''))
+        assert transfers[0].sender is None
+        assert transfers[0].amount == 10
+
+    def test_ignores_faulted_executions(self):
+        application_log = get_application_log('0x01', '0a')
+        application_log['executions'][0]['vmstate'] = 'FAULT, BREAK'
+        assert decode_transfers(application_log) == []
+
+
+class TestIterTransfers:
+    def get_client(self):
+        blocks = [
+            {'index': index, 'tx': [
+                {'txid': '0xm{}'.format(index), 'type': 'MinerTransaction'},
+                {'txid': '0xi{}'.format(index), 'type': 'InvocationTransaction'}]}
+            for index in range(10)]
+        client = unittest.mock.Mock()
+        client.get_blocks.side_effect = lambda start, stop, concurrency: iter(blocks[start:stop])
+        client.get_application_logs.side_effect = \
+            lambda hashes, concurrency, batch_size: (get_application_log(h, '0a') for h in hashes)
+        return client
+
+    def test_can_extract_transfers_from_a_range_of_blocks(self):
+        transfers = list(iter_transfers(self.get_client(), 2, 5))
+        assert [(t.block_index, t.txid) for t in transfers] == \
+            [(2, '0xi2'), (3, '0xi3'), (4, '0xi4')]
+
+    def test_can_resume_from_a_checkpoint(self, tmpdir):
+        checkpoint = str(tmpdir.join('checkpoint'))
+        transfers = iter_transfers(self.get_client(), 0, 10, checkpoint=checkpoint,
+                                   checkpoint_interval=2)
+        for _ in range(5):
+            next(transfers)
+        transfers.close()
+        transfers = list(iter_transfers(self.get_client(), 0, 10, checkpoint=checkpoint))
+        assert [t.block_index for t in transfers] == [4, 5, 6, 7, 8, 9]
+        with open(checkpoint) as f:
+            assert f.read() == '10'
@@ -0,0 +1,65 @@
+import threading
+import time
+import unittest.mock
+
+import pytest
+
+from neojsonrpc.pipeline import TransactionPipeline, touches_contract
+
+
+SCRIPT_HASH = 'ecc6b20d3ccac1ee9ef109af5a7cdb85706b1df9'
+
+
+def get_client(fetched):
+    def get_blocks(start, stop, concurrency):
+        for index in range(start, stop):
+            fetched.append(index)
+            yield {'index': index, 'tx': [
+                {'txid': '0x{}a'.format(index), 'type': 'MinerTransaction'},
+                {'txid': '0x{}b'.format(index), 'type': 'InvocationTransaction',
+                 'script': '0400e1f505' + 'f91d6b7085db7c5aaf09f19eeec1ca3c0db2c6ec'}]}
+
+    client = unittest.mock.Mock()
+    client.get_blocks.side_effect = get_blocks
+    return client
+
+
+class TestTransactionPipeline:
+    def test_can_stream_transactions_through_map_and_filter_stages(self):
+        pipeline = TransactionPipeline(get_client([]), 0, 50) \
+            .filter(touches_contract(SCRIPT_HASH)) \
+            .map(lambda tx: (tx['block_index'], tx['txid']), workers=4)
+        assert list(pipeline) == [(i, '0x{}b'.format(i)) for i in range(50)]
+
+    def test_only_matches_script_hashes_aligned_on_bytes(self):
+        predicate = touches_contract('0x' + SCRIPT_HASH)
+        operand = 'f91d6b7085db7c5aaf09f19eeec1ca3c0db2c6ec'
+        assert predicate({'type': 'InvocationTransaction', 'script': '67' + operand.upper()})
+        assert not predicate({'type': 'InvocationTransaction', 'script': '6' + operand + '7'})
+        assert not predicate({'type': 'ContractTransaction'})
+
+    def test_slows_down_fetching_when_the_consumer_is_slow(self):
+        fetched = []
+        pipeline = TransactionPipeline(get_client(fetched), 0, 10000, queue_size=5) \
+            .map(lambda tx: tx)
+        iterator = iter(pipeline)
+        next(iterator)
+        time.sleep(0.3)
+        assert len(fetched) < 20
+        iterator.close()
+
+    def test_raises_the_exceptions_raised_by_stages(self):
+        def fail(tx):
+            raise ValueError()
+        pipeline = TransactionPipeline(get_client([]), 0, 10).map(fail)
+        with pytest.raises(ValueError):
+            list(pipeline)
+
+    def test_stops_its_threads_when_closed(self):
+        threads_count = threading.active_count()
+        iterator = iter(TransactionPipeline(get_client([]), 0, 10000, queue_size=5).map(
+            lambda tx: tx, workers=2))
+        next(iterator)
+        iterator.close()
+        time.sleep(0.5)
+        assert threading.active_count() == threads_count
@@ -0,0 +1,61 @@
+import unittest.mock
+
+import pytest
+
+from neojsonrpc import Client
+from neojsonrpc.exceptions import StaleSnapshotError, TransportError
+
+
+def get_client(host, block_counts):
+    client = Client(host=host)
+    block_counts = iter(block_counts)
+    client._batch_call = unittest.mock.Mock(side_effect=lambda calls, timeout, deadline: [
+        next(block_counts), {'node': host, 'params': calls[1][1]}, next(block_counts)])
+    client.get_block_count = unittest.mock.Mock(return_value=101)
+    return client
+
+
+class TestSnapshot:
+    def test_caches_the_results_of_the_calls(self):
+        client = get_client('node1', [101] * 10)
+        with client.at_height() as snapshot:
+            assert snapshot.height == 100
+            state = snapshot.get_account_state('AJBENSwajTzQtwyJFkiJSv7MAaaMc7DsRz')
+            state['node'] = 'modified'
+            assert snapshot.get_account_state('AJBENSwajTzQtwyJFkiJSv7MAaaMc7DsRz') == \
+                {'node': 'node1', 'params': ['AJBENSwajTzQtwyJFkiJSv7MAaaMc7DsRz']}
+            snapshot.get_asset_state('0x01')
+        assert client._batch_call.call_count == 2
+
+    def test_routes_calls_to_nodes_at_the_height_of_the_snapshot(self):
+        client = get_client('node1', [101, 102, 102, 102])
+        other_client = get_client('node2', [101, 101, 101, 101])
+        snapshot = client.at_height(nodes=[other_client])
+        assert snapshot.get_account_state('A1')['node'] == 'node2'
+        assert snapshot.get_account_state('A2')['node'] == 'node2'
+        assert client._batch_call.call_count == 1
+
+    def test_tries_other_nodes_if_a_node_cannot_be_reached(self):
+        client = get_client('node1', [])
+        client._batch_call.side_effect = TransportError('Unable to connect', response=None)
+        other_client = get_client('node2', [101, 101])
+        snapshot = client.at_height(nodes=[other_client])
+        assert snapshot.get_account_state('A1')['node'] == 'node2'
+
+    def test_raises_the_transport_error_if_no_node_can_be_reached(self):
+        client = get_client('node1', [])
+        client._batch_call.side_effect = TransportError('Unable to connect', response=None)
+        snapshot = client.at_height()
+        with pytest.raises(TransportError):
+            snapshot.get_account_state('A1')
+
+    def test_raises_an_error_if_no_node_is_at_the_height_of_the_snapshot(self):
+        client = get_client('node1', [102, 102])
+        snapshot = client.at_height(height=100)
+        with pytest.raises(StaleSnapshotError):
+            snapshot.get_account_state('A1')
+
+    def test_cannot_be_used_to_broadcast_transactions(self):
+        snapshot = get_client('node1', []).at_height()
+        with pytest.raises(ValueError):
+            snapshot.send_raw_transaction('00')
@@ -0,0 +1,75 @@
+import struct
+import unittest.mock
+from decimal import Decimal
+
+import pytest
+
+from neojsonrpc.limits import PRIORITY_LOW
+from neojsonrpc.sysfee import SysFeeIndex
+from neojsonrpc.testing import SimulatorServer, SyntheticChain
+
+
+def get_client(fees):
+    client = unittest.mock.Mock()
+    client.get_block_count.side_effect = lambda **kwargs: len(fees)
+    client.get_block_sys_fee.side_effect = lambda index, **kwargs: fees[index]
+    return client
+
+
+class TestSysFeeIndex:
+    def test_can_answer_range_queries_once_filled(self, tmpdir):
+        fees = [str(i % 7) for i in range(3000)]
+        index = SysFeeIndex(str(tmpdir.join('sysfees.idx')), cumulative=False)
+        assert index.update(get_client(fees), concurrency=4) == 3000
+        assert len(index) == 3000
+        assert index.get_fee(10) == Decimal(3)
+        assert index.get_range_fee(100, 2500) == sum(Decimal(f) for f in fees[100:2500])
+        with pytest.raises(IndexError):
+            index.get_range_fee(0, 3001)
+        index.close()
+
+    def test_fetches_the_system_fees_with_a_low_priority(self, tmpdir):
+        client = get_client(['0', '1'])
+        index = SysFeeIndex(str(tmpdir.join('sysfees.idx')))
+        index.update(client)
+        client.get_block_count.assert_called_once_with(priority=PRIORITY_LOW)
+        client.get_block_sys_fee.assert_called_with(1, priority=PRIORITY_LOW)
+        index.close()
+
+    def test_can_be_extended_and_reopened(self, tmpdir):
+        path = str(tmpdir.join('sysfees.idx'))
+        fees = ['0.5', '1', '10']
+        index = SysFeeIndex(path, cumulative=False)
+        index.update(get_client(fees))
+        fees.append('2.25')
+        assert index.update(get_client(fees)) == 1
+        index.close()
+        index = SysFeeIndex(path, cumulative=False)
+        assert len(index) == 4
+        assert index.get_range_fee(0, 4) == Decimal('13.75')
+        index.close()
+
+    def test_can_index_cumulative_system_fees(self, tmpdir):
+        index = SysFeeIndex(str(tmpdir.join('sysfees.idx')))
+        index.update(get_client(['0', '10', '10', '15']))
+        assert index.get_fee(3) == Decimal(5)
+        assert index.get_range_fee(1, 4) == Decimal(15)
+        index.close()
+
+    def test_stores_little_endian_integers(self, tmpdir):
+        path = str(tmpdir.join('sysfees.idx'))
+        index = SysFeeIndex(path)
+        index.update(get_client(['1']))
+        index.close()
+        with open(path, 'rb') as f:
+            assert f.read(24) == struct.pack('<qqq', 1, 0, 100000000)
+
+    def test_indexes_the_system_fees_of_the_simulator(self, tmpdir):
+        chain = SyntheticChain(seed=42, block_count=200)
+        fees = [sum(int(tx['sys_fee']) for tx in chain.get_block(i, 1)['tx']) for i in range(200)]
+        index = SysFeeIndex(str(tmpdir.join('sysfees.idx')))
+        with SimulatorServer(chain) as server:
+            index.update(server.client())
+        assert [index.get_fee(i) for i in range(200)] == fees
+        assert index.get_range_fee(0, 200) == sum(fees) > 0
+        index.close()
@@ -0,0 +1,145 @@
+import pytest
+
+from neojsonrpc.broadcast import Broadcaster, get_transaction_hash
+from neojsonrpc.constants import JSONRPCMethods
+from neojsonrpc.exceptions import ProtocolError, TransportError
+from neojsonrpc.nep5 import iter_transfers
+from neojsonrpc.testing import NEO_ASSET_ID, SimulatorServer, SyntheticChain
+from neojsonrpc.tracking import ConfirmationTracker
+
+
+CONTRACT_TX = '800001f00131000000'
+ISSUE_TX = '010001f00132000000'
+
+
+@pytest.fixture
+def server():
+    with SimulatorServer(SyntheticChain(seed=42, block_count=200)) as server:
+        yield server
+
+
+class TestSyntheticChain:
+    def test_generates_the_same_chain_for_the_same_seed(self):
+        block = SyntheticChain(seed=1).get_block(1000, 1)
+        assert block == SyntheticChain(seed=1).get_block(1000, 1)
+        assert block != SyntheticChain(seed=2).get_block(1000, 1)
+
+    def test_generates_consistent_blocks(self):
+        chain = SyntheticChain(block_count=100)
+        block = chain.get_block(chain.get_block_hash(50), 1)
+        assert block['index'] == 50
+        assert block['previousblockhash'] == chain.get_block(49, 1)['hash']
+        assert block['nextblockhash'] == chain.get_block(51, 1)['hash']
+        assert block['tx'][0]['type'] == 'MinerTransaction'
+        for tx in block['tx']:
+            assert chain.get_raw_transaction(tx['txid'], 1)['blockhash'] == block['hash']
+            for vin in tx['vin']:
+                assert chain.get_tx_out(vin['txid'], vin['vout']) is not None
+
+    def test_computes_the_system_fees_near_the_tip_of_large_chains(self):
+        chain = SyntheticChain(block_count=1000000)
+        index = chain.get_block_count() - 1
+        block = chain.get_block(index, 1)
+        fee = int(chain.get_block_sys_fee(index)) - int(chain.get_block_sys_fee(index - 1))
+        assert fee == sum(int(tx['sys_fee']) for tx in block['tx'])
+        # The fees of the previous blocks are not computed.
+        assert len(chain._block_sys_fees) < 100
+
+    def test_implements_all_the_json_rpc_methods(self):
+        chain = SyntheticChain()
+        assert set(chain._methods) == {method.value for method in JSONRPCMethods}
+
+    def test_can_produce_new_blocks(self):
+        chain = SyntheticChain(block_count=10, block_interval=0.01)
+        chain._started_at -= 1
+        assert chain.get_block_count() == 110
+
+    def test_includes_the_transactions_of_the_mempool_in_the_next_block(self):
+        chain = SyntheticChain(block_count=10, block_interval=60)
+        assert chain.send_raw_transaction(CONTRACT_TX)
+        assert not chain.send_raw_transaction(CONTRACT_TX)
+        tx_hash = get_transaction_hash(CONTRACT_TX)
+        assert chain.get_raw_mem_pool() == [tx_hash]
+        chain._started_at -= 120
+        assert chain.get_raw_mem_pool() == []
+        assert chain.get_block(10, 1)['tx'][-1]['txid'] == tx_hash
+        assert tx_hash not in [tx['txid'] for tx in chain.get_block(11, 1)['tx']]
+        assert chain.get_raw_transaction(tx_hash) == CONTRACT_TX
+        assert chain.get_raw_transaction(tx_hash, 1)['blockhash'] == chain.get_block_hash(10)
+        assert not chain.send_raw_transaction(CONTRACT_TX)
+
+    def test_bounds_the_mempool(self):
+        chain = SyntheticChain(max_mempool=1)
+        assert chain.send_raw_transaction(CONTRACT_TX)
+        assert not chain.send_raw_transaction(ISSUE_TX)
+        assert not chain.send_raw_transaction('00')
+        assert len(chain.get_raw_mem_pool()) == 1
+
+
+class TestSimulatorServer:
+    def test_serves_the_synthetic_chain(self, server):
+        client = server.client()
+        assert client.get_block_count() == 200
+        assert client.get_best_block_hash() == client.get_block(199)['hash']
+        block = client.get_block(client.get_block_hash(10))
+        assert block == server.chain.get_block(10, 1)
+        assert client.get_asset_state(NEO_ASSET_ID[2:])['precision'] == 0
+        address = server.chain._get_account(0)
+        assert client.validate_address(address)['isvalid']
+        assert client.get_account_state(address)['balances']
+
+    def test_serves_contracts(self, server):
+        client = server.client()
+        contract = client.contract(server.chain.contracts[0])
+        assert contract.symbol()['stack'] == [{'type': 'ByteArray', 'value': bytearray(b'TK0')}]
+        assert client.get_contract_state(server.chain.contracts[0])['name'] == 'Token 0'
+        assert client.get_storage(server.chain.contracts[0], 'totalSupply')
+
+    def test_serves_application_logs_using_batch_requests(self, server):
+        transfers = list(iter_transfers(server.client(), 0, 50, batch_size=10))
+        assert transfers
+        assert all(transfer.amount > 0 for transfer in transfers)
+
+    def test_can_resolve_the_inputs_of_transactions(self, server):
+        client = server.client()
+        txs = client.resolve_inputs(client.get_block(150)['tx'], batch_size=10)
+        assert all('address' in vin for tx in txs for vin in tx['vin'])
+
+    def test_returns_json_rpc_errors(self, server):
+        client = server.client()
+        with pytest.raises(ProtocolError) as excinfo:
+            client.get_block(1000)
+        assert excinfo.value.data['error']['code'] == -100
+        with pytest.raises(ProtocolError):
+            client._call('unknown')
+
+    def test_can_handle_compressed_requests(self, server):
+        client = server.client(compress_requests_threshold=0)
+        assert client.get_block_count() == 200
+
+    def test_can_inject_errors(self):
+        with SimulatorServer(error_rate=1) as server:
+            with pytest.raises(TransportError):
+                server.client().get_block_count()
+
+    def test_handles_batch_requests(self, server):
+        response = server.handle([
+            {'jsonrpc': '2.0', 'id': 1, 'method': 'getblockcount', 'params': []},
+            {'jsonrpc': '2.0', 'id': 2, 'method': 'getblockhash', 'params': []},
+        ])
+        assert response[0]['result'] == 200
+        assert response[1]['error']['code'] == -32602
+        assert server.handle([])['error']['code'] == -32600
+
+    def test_can_confirm_broadcast_transactions(self):
+        chain = SyntheticChain(seed=42, block_count=200, block_interval=60)
+        with SimulatorServer(chain) as server:
+            client = server.client()
+            result, = Broadcaster([client]).broadcast([CONTRACT_TX])
+            assert result.accepted == {client.url: True}
+            tracker = ConfirmationTracker(client)
+            future = tracker.track(result.tx_hash)
+            tracker.poll()
+            chain._started_at -= 60
+            tracker.poll()
+            assert future.result(timeout=0) == 200
@@ -0,0 +1,88 @@
+import time
+import unittest.mock
+
+import pytest
+from requests.exceptions import Timeout
+
+from neojsonrpc import Client
+from neojsonrpc.exceptions import ProtocolError, TransportTimeoutError
+from neojsonrpc.tracing import OpenTelemetryHook, Span
+
+
+class TestTracingHooks:
+    @unittest.mock.patch('requests.Session.post')
+    def test_are_called_with_a_span_describing_each_call(self, mocked_post):
+        mocked_response = unittest.mock.Mock(status_code=200, content=b'{"result": {}}')
+        mocked_response.json.return_value = {
+            'result': {'stack': [{'type': 'ByteArray', 'value': '544b4e'}]}}
+        mocked_post.return_value = mocked_response
+        spans = []
+        client = Client(host='node')
+        client.add_hook(spans.append)
+        result = client.invoke_function('34af1b6634fcd7cfcff0158965b18601d3837e32', 'symbol', [])
+        assert result['stack'][0]['value'] == bytearray(b'TKN')
+        span, = spans
+        assert span.method == 'invokefunction'
+        assert span.request_id == 0
+        assert span.url == 'http://node:30333'
+        assert set(span.phases) == {'encode', 'transport', 'parse', 'decode'}
+        assert span.response_size == 14
+        assert span.request_size > 0
+        assert span.end_time >= span.start_time
+        assert span.error is None
+
+    @unittest.mock.patch('requests.Session.post')
+    def test_are_called_with_the_error_of_failed_calls(self, mocked_post):
+        mocked_response = unittest.mock.Mock(status_code=200, content=b'{}')
+        mocked_response.json.return_value = {'error': {'code': -100, 'message': 'Unknown'}}
+        mocked_post.return_value = mocked_response
+        spans = []
+        client = Client(host='node')
+        client.add_hook(spans.append)
+        with pytest.raises(ProtocolError):
+            client.get_block_count()
+        assert isinstance(spans[0].error, ProtocolError)
+        client.remove_hook(spans.append)
+        with pytest.raises(ProtocolError):
+            client.get_block_count()
+        assert len(spans) == 1
+
+    @unittest.mock.patch('requests.Session.post')
+    def test_record_the_phase_in_progress_when_a_call_fails(self, mocked_post):
+        def post(*args, **kwargs):
+            time.sleep(0.05)
+            raise Timeout()
+
+        mocked_post.side_effect = post
+        spans = []
+        client = Client(host='node')
+        client.add_hook(spans.append)
+        with pytest.raises(TransportTimeoutError):
+            client.get_block_count()
+        span, = spans
+        assert set(span.phases) == {'encode', 'transport'}
+        assert span.phases['transport'] >= 0.05
+        assert span.duration >= 0.05
+
+    @unittest.mock.patch('requests.Session.post')
+    def test_do_not_affect_calls_if_they_fail(self, mocked_post):
+        mocked_response = unittest.mock.Mock(status_code=200, content=b'{"result": 1}')
+        mocked_response.json.return_value = {'result': 1}
+        mocked_post.return_value = mocked_response
+        client = Client(host='node')
+        client.add_hook(unittest.mock.Mock(side_effect=ValueError()))
+        assert client.get_block_count() == 1
+
+
+class TestOpenTelemetryHook:
+    def test_creates_a_span_using_the_tracer(self):
+        tracer = unittest.mock.Mock()
+        span = Span('getblockcount', 1, 'http://node:30333')
+        span.mark('encode')
+        span.finish()
+        OpenTelemetryHook(tracer)(span)
+        args, kwargs = tracer.start_span.call_args
+        assert args == ('getblockcount', )
+        assert kwargs['attributes']['rpc.method'] == 'getblockcount'
+        assert 'neojsonrpc.phase.encode' in kwargs['attributes']
+        assert tracer.start_span.return_value.end.called
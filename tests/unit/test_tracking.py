@@ -0,0 +1,118 @@
+import threading
+import unittest.mock
+
+import pytest
+
+from neojsonrpc.exceptions import TransactionExpiredError, TransportError
+from neojsonrpc.tracking import ConfirmationTracker
+
+
+class FakeChain:
+    def __init__(self):
+        self.blocks = [{'index': 0, 'tx': []}]
+
+    def add_block(self, *txids):
+        self.blocks.append({'index': len(self.blocks), 'tx': [{'txid': t} for t in txids]})
+
+    def get_client(self):
+        client = unittest.mock.Mock()
+        client.get_block_count.side_effect = lambda: len(self.blocks)
+        client.get_blocks.side_effect = \
+            lambda start, stop, concurrency: iter(self.blocks[start:stop])
+        return client
+
+
+class TestConfirmationTracker:
+    def test_resolves_futures_once_transactions_reach_the_confirmation_depth(self):
+        chain = FakeChain()
+        client = chain.get_client()
+        tracker = ConfirmationTracker(client, confirmations=2)
+        callback = unittest.mock.Mock()
+        future = tracker.track('0xAB', callback=callback)
+        other_future = tracker.track('cd')
+        assert tracker.poll() == 1
+        chain.add_block('0x01', '0xab')
+        chain.add_block('0xcd')
+        assert tracker.poll() == 2
+        assert future.result(timeout=0) == 1
+        callback.assert_called_once_with(future)
+        assert not other_future.done()
+        chain.add_block()
+        tracker.poll()
+        assert other_future.result(timeout=0) == 2
+        assert tracker.pending_count == 0
+
+    def test_fetches_each_block_once_regardless_of_the_number_of_pending_transactions(self):
+        chain = FakeChain()
+        client = chain.get_client()
+        tracker = ConfirmationTracker(client)
+        futures = [tracker.track('0x{:04x}'.format(i)) for i in range(1000)]
+        tracker.poll()
+        chain.add_block(*['0x{:04x}'.format(i) for i in range(1000)])
+        tracker.poll()
+        assert all(future.result(timeout=0) == 1 for future in futures)
+        assert client.get_blocks.call_count == 2
+
+    def test_expires_transactions_that_are_never_included_in_a_block(self):
+        chain = FakeChain()
+        tracker = ConfirmationTracker(chain.get_client(), expiry=2)
+        future = tracker.track('0xab')
+        tracker.poll()
+        chain.add_block()
+        tracker.poll()
+        assert not future.done()
+        chain.add_block()
+        tracker.poll()
+        with pytest.raises(TransactionExpiredError):
+            future.result(timeout=0)
+
+    def test_skips_cancelled_futures(self):
+        chain = FakeChain()
+        tracker = ConfirmationTracker(chain.get_client(), expiry=1)
+        cancelled_futures = [tracker.track('0xab'), tracker.track('0xef')]
+        future = tracker.track('0xcd')
+        other_future = tracker.track('0x12')
+        tracker.poll()
+        assert all(f.cancel() for f in cancelled_futures)
+        chain.add_block('0xab', '0xcd')
+        tracker.poll()
+        assert future.result(timeout=0) == 1
+        with pytest.raises(TransactionExpiredError):
+            other_future.result(timeout=0)
+        assert tracker.pending_count == 0
+
+    def test_returns_the_existing_future_of_transactions_that_are_already_tracked(self):
+        chain = FakeChain()
+        tracker = ConfirmationTracker(chain.get_client())
+        future = tracker.track('0xab')
+        callback = unittest.mock.Mock()
+        assert tracker.track('AB', callback=callback) is future
+        assert tracker.pending_count == 1
+        tracker.poll()
+        chain.add_block('0xab')
+        tracker.poll()
+        assert future.result(timeout=0) == 1
+        callback.assert_called_once_with(future)
+
+    def test_keeps_polling_after_an_error(self):
+        chain = FakeChain()
+        client = chain.get_client()
+        tracker = ConfirmationTracker(client)
+        future = tracker.track('0xab')
+        tracker.poll()
+        chain.add_block('0xab')
+        get_block_count = client.get_block_count.side_effect
+        errors = [TransportError('Unable to connect to server', response=None)]
+
+        def failing_get_block_count():
+            if errors:
+                raise errors.pop()
+            return get_block_count()
+
+        client.get_block_count.side_effect = failing_get_block_count
+        future.add_done_callback(lambda f: tracker.stop())
+        thread = threading.Thread(target=tracker.run, kwargs={'interval': 0.01}, daemon=True)
+        thread.start()
+        assert future.result(timeout=5) == 1
+        thread.join(timeout=5)
+        assert not thread.is_alive()
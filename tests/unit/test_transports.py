@@ -0,0 +1,160 @@
+import itertools
+import socket
+import threading
+import time
+import unittest.mock
+
+import pytest
+from requests.exceptions import ConnectionError, ConnectTimeout
+from urllib3.exceptions import NewConnectionError, ProtocolError
+
+from neojsonrpc import Client
+from neojsonrpc.exceptions import TransportError, TransportTimeoutError
+from neojsonrpc.testing import SimulatorServer, SyntheticChain
+from neojsonrpc.transports import (HTTP2Transport, HTTPTransport, RecordingTransport,
+                                   ReplayResponse, ReplayTransport)
+from neojsonrpc.utils import Deadline
+
+
+class TestHTTPTransport:
+    @unittest.mock.patch('requests.Session.post')
+    def test_raises_a_transport_error_if_the_server_cannot_be_reached(self, mocked_post):
+        mocked_post.side_effect = ConnectionError()
+        transport = HTTPTransport()
+        with pytest.raises(TransportError):
+            transport.post('http://localhost:30333', data='{}', headers={})
+
+    @unittest.mock.patch('requests.Session.post')
+    def test_returns_the_response_of_the_server(self, mocked_post):
+        mocked_response = unittest.mock.Mock(status_code=200, content='{}')
+        mocked_post.return_value = mocked_response
+        transport = HTTPTransport()
+        assert transport.post('http://localhost:30333', data='{}', headers={}) is mocked_response
+
+    @unittest.mock.patch('requests.Session.post')
+    def test_stops_retrying_once_the_deadline_has_expired(self, mocked_post):
+        def post(*args, **kwargs):
+            time.sleep(0.2)
+            raise ConnectTimeout()
+
+        mocked_post.side_effect = post
+        transport = HTTPTransport(max_retries=100)
+        with pytest.raises(TransportError):
+            transport.post('http://localhost:30333', data='{}', headers={}, deadline=Deadline(0.5))
+        assert mocked_post.call_count <= 4
+
+    @unittest.mock.patch('requests.Session.post')
+    def test_only_retries_the_requests_that_could_not_be_sent(self, mocked_post):
+        mocked_response = unittest.mock.Mock(status_code=200, content='{}')
+        mocked_post.side_effect = [
+            ConnectionError(NewConnectionError(None, 'Connection refused')), ConnectTimeout(),
+            mocked_response]
+        transport = HTTPTransport(backoff_factor=0)
+        assert transport.post('http://localhost:30333', data='{}', headers={}) is mocked_response
+        mocked_post.reset_mock()
+        mocked_post.side_effect = ConnectionError(
+            ProtocolError('Connection aborted.', ConnectionResetError()))
+        with pytest.raises(TransportError):
+            transport.post('http://localhost:30333', data='{}', headers={})
+        assert mocked_post.call_count == 1
+
+    @unittest.mock.patch('requests.Session.post')
+    def test_can_disable_retries(self, mocked_post):
+        mocked_post.side_effect = ConnectTimeout()
+        transport = HTTPTransport(max_retries=0)
+        with pytest.raises(TransportTimeoutError):
+            transport.post('http://localhost:30333', data='{}', headers={})
+        assert mocked_post.call_count == 1
+
+    def test_bounds_the_total_duration_of_a_request_with_a_stalled_server(self):
+        # The server sends a byte of the response body every 100ms, so that no socket operation
+        # ever times out.
+        server = socket.socket()
+        server.bind(('127.0.0.1', 0))
+        server.listen(1)
+
+        def serve():
+            connection, _ = server.accept()
+            with connection:
+                connection.recv(65536)
+                connection.sendall(b'HTTP/1.1 200 OK\r\nContent-Length: 100\r\n\r\n')
+                for _ in range(100):
+                    time.sleep(0.1)
+                    try:
+                        connection.sendall(b' ')
+                    except OSError:
+                        return
+
+        thread = threading.Thread(target=serve, daemon=True)
+        thread.start()
+        client = Client(host='127.0.0.1', port=server.getsockname()[1])
+        start = time.monotonic()
+        with pytest.raises(TransportTimeoutError):
+            client.get_block_count(timeout=5, deadline=Deadline(0.5))
+        assert time.monotonic() - start < 1.5
+        server.close()
+
+
+class TestHTTP2Transport:
+    def test_can_be_used_to_call_a_server(self):
+        pytest.importorskip('httpx')
+        pytest.importorskip('h2')
+        with SimulatorServer(SyntheticChain(seed=42, block_count=10)) as server:
+            client = server.client(transport=HTTP2Transport())
+            assert client.get_block_count() == 10
+            assert [b['index'] for b in client.get_blocks(0, 10, concurrency=4)] == list(range(10))
+
+    @unittest.mock.patch.dict('sys.modules', {'httpx': None})
+    def test_cannot_be_used_if_httpx_is_not_installed(self):
+        with pytest.raises(ImportError):
+            HTTP2Transport()
+
+
+class TestRecordingAndReplayTransports:
+    def test_can_replay_recorded_responses(self, tmpdir):
+        path = str(tmpdir.join('records'))
+        inner_transport = unittest.mock.Mock(**{'received_bytes.return_value': None})
+        inner_transport.post.side_effect = [
+            ReplayResponse(b'{"jsonrpc": "2.0", "id": 0, "result": 1}'),
+            ReplayResponse(b'{"jsonrpc": "2.0", "id": 1, "result": 2}'),
+            ReplayResponse(b'{"jsonrpc": "2.0", "id": 2, "result": "0xab"}'),
+        ]
+        client = Client(transport=RecordingTransport(path, transport=inner_transport))
+        assert client.get_block_count() == 1
+        assert client.get_block_count() == 2
+        assert client.get_block_hash(42) == '0xab'
+        client.close()
+
+        client = Client(transport=ReplayTransport(path))
+        assert client.get_block_hash(42) == '0xab'
+        assert client.get_block_count() == 1
+        assert client.get_block_count() == 2
+        assert client.get_block_count() == 2
+        with pytest.raises(TransportError):
+            client.get_block_hash(43)
+
+    def test_rewrites_the_identifiers_of_replayed_batch_responses(self, tmpdir):
+        path = str(tmpdir.join('records'))
+        inner_transport = unittest.mock.Mock(**{'received_bytes.return_value': None})
+        inner_transport.post.return_value = ReplayResponse(
+            b'[{"jsonrpc": "2.0", "id": 1, "result": {"txid": "0x02"}},'
+            b' {"jsonrpc": "2.0", "id": 0, "result": {"txid": "0x01"}}]')
+        client = Client(transport=RecordingTransport(path, transport=inner_transport))
+        logs = client.get_application_logs(['0x01', '0x02'], batch_size=2)
+        assert [log['txid'] for log in logs] == ['0x01', '0x02']
+        client.close()
+
+        client = Client(transport=ReplayTransport(path))
+        client._id_counter = itertools.count(100)
+        logs = client.get_application_logs(['0x01', '0x02'], batch_size=2)
+        assert [log['txid'] for log in logs] == ['0x01', '0x02']
+
+    def test_can_inject_a_synthetic_latency(self, tmpdir):
+        path = str(tmpdir.join('records'))
+        inner_transport = unittest.mock.Mock(**{'received_bytes.return_value': None})
+        inner_transport.post.return_value = ReplayResponse(b'{"result": 1}')
+        Client(transport=RecordingTransport(path, transport=inner_transport)).get_block_count()
+        client = Client(transport=ReplayTransport(path, latency=0.05))
+        with pytest.raises(TransportTimeoutError):
+            client.get_block_count(timeout=0.01)
+        assert client.get_block_count() == 1
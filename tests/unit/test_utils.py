@@ -1,5 +1,6 @@
-from neojsonrpc.utils import (decode_invocation_result, encode_invocation_params, is_hash160,
-                              is_hash256)
+from neojsonrpc.utils import (Deadline, LRUCache, are_hash160, are_hash256,
+                              decode_invocation_result, encode_invocation_params, is_hash160,
+                              is_hash256, map_concurrently)
 
 
 def test_is_hash256_helper_works():
@@ -15,6 +16,14 @@ def test_is_hash160_helper_works():
     assert not is_hash160('98c615784ccb5fe5936fbc0Ébe9dfdb408d92f0f')
 
 
+def test_are_hash_helpers_validate_many_values():
+    values = [
+        '936a185caaa266bb9cbe981e9e05cb78cd732b0b3280eb944412bb6f8f8f07af',
+        '98c615784ccb5fe5936fbc0cbe9dfdb408d92f0f', 'dummy', None, ]
+    assert are_hash256(values) == [True, False, False, False]
+    assert are_hash160(values) == [False, True, False, False]
+
+
 class TestEncodeInvocationParamsHelper:
     def test_can_encode_a_boolean(self):
         assert encode_invocation_params([True, False, ]) == \
@@ -93,3 +102,47 @@ class TestDecodeInvocationResultHelper:
                                       'value': bytearray(b'https://neo.org')}]}],
                 'state': 'HALT, BREAK',
                 'tx': '00000', }
+
+
+class TestLRUCache:
+    def test_can_store_values(self):
+        cache = LRUCache(2)
+        cache.set('a', 1)
+        assert 'a' in cache
+        assert cache.get('a') == 1
+        assert cache.get('b', 0) == 0
+
+    def test_discards_the_least_recently_used_values(self):
+        cache = LRUCache(2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+        assert len(cache) == 2
+        assert 'a' in cache
+        assert 'b' not in cache
+
+    def test_can_remove_the_values_whose_keys_satisfy_a_predicate(self):
+        cache = LRUCache(10)
+        for i in range(4):
+            cache.set(i, i)
+        cache.prune(lambda key: key % 2)
+        assert len(cache) == 2
+        assert 1 not in cache
+
+
+class TestDeadline:
+    def test_can_return_the_remaining_time(self):
+        deadline = Deadline(10)
+        assert 9 < deadline.remaining() <= 10
+        assert not deadline.expired
+
+    def test_is_expired_once_its_timeout_has_elapsed(self):
+        deadline = Deadline(0)
+        assert deadline.remaining() == 0
+        assert deadline.expired
+
+
+def test_map_concurrently_helper_returns_results_in_order():
+    assert list(map_concurrently(lambda x: x * 2, range(10), 3)) == list(range(0, 20, 2))
+    assert list(map_concurrently(lambda x: x * 2, range(3), 1)) == [0, 2, 4]
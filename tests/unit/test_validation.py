@@ -0,0 +1,49 @@
+import pytest
+
+from neojsonrpc.validation import (address_to_script_hash, addresses_to_script_hashes,
+                                   is_valid_address, script_hash_to_address,
+                                   script_hashes_to_addresses, validate_address, validate_addresses)
+
+
+ADDRESS = 'AeV59NyZtgj5AMQ7vY6yhr2MRvcfFeLWSb'
+SCRIPT_HASH = '0xecc6b20d3ccac1ee9ef109af5a7cdb85706b1df9'
+
+
+def test_is_valid_address_accepts_valid_addresses():
+    assert is_valid_address(ADDRESS)
+    assert is_valid_address('AK2nJJpJr6o664CWJKi1QRXjqeic2zRp8y')
+
+
+def test_is_valid_address_rejects_invalid_addresses():
+    assert not is_valid_address('AeV59NyZtgj5AMQ7vY6yhr2MRvcfFeLWSc')  # Invalid checksum
+    assert not is_valid_address('AeV59NyZtgj5AMQ7vY6yhr2MRvcfFeLWS0')  # Invalid character
+    assert not is_valid_address('AeV59NyZtgj5AMQ7vY6yhr2MRvcfFeLW')  # Invalid length
+    assert not is_valid_address('1BoatSLRHtKNngkdXEeobR76b53LETtpyT')  # Bitcoin address
+    assert not is_valid_address('')
+    assert not is_valid_address(None)
+    assert not is_valid_address(42)
+
+
+def test_validate_address_returns_the_same_result_as_the_node():
+    assert validate_address(ADDRESS) == {'address': ADDRESS, 'isvalid': True}
+    assert validate_address('dummy') == {'address': 'dummy', 'isvalid': False}
+
+
+def test_validate_addresses_validates_many_addresses():
+    assert validate_addresses([ADDRESS, 'dummy']) == [
+        {'address': ADDRESS, 'isvalid': True}, {'address': 'dummy', 'isvalid': False}, ]
+
+
+def test_can_convert_addresses_to_script_hashes():
+    assert address_to_script_hash(ADDRESS) == SCRIPT_HASH
+    assert addresses_to_script_hashes([ADDRESS]) == [SCRIPT_HASH]
+    with pytest.raises(ValueError):
+        address_to_script_hash('dummy')
+
+
+def test_can_convert_script_hashes_to_addresses():
+    assert script_hash_to_address(SCRIPT_HASH) == ADDRESS
+    assert script_hash_to_address(SCRIPT_HASH[2:]) == ADDRESS
+    assert script_hashes_to_addresses([SCRIPT_HASH]) == [ADDRESS]
+    with pytest.raises(ValueError):
+        script_hash_to_address('0xecc6')